@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 
+import bisect
+import hashlib
+import json
 import os
+import re
 import subprocess
 from itertools import chain
 
@@ -12,6 +16,11 @@ THIS_DIR = os.path.dirname(__file__)
 LOCALE_DIR = os.path.join(THIS_DIR, "jazzmin", "locale")
 LOCALES = os.listdir(LOCALE_DIR)
 DJANGO_PATH = django.__path__[0]
+STATIC_DIR = os.path.join(THIS_DIR, "jazzmin", "static")
+ADMINLTE_CSS = os.path.join(THIS_DIR, "jazzmin", "static", "vendor", "adminlte", "css")
+BASE64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+# At rules whose blocks hold other rules (rather than declarations)
+GROUPING_RULES = ("@media", "@supports", "@layer", "@container")
 
 
 @click.group()
@@ -82,5 +91,178 @@ def templates():
                     fp.write(result.stdout)
 
 
+@main.command()
+def adminlte():
+    """
+    Split the bootstrap rules out of adminlte.min.css, leaving just the AdminLTE components in
+    adminlte-components.min.css, to load on top of a bootswatch theme (which brings its own bootstrap)
+
+    Rules are attributed to bootstrap or AdminLTE using adminlte.min.css.map, re-run this after updating AdminLTE
+
+    ./cli.py adminlte
+    """
+    with open(os.path.join(ADMINLTE_CSS, "adminlte.min.css")) as f:
+        css = f.read()
+    with open(os.path.join(ADMINLTE_CSS, "adminlte.min.css.map")) as f:
+        source_map = json.load(f)
+
+    offsets, sources = _source_offsets(css, source_map)
+
+    def is_bootstrap(start: int, end: int) -> bool:
+        """
+        A rule came from bootstrap if anything in it maps to bootstrap's scss and nothing maps to AdminLTE's
+        """
+        found = set(sources[bisect.bisect_right(offsets, start) - 1 : bisect.bisect_left(offsets, end)])
+        return "bootstrap" in found and "adminlte" not in found
+
+    # The source map is for the full file, so don't point at it
+    components = re.sub(r"/\*# sourceMappingURL=.*?\*/", "", _filter_rules(css, 0, len(css), is_bootstrap)).rstrip()
+    with open(os.path.join(ADMINLTE_CSS, "adminlte-components.min.css"), "w") as f:
+        f.write(components)
+
+    click.echo("adminlte-components.min.css: {} bytes (from {})".format(len(components), len(css)))
+
+
+@main.command()
+def bundle():
+    """
+    Build the minified, content hashed javascript bundles for each entry point in jazzmin/bundles.py (minified if rjsmin
+    is installed), re-run this after changing jazzmin's javascript
+
+    ./cli.py bundle
+    """
+    from jazzmin.bundles import BUNDLES, DIST_DIR, MANIFEST
+
+    try:
+        from rjsmin import jsmin
+    except ImportError:
+        click.echo("rjsmin is not installed, bundles will not be minified")
+
+        def jsmin(script):
+            return script
+
+    dist = os.path.join(STATIC_DIR, DIST_DIR)
+    os.makedirs(dist, exist_ok=True)
+    for name in os.listdir(dist):
+        os.remove(os.path.join(dist, name))
+
+    manifest = {}
+    for entry, sources in BUNDLES.items():
+        parts = []
+        for source in sources:
+            with open(os.path.join(STATIC_DIR, source)) as f:
+                script = f.read()
+            parts.append(script if source.endswith(".min.js") else jsmin(script))
+        content = ";\n".join(x.strip().rstrip(";") for x in parts) + ";\n"
+        digest = hashlib.md5(content.encode()).hexdigest()[:12]
+        name = "{}.{}.min.js".format(entry, digest)
+        with open(os.path.join(dist, name), "w") as f:
+            f.write(content)
+        manifest[entry] = "{}/{}".format(DIST_DIR, name)
+        click.echo("{}: {} bytes".format(manifest[entry], len(content)))
+
+    with open(os.path.join(STATIC_DIR, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def _decode_vlq(segment: str) -> list:
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = BASE64.index(char)
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value, shift = 0, 0
+    return values
+
+
+def _source_offsets(css: str, source_map: dict) -> tuple:
+    """
+    Offsets into the css of each mapped segment, and whether it maps to bootstrap, AdminLTE or something else
+    """
+    line_starts = [0]
+    for line in css.split("\n")[:-1]:
+        line_starts.append(line_starts[-1] + len(line) + 1)
+
+    offsets, sources, source = [], [], 0
+    for line_number, line in enumerate(source_map["mappings"].split(";")):
+        column = 0
+        for segment in filter(None, line.split(",")):
+            fields = _decode_vlq(segment)
+            column += fields[0]
+            if len(fields) > 1:
+                source += fields[1]
+                name = source_map["sources"][source]
+                offsets.append(line_starts[line_number] + column)
+                sources.append("bootstrap" if "bootstrap" in name else "adminlte" if "src/scss" in name else None)
+
+    return offsets, sources
+
+
+def _skip(css: str, index: int) -> int:
+    """
+    Skip over a comment or string starting at index
+    """
+    if css.startswith("/*", index):
+        return css.index("*/", index + 2) + 2
+    quote, index = css[index], index + 1
+    while css[index] != quote:
+        index += 2 if css[index] == "\\" else 1
+    return index + 1
+
+
+def _block_end(css: str, index: int) -> int:
+    """
+    Index just past the } closing the block whose { is at index
+    """
+    depth = 0
+    while True:
+        if css.startswith("/*", index) or css[index] in "\"'":
+            index = _skip(css, index)
+            continue
+        depth += {"{": 1, "}": -1}.get(css[index], 0)
+        index += 1
+        if depth == 0:
+            return index
+
+
+def _filter_rules(css: str, start: int, end: int, is_bootstrap) -> str:
+    """
+    Rebuild the rules between start and end, leaving out those from bootstrap, and any grouping rules left empty
+    """
+    kept, index, rule_start = [], start, start
+    while index < end:
+        if css.startswith("/*", index) and not css[rule_start:index].strip():
+            # Comments between rules (e.g license headers) are kept
+            index = _skip(css, index)
+            kept.append(css[rule_start:index])
+            rule_start = index
+        elif css.startswith("/*", index) or css[index] in "\"'":
+            index = _skip(css, index)
+        elif css[index] == ";":
+            # Statement at rules, e.g @charset
+            index += 1
+            kept.append(css[rule_start:index])
+            rule_start = index
+        elif css[index] == "{":
+            block_end = _block_end(css, index)
+            prelude = css[rule_start:index]
+            if prelude.lstrip().startswith(GROUPING_RULES):
+                inner = _filter_rules(css, index + 1, block_end - 1, is_bootstrap)
+                if inner.strip():
+                    kept.append(prelude + "{" + inner + "}")
+            elif not is_bootstrap(rule_start + len(prelude) - len(prelude.lstrip()), block_end):
+                kept.append(css[rule_start:block_end])
+            index = rule_start = block_end
+        else:
+            index += 1
+
+    kept.append(css[rule_start:end])
+    return "".join(kept)
+
+
 if __name__ == "__main__":
     main()
@@ -9,3 +9,6 @@ class JazzminConfig(AppConfig):
     name = "jazzmin"
     label = "jazzmin"
     verbose_name = "Jazzmin"
+
+    def ready(self) -> None:
+        from . import receivers  # NOQA
@@ -0,0 +1,111 @@
+"""
+Counts shown against models in the side menu and on the dashboard.
+
+Counts are only ever read from the cache while rendering, any that are missing or stale are recounted in a background
+thread (concurrently, one query per model) so a page never waits on them. They're cached per admin site and tenant (see
+get_cache_scope), as each can have its own model_badges.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import QuerySet
+
+logger = logging.getLogger(__name__)
+
+# Counts and refresh locks, by scope (see get_cache_scope) and model
+CACHE_KEY = "jazzmin:badge:{}:{}"
+REFRESH_KEY = "jazzmin:badge-refresh:{}:{}"
+
+# A single thread to hand refreshes off to, so renders never wait on them
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="jazzmin-badges")
+
+
+def get_model_badges(options: Dict[str, Any], scope: str) -> Dict[str, int]:
+    """
+    Get the cached badge counts keyed on model, scheduling a background refresh for any that are missing or stale
+    """
+    badges = options.get("model_badges") or {}
+    if not badges:
+        return {}
+
+    keys = {model: CACHE_KEY.format(scope, model) for model in badges}
+    cached = cache.get_many(keys.values())
+    now = time.time()
+
+    counts, stale = {}, []
+    for model, key in keys.items():
+        entry = cached.get(key)
+        if entry is not None:
+            counts[model] = entry[0]
+        if entry is None or entry[1] + options["model_badges_ttl"] < now:
+            stale.append(model)
+
+    if stale:
+        schedule_refresh(stale, options, scope)
+
+    return counts
+
+
+def schedule_refresh(models: List[str], options: Dict[str, Any], scope: str) -> None:
+    """
+    Recount the given models in the background, unless another thread/process is already doing so
+    """
+    ttl = options["model_badges_ttl"]
+    claimed = [x for x in models if cache.add(REFRESH_KEY.format(scope, x), True, timeout=ttl)]
+    if claimed:
+        _background.submit(_refresh_in_background, claimed, options, scope)
+
+
+def refresh_model_badges(models: List[str], options: Dict[str, Any], scope: str) -> Dict[str, int]:
+    """
+    Count the given models, concurrently where we have more than one worker, and store the results in the cache
+    """
+    badges = options["model_badges"]
+    workers = max(1, min(options["model_badges_workers"], len(models)))
+
+    if workers == 1:
+        results = [_count(badges[x]) for x in models]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jazzmin-badge-count") as pool:
+            results = list(pool.map(_count_in_thread, [badges[x] for x in models]))
+
+    counts = {model: count for model, count in zip(models, results) if count is not None}
+    now = time.time()
+    cache.set_many(
+        {CACHE_KEY.format(scope, model): (count, now) for model, count in counts.items()},
+        timeout=options["model_badges_ttl"] + options["model_badges_stale_ttl"],
+    )
+    return counts
+
+
+def _refresh_in_background(models: List[str], options: Dict[str, Any], scope: str) -> None:
+    try:
+        refresh_model_badges(models, options, scope)
+    except Exception:
+        logger.exception("Could not refresh model badges for {}".format(", ".join(models)))
+    finally:
+        cache.delete_many([REFRESH_KEY.format(scope, x) for x in models])
+        connections.close_all()
+
+
+def _count_in_thread(badge: Callable[[], Union[int, QuerySet]]) -> Optional[int]:
+    try:
+        return _count(badge)
+    finally:
+        connections.close_all()
+
+
+def _count(badge: Callable[[], Union[int, QuerySet]]) -> Optional[int]:
+    try:
+        value = badge()
+        if isinstance(value, QuerySet):
+            value = value.count()
+        return int(value)
+    except Exception:
+        logger.exception("Could not count model badge {}".format(badge))
+        return None
@@ -0,0 +1,51 @@
+"""
+Jazzmin's own javascript, bundled per page by ./cli.py bundle into minified, content hashed files under jazzmin/dist,
+which templates load (deferred) with the jazzmin_bundle tag.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List
+
+from django.conf import settings
+
+# Entry points, and the static files that go into them (in order)
+BUNDLES: Dict[str, List[str]] = {
+    "main": ["jazzmin/js/main.js"],
+    "change_list": ["jazzmin/js/change_list.js"],
+    "change_form": ["jazzmin/js/change_form.js"],
+    "related_modal": [
+        "jazzmin/plugins/bootstrap-show-modal/bootstrap-show-modal.min.js",
+        "jazzmin/js/related-modal.js",
+    ],
+    "ui_builder": ["jazzmin/js/ui-builder.js"],
+    "partial": ["jazzmin/js/partial.js"],
+}
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+DIST_DIR = "jazzmin/dist"
+MANIFEST = DIST_DIR + "/manifest.json"
+
+
+@lru_cache(maxsize=None)
+def get_manifest() -> Dict[str, str]:
+    """
+    The bundled file for each entry point
+    """
+    try:
+        with open(os.path.join(STATIC_DIR, MANIFEST)) as f:
+            manifest: Dict[str, str] = json.load(f)
+            return manifest
+    except (OSError, ValueError):
+        return {}
+
+
+def get_bundle(entry: str) -> List[str]:
+    """
+    The static files to load for an entry point, the bundle, or its source files when DEBUG is on (or it isn't built)
+    """
+    bundle = get_manifest().get(entry)
+    if settings.DEBUG or not bundle:
+        return BUNDLES[entry]
+    return [bundle]
@@ -0,0 +1,179 @@
+"""
+Dashboard widgets, declared in JAZZMIN_SETTINGS["dashboard_widgets"].
+
+Each widget has a data function that receives the request, its data is cached for the widgets cache_ttl, and any
+widgets that need loading are loaded concurrently (on a thread pool under WSGI, or with asyncio.gather under ASGI), or
+fetched by the browser after the page has loaded if the widget is marked lazy.
+"""
+
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db import connections
+from django.http import HttpRequest
+from django.utils.text import slugify
+
+from .compat import NoReverseMatch, reverse
+from .utils import get_cache_scope, get_current_app
+
+logger = logging.getLogger(__name__)
+
+# Widget data, by admin site and tenant (see get_cache_scope), as each can have its own widgets, slug and user
+CACHE_KEY = "jazzmin:widget:{scope}:{slug}:{user}"
+
+WIDGET_TEMPLATES = {
+    "count": "jazzmin/dashboard/count.html",
+    "table": "jazzmin/dashboard/table.html",
+    "series": "jazzmin/dashboard/series.html",
+}
+
+DEFAULT_WIDGET: Dict[str, Any] = {
+    # Title of the widget
+    "name": "",
+    # One of count, table or series (see WIDGET_TEMPLATES)
+    "type": "count",
+    # Callable that receives the request and returns the data for the widget
+    "data": None,
+    # Seconds to cache the data for (0 to not cache it)
+    "cache_ttl": 60,
+    # Cache the data per user, rather than sharing it between everyone who can see the widget
+    "per_user": False,
+    # Permissions the user must have to see this widget
+    "permissions": [],
+    # Load the data in the browser once the page has loaded, rather than while rendering the dashboard
+    "lazy": False,
+    # CSS classes for the column holding the widget
+    "classes": "col-md-4 col-sm-12",
+    "icon": None,
+    # Override the template used to render the data
+    "template": None,
+}
+
+
+def normalise_widget(widget: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fill in the defaults for a widget from the settings
+    """
+    normalised = {**DEFAULT_WIDGET, **widget}
+    normalised["slug"] = widget.get("slug") or slugify(normalised["name"])
+    normalised["template"] = normalised["template"] or WIDGET_TEMPLATES.get(
+        normalised["type"], WIDGET_TEMPLATES["count"]
+    )
+    return normalised
+
+
+def get_widget(options: Dict[str, Any], slug: str) -> Optional[Dict[str, Any]]:
+    widget: Dict[str, Any]
+    for widget in options.get("dashboard_widgets", []):
+        if widget["slug"] == slug:
+            return widget
+    return None
+
+
+def get_dashboard_widgets(request: HttpRequest, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Get the widgets this user can see, with their data loaded (or a url to load it from, for lazy widgets)
+    """
+    widgets = []
+    for widget in options.get("dashboard_widgets", []):
+        if not request.user.has_perms(widget["permissions"]):
+            continue
+
+        widget = {**widget, "value": None, "url": None, "error": False}
+        if widget["lazy"]:
+            try:
+                # jazzmin.urls aren't under the admin site, so pass it on to load the widget with its settings
+                url = reverse("jazzmin:dashboard_widget", kwargs={"slug": widget["slug"]})
+                widget["url"] = "{}?{}".format(url, urlencode({"site": get_current_app(request)}))
+            except NoReverseMatch:
+                logger.warning(
+                    "Include jazzmin.urls to load lazy dashboard widgets, loading {} now".format(widget["slug"])
+                )
+        widgets.append(widget)
+
+    load_widget_data(request, [x for x in widgets if not x["url"]], options)
+    return widgets
+
+
+def load_widget_data(request: HttpRequest, widgets: List[Dict[str, Any]], options: Dict[str, Any]) -> None:
+    """
+    Set the data on each of the given widgets, from the cache where we can, and loading the rest concurrently
+    """
+    keys = {widget["slug"]: _cache_key(request, widget) for widget in widgets if widget["cache_ttl"]}
+    cached = cache.get_many(keys.values()) if keys else {}
+
+    to_load = []
+    for widget in widgets:
+        key = keys.get(widget["slug"])
+        if key in cached:
+            widget["value"] = cached[key]
+        else:
+            to_load.append(widget)
+
+    if not to_load:
+        return
+
+    data_functions = [_widget_data_function(x) for x in to_load]
+    if isinstance(request, ASGIRequest):
+        results = async_to_sync(_gather)(request, data_functions)
+    elif options["dashboard_widget_workers"] <= 1 or len(to_load) == 1:
+        results = [_load(func, request) for func in data_functions]
+    else:
+        with ThreadPoolExecutor(max_workers=min(options["dashboard_widget_workers"], len(to_load))) as pool:
+            results = list(pool.map(lambda func: _load_in_thread(func, request), data_functions))
+
+    for widget, (ok, data) in zip(to_load, results):
+        widget["value"], widget["error"] = data, not ok
+        if ok and widget["cache_ttl"]:
+            cache.set(keys[widget["slug"]], data, timeout=widget["cache_ttl"])
+
+
+def _cache_key(request: HttpRequest, widget: Dict[str, Any]) -> str:
+    return CACHE_KEY.format(
+        scope=get_cache_scope(request), slug=widget["slug"], user=request.user.pk if widget["per_user"] else "all"
+    )
+
+
+def _widget_data_function(widget: Dict[str, Any]) -> Callable[[HttpRequest], Any]:
+    if not callable(widget["data"]):
+        logger.warning("Dashboard widget {} has no data callable".format(widget["slug"]))
+        return lambda request: None
+    func: Callable[[HttpRequest], Any] = widget["data"]
+    return func
+
+
+async def _gather(request: HttpRequest, data_functions: List[Callable[[HttpRequest], Any]]) -> List[Any]:
+    async def load(func: Callable[[HttpRequest], Any]) -> Any:
+        if inspect.iscoroutinefunction(func):
+            try:
+                return True, await func(request)
+            except Exception:
+                logger.exception("Could not load dashboard widget data from {}".format(func))
+                return False, None
+        return await sync_to_async(_load_in_thread, thread_sensitive=False)(func, request)
+
+    return list(await asyncio.gather(*[load(func) for func in data_functions]))
+
+
+def _load_in_thread(func: Callable[[HttpRequest], Any], request: HttpRequest) -> Any:
+    try:
+        return _load(func, request)
+    finally:
+        connections.close_all()
+
+
+def _load(func: Callable[[HttpRequest], Any], request: HttpRequest) -> Any:
+    try:
+        if inspect.iscoroutinefunction(func):
+            return True, async_to_sync(func)(request)
+        return True, func(request)
+    except Exception:
+        logger.exception("Could not load dashboard widget data from {}".format(func))
+        return False, None
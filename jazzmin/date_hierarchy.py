@@ -0,0 +1,182 @@
+"""
+A date hierarchy for big tables, django's runs a DISTINCT over the (filtered) changelist for the years, months or days
+it links to, on every page. Model admins can cache these (jazzmin_date_hierarchy_cache, in seconds), and/or work them
+out from the first and last dates (jazzmin_date_hierarchy_from_bounds), which databases can read from an index, at the
+cost of linking to years/months/days that may have no results.
+"""
+
+import datetime
+import hashlib
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.utils import get_fields_from_path
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import models
+from django.template.defaultfilters import capfirst
+from django.utils import formats, timezone
+from django.utils.translation import gettext as _
+
+BUCKETS_KEY = "jazzmin:date_hierarchy:{}:{}"
+
+T = TypeVar("T")
+Bounds = Tuple[Optional[datetime.date], Optional[datetime.date]]
+
+
+def uses_jazzmin_date_hierarchy(model_admin: Any) -> bool:
+    return bool(
+        getattr(model_admin, "jazzmin_date_hierarchy_cache", None)
+        or getattr(model_admin, "jazzmin_date_hierarchy_from_bounds", False)
+    )
+
+
+def get_date_hierarchy(cl: ChangeList) -> Optional[Dict[str, Any]]:
+    """
+    The context for admin/date_hierarchy.html, as django's date_hierarchy tag gives it, from our buckets if the model
+    admin asks for them
+    """
+    if not cl.date_hierarchy or not uses_jazzmin_date_hierarchy(cl.model_admin):
+        return date_hierarchy(cl)  # type: ignore[no-any-return]
+
+    field_name = cl.date_hierarchy
+    is_datetime = isinstance(get_fields_from_path(cl.model, field_name)[-1], models.DateTimeField)
+    year_field = "%s__year" % field_name
+    month_field = "%s__month" % field_name
+    day_field = "%s__day" % field_name
+    field_generic = "%s__" % field_name
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+
+    def link(filters: Dict[str, Any]) -> str:
+        return str(cl.get_query_string(filters, [field_generic]))
+
+    if not (year_lookup or month_lookup or day_lookup):
+        # Start at the year/month if everything is in the one
+        first, last = get_bounds(cl, field_name, is_datetime)
+        if first and last and first.year == last.year:
+            year_lookup = first.year
+            if first.month == last.month:
+                month_lookup = first.month
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(int(year_lookup), int(month_lookup), int(day_lookup))
+        return {
+            "show": True,
+            "back": {
+                "link": link({year_field: year_lookup, month_field: month_lookup}),
+                "title": capfirst(formats.date_format(day, "YEAR_MONTH_FORMAT")),
+            },
+            "choices": [{"title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT"))}],
+        }
+
+    if year_lookup and month_lookup:
+        return {
+            "show": True,
+            "back": {"link": link({year_field: year_lookup}), "title": str(year_lookup)},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month_lookup, day_field: day.day}),
+                    "title": capfirst(formats.date_format(day, "MONTH_DAY_FORMAT")),
+                }
+                for day in get_buckets(cl, field_name, "day", is_datetime)
+            ],
+        }
+
+    if year_lookup:
+        return {
+            "show": True,
+            "back": {"link": link({}), "title": _("All dates")},
+            "choices": [
+                {
+                    "link": link({year_field: year_lookup, month_field: month.month}),
+                    "title": capfirst(formats.date_format(month, "YEAR_MONTH_FORMAT")),
+                }
+                for month in get_buckets(cl, field_name, "month", is_datetime)
+            ],
+        }
+
+    return {
+        "show": True,
+        "back": None,
+        "choices": [
+            {"link": link({year_field: str(year.year)}), "title": str(year.year)}
+            for year in get_buckets(cl, field_name, "year", is_datetime)
+        ],
+    }
+
+
+def get_bounds(cl: ChangeList, field_name: str, is_datetime: bool) -> Bounds:
+    """
+    The first and last dates in the changelist
+    """
+
+    def read() -> Bounds:
+        bounds = cl.queryset.aggregate(first=models.Min(field_name), last=models.Max(field_name))
+        first, last = bounds["first"], bounds["last"]
+        return _to_date(first, is_datetime), _to_date(last, is_datetime)
+
+    return _cached(cl, "bounds", read)
+
+
+def get_buckets(cl: ChangeList, field_name: str, kind: str, is_datetime: bool) -> List[datetime.date]:
+    """
+    The years/months/days (kind) with results in the changelist, or between its first and last dates
+    """
+
+    def read() -> List[datetime.date]:
+        if getattr(cl.model_admin, "jazzmin_date_hierarchy_from_bounds", False):
+            first, last = get_bounds(cl, field_name, is_datetime)
+            return list(date_range(first, last, kind)) if first and last else []
+
+        values = getattr(cl.queryset, "datetimes" if is_datetime else "dates")(field_name, kind)
+        return [x for x in (_to_date(value, is_datetime) for value in values) if x]
+
+    return _cached(cl, kind, read)
+
+
+def date_range(first: datetime.date, last: datetime.date, kind: str) -> Iterator[datetime.date]:
+    """
+    The first day of each year/month, or each day, from first to last
+    """
+    if kind == "year":
+        for year in range(first.year, last.year + 1):
+            yield datetime.date(year, 1, 1)
+    elif kind == "month":
+        for month in range(first.year * 12 + first.month - 1, last.year * 12 + last.month):
+            yield datetime.date(month // 12, month % 12 + 1, 1)
+    else:
+        for day in range((last - first).days + 1):
+            yield first + datetime.timedelta(days=day)
+
+
+def _to_date(value: Any, is_datetime: bool) -> Optional[datetime.date]:
+    if value is None:
+        return None
+    if is_datetime:
+        return (timezone.localtime(value) if timezone.is_aware(value) else value).date()  # type: ignore[no-any-return]
+    return value  # type: ignore[no-any-return]
+
+
+def _cached(cl: ChangeList, kind: str, read: Callable[[], T]) -> T:
+    """
+    Cache what we read for the changelist's query, if the model admin asks
+    """
+    timeout = getattr(cl.model_admin, "jazzmin_date_hierarchy_cache", None)
+    if not timeout:
+        return read()
+
+    try:
+        sql, params = cl.queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return read()
+
+    fingerprint = repr((sql, params, kind, timezone.get_current_timezone_name()))
+    key = BUCKETS_KEY.format(cl.model._meta.label_lower, hashlib.md5(fingerprint.encode()).hexdigest())
+    value: Optional[T] = cache.get(key)
+    if value is None:
+        value = read()
+        cache.set(key, value, timeout=timeout)
+    return value
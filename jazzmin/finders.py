@@ -0,0 +1,58 @@
+import fnmatch
+import os
+from typing import Any, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.files.storage import Storage
+
+from .settings import THEMES, get_allowed_themes
+
+BOOTSWATCH_DIR = "vendor/bootswatch/"
+
+
+def is_excluded(path: str, excluded: List[str]) -> bool:
+    path = path.replace(os.sep, "/")
+    return any(fnmatch.fnmatchcase(path, x) for x in excluded)
+
+
+def get_excluded_static() -> List[str]:
+    """
+    Patterns for the static files in jazzmin that we don't need to collect, themes that aren't allowed, and source
+    maps if JAZZMIN_STATIC_SOURCE_MAPS is False
+    """
+    allowed = get_allowed_themes()
+    themes = set(THEMES.keys()) | set(_bootswatch_themes())
+    excluded = [BOOTSWATCH_DIR + x + "/*" for x in sorted(themes) if x not in allowed]
+    if not getattr(settings, "JAZZMIN_STATIC_SOURCE_MAPS", True):
+        excluded.append("*.map")
+    return excluded
+
+
+def _bootswatch_themes() -> List[str]:
+    """
+    Theme directories shipped in vendor/bootswatch, which may include some that aren't in THEMES
+    """
+    path = os.path.join(os.path.dirname(__file__), "static", BOOTSWATCH_DIR)
+    return [x for x in os.listdir(path) if os.path.isdir(os.path.join(path, x))] if os.path.isdir(path) else []
+
+
+class AppDirectoriesFinder(finders.AppDirectoriesFinder):
+    """
+    Finds static files in installed apps, just like django's AppDirectoriesFinder (which this replaces in
+    STATICFILES_FINDERS), but leaves out the jazzmin static files we don't need, so collectstatic skips them
+    """
+
+    def list(self, ignore_patterns: Optional[List[str]]) -> Iterator[Tuple[str, Storage]]:
+        jazzmin_storage = self.storages.get("jazzmin")
+        excluded = get_excluded_static()
+
+        for path, storage in super().list(ignore_patterns):
+            if storage is jazzmin_storage and is_excluded(path, excluded):
+                continue
+            yield path, storage
+
+    def find_in_app(self, app: str, path: str) -> Any:
+        if app == "jazzmin" and is_excluded(path, get_excluded_static()):
+            return None
+        return super().find_in_app(app, path)
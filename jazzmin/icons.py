@@ -0,0 +1,227 @@
+"""
+Font Awesome subsetting, the jazzmin_icons management command finds the icons we use (in jazzmin, your templates and
+your jazzmin settings) and writes a copy of Font Awesome's css with just those icons, along with subset fonts if
+fonttools is installed, which base.html then uses in place of the full Font Awesome.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.contrib.admin.sites import all_sites
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+from .settings import get_settings, get_tenants
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+FONTAWESOME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "vendor", "fontawesome-free")
+FONTAWESOME_CSS = "vendor/fontawesome-free/css/all.min.css"
+
+# Where the subset lives, relative to the static root
+SUBSET_CSS = "jazzmin/fontawesome/all.subset.min.css"
+SUBSET_WEBFONTS = "jazzmin/fontawesome/webfonts"
+
+# Fonts we subset, the rest (e.g the v4 compatibility font) are small, and only fetched when used anyway
+SUBSET_FONTS = ("fa-solid-900", "fa-regular-400", "fa-brands-400")
+
+ICON_RE = re.compile(r"\bfa-[a-z0-9]+(?:-[a-z0-9]+)*")
+GLYPH_RULE_RE = re.compile(r'^([^{}]+)\{content:"([^"]+)"\}$')
+GLYPH_SELECTOR_RE = re.compile(r"^\.(fa-[a-z0-9-]+)::?before$")
+FONT_URL_RE = re.compile(r"url\(\.\./webfonts/([a-z0-9-]+)\.(woff2|ttf)\) format\(\"(?:woff2|truetype)\"\)")
+
+SCANNED_EXTENSIONS = (".html", ".txt", ".js", ".py")
+
+
+@lru_cache(maxsize=None)
+def get_fontawesome_css() -> str:
+    """
+    The Font Awesome css to use, the subset if jazzmin_icons has made one, else the whole thing
+    """
+    return SUBSET_CSS if finders.find(SUBSET_CSS) else FONTAWESOME_CSS
+
+
+def clear_fontawesome_cache(**kwargs: Any) -> None:
+    get_fontawesome_css.cache_clear()
+
+
+setting_changed.connect(clear_fontawesome_cache)
+
+
+def find_icons(paths: Iterable[str] = ()) -> Set[str]:
+    """
+    Find the fa-* classes used in jazzmin, the project's templates, the given paths and the jazzmin settings of each
+    admin site, and each of its tenants (given in the tenants setting)
+    """
+    jazzmin_dir = os.path.dirname(os.path.abspath(__file__))
+    dirs = [
+        os.path.join(jazzmin_dir, "templates"),
+        os.path.join(jazzmin_dir, "templatetags"),
+        os.path.join(jazzmin_dir, "static", "jazzmin"),
+        *get_project_template_dirs(),
+        *paths,
+    ]
+
+    icons: Set[str] = set()
+    for path in _walk(dirs):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            icons.update(ICON_RE.findall(f.read()))
+
+    for site in all_sites:
+        for tenant in [None, *get_tenants(site.name)]:
+            for value in _strings(get_settings(site.name, tenant=tenant)):
+                icons.update(ICON_RE.findall(value))
+
+    return icons
+
+
+def get_project_template_dirs() -> List[str]:
+    dirs = [str(x) for x in get_app_template_dirs("templates")]
+    for engine in engines.all():
+        dirs.extend(str(x) for x in getattr(engine, "dirs", []))
+    return dirs
+
+
+def subset_css(css: str, icons: Set[str], fonts_url: Optional[str] = None) -> Tuple[str, Set[int]]:
+    """
+    Leave out the glyph rules for icons we don't use, returns the css and the code points of the glyphs we kept.
+
+    Font urls are pointed at the subset fonts (fonts_url relative to the css) if given, else back at the originals
+    """
+    kept: List[str] = []
+    code_points: Set[int] = set()
+    for block in _top_level_blocks(css):
+        match = GLYPH_RULE_RE.match(block.strip())
+        if match:
+            selectors = [x.strip() for x in match.group(1).split(",")]
+            glyph_selectors = [GLYPH_SELECTOR_RE.match(x) for x in selectors]
+            if all(glyph_selectors):
+                used = [x for x, glyph in zip(selectors, glyph_selectors) if glyph and glyph.group(1) in icons]
+                if not used:
+                    continue
+                block = '{}{{content:"{}"}}'.format(",".join(used), match.group(2))
+                code_points.update(ord(x) for x in _css_string(match.group(2)))
+        elif block.lstrip().startswith("@font-face"):
+            block = FONT_URL_RE.sub(lambda x: _font_url(x, fonts_url), block)
+            block = re.sub(r",(?=[;}])", "", block)
+        kept.append(block)
+
+    return "".join(kept), code_points
+
+
+def subset_fonts(code_points: Set[int], output_dir: str) -> List[str]:
+    """
+    Write woff2 fonts (woff if brotli isn't installed) with just the given glyphs, returns the fonts written
+    """
+    if font_subset is None:
+        return []
+
+    try:
+        import brotli  # NOQA
+
+        flavor = "woff2"
+    except ImportError:
+        flavor = "woff"
+
+    os.makedirs(output_dir, exist_ok=True)
+    written = []
+    for name in SUBSET_FONTS:
+        options = font_subset.Options()
+        options.flavor = flavor
+        options.layout_features = ["*"]
+        font = font_subset.load_font(os.path.join(FONTAWESOME_DIR, "webfonts", name + ".ttf"), options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=code_points)
+        subsetter.subset(font)
+        path = os.path.join(output_dir, "{}.{}".format(name, flavor))
+        font_subset.save_font(font, path, options)
+        written.append(path)
+
+    return written
+
+
+def write_subset(output: str, icons: Set[str]) -> Dict[str, Any]:
+    """
+    Write the subset css (and fonts if we can) under output, which should be one of your STATICFILES_DIRS
+    """
+    with open(os.path.join(FONTAWESOME_DIR, "css", "all.min.css"), encoding="utf-8") as f:
+        css = f.read()
+
+    _, code_points = subset_css(css, icons)
+    fonts = subset_fonts(code_points, os.path.join(output, SUBSET_WEBFONTS))
+    flavor = os.path.splitext(fonts[0])[1][1:] if fonts else None
+    subset, _ = subset_css(css, icons, "webfonts/{}." + flavor if flavor else None)
+
+    css_path = os.path.join(output, SUBSET_CSS)
+    os.makedirs(os.path.dirname(css_path), exist_ok=True)
+    with open(css_path, "w", encoding="utf-8") as f:
+        f.write(subset)
+
+    clear_fontawesome_cache()
+    return {"css": css_path, "fonts": fonts, "glyphs": len(code_points)}
+
+
+def _font_url(match: "re.Match[str]", fonts_url: Optional[str]) -> str:
+    name, extension = match.group(1), match.group(2)
+    if fonts_url and name in SUBSET_FONTS:
+        # We only write the one format, so drop the truetype fallback
+        if extension != "woff2":
+            return ""
+        url = fonts_url.format(name)
+        return 'url({}) format("{}")'.format(url, os.path.splitext(url)[1][1:])
+    return 'url(../../vendor/fontawesome-free/webfonts/{}.{}) format("{}")'.format(
+        name, extension, "woff2" if extension == "woff2" else "truetype"
+    )
+
+
+def _css_string(value: str) -> str:
+    """
+    Unescape the css escapes in a content string, e.g \\f015
+    """
+    return re.sub(r"\\([0-9a-fA-F]{1,6})\s?", lambda x: chr(int(x.group(1), 16)), value).replace("\\", "")
+
+
+def _top_level_blocks(css: str) -> Iterator[str]:
+    """
+    Split the css into its top level rules/at rules (along with any whitespace/comments before them)
+    """
+    start, depth = 0, 0
+    for index, char in enumerate(css):
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                yield css[start : index + 1]
+                start = index + 1
+    if css[start:]:
+        yield css[start:]
+
+
+def _walk(dirs: Iterable[str]) -> Iterator[str]:
+    seen = set()
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                path = os.path.join(root, filename)
+                if filename.endswith(SCANNED_EXTENSIONS) and path not in seen:
+                    seen.add(path)
+                    yield path
+
+
+def _strings(value: Any) -> Iterator[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
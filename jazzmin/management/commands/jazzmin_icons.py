@@ -0,0 +1,42 @@
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError, CommandParser
+
+from ... import icons
+
+
+class Command(BaseCommand):
+    """
+    Write a Font Awesome subset with just the icons we use, base.html then loads it in place of the full Font Awesome.
+
+    Re-run this whenever you change icons in your settings or templates
+    """
+
+    help = "Subset Font Awesome to the icons used in jazzmin, your templates and your jazzmin settings"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output", help="Static files directory to write the subset to (defaults to the first STATICFILES_DIRS)"
+        )
+        parser.add_argument("--scan", action="append", default=[], help="Extra directory to look for icons in")
+        parser.add_argument("--icon", action="append", default=[], help="Extra icon to include, e.g fa-rocket")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        output = options["output"]
+        if not output:
+            dirs = getattr(settings, "STATICFILES_DIRS", [])
+            if not dirs:
+                raise CommandError("Set STATICFILES_DIRS, or give an --output directory")
+            if isinstance(dirs[0], (list, tuple)):
+                raise CommandError("The first STATICFILES_DIRS has a prefix, give an --output directory")
+            output = dirs[0]
+
+        found = icons.find_icons(options["scan"]) | set(options["icon"])
+        result = icons.write_subset(str(output), found)
+
+        self.stdout.write("Wrote {} with {} icons ({} glyphs)".format(result["css"], len(found), result["glyphs"]))
+        for font in result["fonts"]:
+            self.stdout.write("Wrote {}".format(font))
+        if not result["fonts"]:
+            self.stdout.write("Install fonttools (and brotli) to subset the fonts too, using the full fonts for now")
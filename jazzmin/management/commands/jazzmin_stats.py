@@ -0,0 +1,30 @@
+import time
+from typing import Any
+
+from django.core.management import BaseCommand, CommandParser
+
+from ...settings import get_settings
+from ...stats import precompute_dashboard_stats
+
+
+class Command(BaseCommand):
+    """
+    Precompute the dashboard statistics into the cache, run this from cron/your scheduler, or leave it running with
+    --every
+    """
+
+    help = "Precompute the model counts and recent activity shown on the jazzmin dashboard"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--full", action="store_true", help="Recount every model, not just those that changed")
+        parser.add_argument("--every", type=int, default=0, help="Keep running, recomputing every N seconds")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        full = options["full"]
+        while True:
+            recomputed = precompute_dashboard_stats(get_settings(), full=full)
+            self.stdout.write("Recomputed {}".format(", ".join(recomputed) or "nothing"))
+            if not options["every"]:
+                break
+            full = False
+            time.sleep(options["every"])
@@ -0,0 +1,157 @@
+import logging
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, List, Tuple
+
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.templatetags.static import static
+from django.utils.cache import patch_vary_headers
+
+from .bundles import get_bundle
+from .icons import get_fontawesome_css
+from .queries import QueryInspector
+from .settings import (
+    FRAGMENT_HEADER,
+    PARTIAL_HEADER,
+    get_request_settings,
+    get_ui_tweaks,
+    is_fragment_request,
+    is_partial_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PreloadMiddleware:
+    """
+    Add Link: rel=preload headers for the stylesheets and scripts every jazzmin page needs, so browsers (or a CDN/proxy
+    turning them into 103 Early Hints) can start fetching them before they have parsed the page
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.get("Content-Type", "").startswith("text/html")
+            and is_admin_request(request)
+            and not is_partial_request(request)
+            and not is_fragment_request(request)
+        ):
+            links = [x for x in [response.get("Link")] if x] + get_preload_links(request)
+            response["Link"] = ", ".join(links)
+
+        return response
+
+
+class VaryMiddleware:
+    """
+    Add Vary headers for the request headers admin pages are rendered differently for (X-Jazzmin-Partial with
+    partial_navigation, X-Jazzmin-Fragment with changelist_ajax), so caches don't answer a full page load with just the
+    content or results of the page, or vice versa
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if is_admin_request(request):
+            options = get_request_settings(request)
+            if options["partial_navigation"]:
+                patch_vary_headers(response, [PARTIAL_HEADER])
+            if options["changelist_ajax"]:
+                patch_vary_headers(response, [FRAGMENT_HEADER])
+
+        return response
+
+
+class QueryInspectorMiddleware:
+    """
+    Look for N+1 queries in admin pages (the same query run for each row of a changelist, or each inline form), which
+    are logged, and shown at the bottom of the page, along with the select_related/prefetch_related to fix them.
+
+    For development, it slows every query down a little
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        inspector = QueryInspector()
+        setattr(request, "jazzmin_query_inspector", inspector)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(inspector))
+            response = self.get_response(request)
+
+        if inspector.active:
+            for problem in inspector.get_report():
+                logger.warning(format_query_problem(request, problem))
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable[..., Any], *args: Any) -> None:
+        # Only look at admin pages, once we know what they are
+        inspector = getattr(request, "jazzmin_query_inspector", None)
+        if inspector is not None:
+            inspector.active = is_admin_request(request)
+
+
+def format_query_problem(request: HttpRequest, problem: Dict[str, Any]) -> str:
+    message = "{} ran the same query {} times ({} {} of {}): {}".format(
+        request.path, problem["count"], problem["kind"], problem["name"], problem["model"], problem["sql"]
+    )
+    if problem["suggestion"]:
+        message += ", try {}".format(problem["suggestion"])
+    return message
+
+
+def is_admin_request(request: HttpRequest) -> bool:
+    match = request.resolver_match
+    return match is not None and "admin" in match.app_names
+
+
+def get_preload_links(request: HttpRequest) -> List[str]:
+    """
+    Link header values for the critical assets of the page
+    """
+    links = []
+    for url, kind in get_critical_assets(request):
+        if kind == "font":
+            links.append("<{}>; rel=preload; as=font; type=font/woff2; crossorigin".format(url))
+        else:
+            links.append("<{}>; rel=preload; as={}".format(url, kind))
+    return links
+
+
+def get_critical_assets(request: HttpRequest) -> List[Tuple[str, str]]:
+    """
+    The urls of the stylesheets, fonts and scripts every page needs (and what they are), following the theme (and
+    options) base.html will use
+    """
+    options = get_request_settings(request)
+    theme = get_ui_tweaks(request)["theme"]
+
+    styles = [static(get_fontawesome_css())]
+    if theme["name"] == "default":
+        styles.append(static("vendor/adminlte/css/adminlte.min.css"))
+    else:
+        styles.extend([static("vendor/adminlte/css/adminlte-components.min.css"), theme["src"]])
+    styles.append(static("jazzmin/css/main.css"))
+
+    fonts = []
+    if options["use_self_hosted_fonts"]:
+        fonts.append(static("vendor/source-sans-pro/source-sans-pro-latin-400-normal.woff2"))
+
+    scripts = [
+        "admin/js/vendor/jquery/jquery.js",
+        "vendor/bootstrap/js/bootstrap.bundle.min.js",
+        "vendor/adminlte/js/adminlte.min.js",
+    ] + get_bundle("main")
+
+    return [(x, "style") for x in styles] + [(x, "font") for x in fonts] + [(static(x), "script") for x in scripts]
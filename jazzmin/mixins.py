@@ -0,0 +1,666 @@
+"""
+Model admin mixins, for changelist features that need more than a template can do
+"""
+
+import hashlib
+import json
+import uuid
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Union
+from urllib.parse import unquote
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.templatetags.admin_list import items_for_result
+from django.contrib.admin.utils import display_for_value, label_for_field, lookup_field
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, PermissionDenied, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import InvalidPage
+from django.db import models, router, transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import Signal
+from django.forms.models import BaseModelFormSet
+from django.http import HttpRequest, HttpResponseBadRequest, HttpResponseBase, JsonResponse, StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.urls import URLPattern, path
+from django.utils import timezone
+from django.utils.html import conditional_escape, format_html
+from django.utils.translation import get_language
+from django.utils.translation import gettext as _
+
+from .compat import reverse
+from .settings import get_request_settings
+from .stats import TRACKED_MODELS, mark_changed
+from .utils import get_cache_scope
+
+# Where change_list_results.html leaves room for the rows we stream
+STREAM_MARKER = "<!-- jazzmin:rows -->"
+
+# Cookie holding the columns hidden with the column chooser (set by change_list.js), per model
+COLUMNS_COOKIE = "jazzmin_columns_{}_{}"
+
+# Rendered lazy cells, by admin site and tenant (see get_cache_scope), language, model, column, object and version
+LAZY_KEY = "jazzmin:lazy:{}:{}:{}:{}:{}:{}"
+
+# The most objects we load lazy cells for in one request
+LAZY_MAX_OBJECTS = 200
+
+# The attributes of a list_display callable the changelist uses, which placeholders keep
+LAZY_ATTRIBUTES = ("short_description", "admin_order_field", "empty_value_display")
+
+# The counts of a cached changelist page, and the version of each model cached changelists show
+CHANGELIST_KEY = "jazzmin:changelist:{}:{}"
+CHANGELIST_VERSION_KEY = "jazzmin:changelist:version:{}"
+
+# The models (app_label.model_name) shown by cached changelists, see bump_changelist_version
+CACHED_MODELS: Set[str] = set()
+
+
+class StreamingChangeListMixin:
+    """
+    Stream "Show all" changelists, rendering the page with the first chunk of results, then sending the rest of the
+    rows as we read them with .iterator(), so the results (and the rendered page) are never all in memory at once.
+    Under ASGI the response is an async iterator, reading each chunk in a thread, as django would read a sync one in
+    full before sending any of it.
+
+    Use it ahead of ModelAdmin, e.g class BookAdmin(StreamingChangeListMixin, admin.ModelAdmin)
+    """
+
+    # Rows read from the database (and sent) at a time
+    jazzmin_stream_chunk_size = 500
+
+    def get_changelist_instance(self, request: HttpRequest) -> ChangeList:
+        cl: ChangeList = super().get_changelist_instance(request)  # type: ignore[misc]
+        if self.should_stream(request, cl) and cl.result_count > self.jazzmin_stream_chunk_size:
+            # Swap in the first chunk before the view counts (so reads) the results
+            cl.jazzmin_queryset = cl.result_list
+            cl.result_list = list(cl.result_list[: self.jazzmin_stream_chunk_size])
+            cl.jazzmin_streaming = True
+        return cl
+
+    def changelist_view(self, request: HttpRequest, extra_context: Optional[Dict[str, Any]] = None) -> HttpResponseBase:
+        response = super().changelist_view(request, extra_context)  # type: ignore[misc]
+        if not isinstance(response, TemplateResponse) or not response.context_data:
+            return response
+        cl = response.context_data.get("cl")
+        if not getattr(cl, "jazzmin_streaming", False):
+            return response
+
+        response.context_data["selection_note"] = _("0 of %(cnt)s selected") % {"cnt": cl.result_count}
+        content = response.rendered_content
+        if STREAM_MARKER not in content:
+            # A custom results template, without room for the rows, render it as usual
+            cl.result_list = cl.jazzmin_queryset
+            cl.jazzmin_streaming = False
+            return response
+
+        head, tail = content.split(STREAM_MARKER, 1)
+        chunk_size = self.jazzmin_stream_chunk_size
+        rows = self._stream_rows(cl, cl.jazzmin_queryset[chunk_size:], chunk_size)
+        parts = self._stream(head, rows, tail)
+        streaming = StreamingHttpResponse(
+            self._astream(parts) if isinstance(request, ASGIRequest) else parts, status=response.status_code
+        )
+        for header, value in response.items():
+            streaming[header] = value
+        streaming.cookies = response.cookies
+        return streaming
+
+    def should_stream(self, request: HttpRequest, cl: ChangeList) -> bool:
+        """
+        Stream GET requests to show all results (list_editable needs the whole formset, so those are left alone)
+        """
+        return request.method == "GET" and cl.show_all and cl.can_show_all and not cl.list_editable
+
+    def _stream(self, head: str, rows: Iterable[str], tail: str) -> Iterator[str]:
+        yield head
+        yield from rows
+        yield tail
+
+    async def _astream(self, parts: Iterator[str]) -> AsyncIterator[str]:
+        # The database can't be used from async code, so each chunk is read (and rendered) in a thread
+        read = sync_to_async(lambda: next(parts, None))
+        while True:
+            part = await read()
+            if part is None:
+                return
+            yield part
+
+    def _stream_rows(self, cl: ChangeList, queryset: Any, start: int) -> Iterator[str]:
+        # The queryset is only read once the response is being sent, outside of any transaction the view ran in
+        results = queryset.iterator(chunk_size=self.jazzmin_stream_chunk_size)
+        index = start
+        while True:
+            rows = []
+            for result in islice(results, self.jazzmin_stream_chunk_size):
+                rows.append(
+                    '<tr role="row" class="{}">{}</tr>\n'.format(
+                        "odd" if index % 2 else "even", "".join(items_for_result(cl, result, None))
+                    )
+                )
+                index += 1
+            if not rows:
+                return
+            yield "".join(rows)
+
+
+class ColumnChooserMixin:
+    """
+    Let users choose the changelist columns they see, with a column chooser above the results (their choice is kept in
+    a cookie, per model). Hidden columns are left out of list_display, so they aren't computed at all, and the
+    select_related lookups only they need (see jazzmin_column_select_related) aren't followed.
+
+    Use it ahead of ModelAdmin, e.g class BookAdmin(ColumnChooserMixin, admin.ModelAdmin)
+    """
+
+    model: Any
+
+    # Columns hidden until the user chooses their own
+    jazzmin_hidden_columns: Sequence[str] = ()
+    # Columns that can't be hidden, along with list_display_links and list_editable
+    jazzmin_required_columns: Sequence[str] = ()
+    # The select_related lookups each column needs, added to list_select_related while the column is shown
+    jazzmin_column_select_related: Dict[str, Sequence[str]] = {}
+
+    def get_list_display(self, request: HttpRequest) -> Sequence[Any]:
+        list_display = self._get_all_columns(request)
+        hidden = self.get_hidden_columns(request)
+        return [x for x in list_display if column_name(x) not in hidden] or list_display[:1]
+
+    def get_list_select_related(self, request: HttpRequest) -> Union[bool, Sequence[str]]:
+        select_related: Union[bool, Sequence[str]] = super().get_list_select_related(request)  # type: ignore[misc]
+        if not self.jazzmin_column_select_related or select_related is True:
+            return select_related
+
+        list_display = self.get_list_display(request)
+        lookups = [
+            lookup
+            for column in list_display
+            for lookup in self.jazzmin_column_select_related.get(column_name(column), ())
+        ]
+        if not lookups:
+            return select_related
+        if select_related is False:
+            # Django would follow the relations in list_display, which returning lookups turns off, so add them
+            lookups.extend(self._related_fields(list_display))
+        else:
+            lookups.extend(select_related)
+        return list(dict.fromkeys(lookups))
+
+    def get_hidden_columns(self, request: HttpRequest) -> Set[str]:
+        """
+        The columns the user has hidden (or jazzmin_hidden_columns, until they choose), e.g to leave out annotations
+        only hidden columns need in get_queryset
+        """
+        cookie = request.COOKIES.get(self.get_columns_cookie())
+        hidden = set(self.jazzmin_hidden_columns) if cookie is None else {x for x in unquote(cookie).split(",") if x}
+        return hidden - self.get_required_columns(request)
+
+    def get_required_columns(self, request: HttpRequest) -> Set[str]:
+        list_display_links = getattr(self, "list_display_links", None) or ()
+        list_editable = getattr(self, "list_editable", None) or ()
+        return {column_name(x) for x in [*self.jazzmin_required_columns, *list_display_links, *list_editable]}
+
+    def get_columns_cookie(self) -> str:
+        opts = self.model._meta
+        return COLUMNS_COOKIE.format(opts.app_label, opts.model_name)
+
+    def get_column_choices(self, request: HttpRequest) -> List[Dict[str, Any]]:
+        """
+        Every column, with its label, and whether it's shown/can be hidden, for the column chooser
+        """
+        hidden = self.get_hidden_columns(request)
+        required = self.get_required_columns(request)
+        return [
+            {
+                "name": column_name(column),
+                "label": label_for_field(column, self.model, self),
+                "shown": column_name(column) not in hidden,
+                "required": column_name(column) in required,
+            }
+            for column in self._get_all_columns(request)
+        ]
+
+    def _get_all_columns(self, request: HttpRequest) -> Sequence[Any]:
+        list_display: Sequence[Any] = super().get_list_display(request)  # type: ignore[misc]
+        return list_display
+
+    def _related_fields(self, list_display: Sequence[Any]) -> List[str]:
+        fields = []
+        for column in list_display:
+            try:
+                field = self.model._meta.get_field(column_name(column))
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_one or field.one_to_one:
+                fields.append(field.name)
+        return fields
+
+
+class LazyColumnsMixin:
+    """
+    Load the cells of slow list_display callables (see jazzmin.utils.lazy_column) after the changelist, which renders
+    placeholders for them, then fetches the cells for the rows on the page in batches (from lazy_columns_view), each
+    cached by object and version, if the objects have one (see get_lazy_version).
+
+    Use it ahead of ModelAdmin, e.g class BookAdmin(LazyColumnsMixin, admin.ModelAdmin)
+    """
+
+    model: Any
+    admin_site: Any
+
+    # A field that changes whenever the object does (e.g a last modified timestamp), so cached cells aren't stale
+    jazzmin_lazy_version_field: Optional[str] = None
+
+    def get_list_display(self, request: HttpRequest) -> Sequence[Any]:
+        list_display: Sequence[Any] = super().get_list_display(request)  # type: ignore[misc]
+        return [self._lazy_placeholder(x) if self._lazy_callable(x) else x for x in list_display]
+
+    def get_urls(self) -> List[URLPattern]:
+        opts = self.model._meta
+        urls: List[URLPattern] = super().get_urls()  # type: ignore[misc]
+        return [
+            path(
+                "jazzmin-lazy/",
+                self.admin_site.admin_view(self.lazy_columns_view),
+                name="{}_{}_jazzmin_lazy".format(opts.app_label, opts.model_name),
+            )
+        ] + urls
+
+    def get_lazy_columns_url(self) -> str:
+        opts = self.model._meta
+        return str(reverse("{}:{}_{}_jazzmin_lazy".format(self.admin_site.name, opts.app_label, opts.model_name)))
+
+    def get_lazy_version(self, obj: Any) -> Optional[str]:
+        """
+        The version of the object cached cells are for, None not to cache them, as they'd be stale once it changes
+        """
+        if self.jazzmin_lazy_version_field:
+            return str(getattr(obj, self.jazzmin_lazy_version_field))
+        return None
+
+    def get_lazy_cache_key(self, request: HttpRequest, obj: Any, column: str) -> Optional[str]:
+        """
+        The key to cache the cell under, cells are localised, and can depend on the site's (or tenant's) settings
+        """
+        version = self.get_lazy_version(obj)
+        if version is None:
+            return None
+        scope = get_cache_scope(request)
+        return LAZY_KEY.format(scope, get_language(), self.model._meta.label_lower, column, obj.pk, version)
+
+    def lazy_columns_view(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        The rendered lazy cells of the given columns (column=) for the given objects (pk=), as {pk: {column: html}}
+        """
+        if not self.has_view_or_change_permission(request):  # type: ignore[attr-defined]
+            raise PermissionDenied
+
+        lazy_columns = self._get_lazy_columns(request)
+        columns = [x for x in dict.fromkeys(request.GET.getlist("column")) if x in lazy_columns]
+        try:
+            pks = [self.model._meta.pk.to_python(x) for x in request.GET.getlist("pk")[:LAZY_MAX_OBJECTS]]
+        except ValidationError:
+            return HttpResponseBadRequest()
+
+        # Works out the request's tenant, for the cache keys
+        get_request_settings(request, self.admin_site.name)
+        objects = list(self.get_queryset(request).filter(pk__in=pks)) if columns else []  # type: ignore[attr-defined]
+        keys = {
+            (obj.pk, column): self.get_lazy_cache_key(request, obj, column) for obj in objects for column in columns
+        }
+        cached = cache.get_many([x for x in keys.values() if x is not None])
+
+        cells: Dict[str, Dict[str, str]] = {}
+        for obj in objects:
+            cells[str(obj.pk)] = {}
+            for column in columns:
+                key = keys[(obj.pk, column)]
+                if key is None or key not in cached:
+                    html = self._render_lazy_cell(obj, lazy_columns[column])
+                    if key is not None:
+                        timeout = self._lazy_callable(lazy_columns[column]).jazzmin_lazy_timeout
+                        cache.set(key, html, timeout=timeout)
+                    cells[str(obj.pk)][column] = html
+                else:
+                    cells[str(obj.pk)][column] = cached[key]
+
+        return JsonResponse(cells)
+
+    def _get_lazy_columns(self, request: HttpRequest) -> Dict[str, Any]:
+        list_display: Sequence[Any] = super().get_list_display(request)  # type: ignore[misc]
+        return {column_name(x): x for x in list_display if self._lazy_callable(x)}
+
+    def _lazy_callable(self, column: Any) -> Any:
+        """
+        The callable for the column, if it's lazy
+        """
+        if callable(column):
+            func = column
+        elif hasattr(self, column):
+            func = getattr(self, column)
+        else:
+            func = getattr(self.model, column, None)
+        return func if callable(func) and getattr(func, "jazzmin_lazy", False) else None
+
+    def _lazy_placeholder(self, column: Any) -> Callable[[Any], str]:
+        name = column_name(column)
+        func = self._lazy_callable(column)
+
+        def placeholder(obj: Any) -> str:
+            return str(
+                format_html(
+                    '<span data-jazzmin-lazy="{}" data-pk="{}">'
+                    '<span class="spinner-border spinner-border-sm text-muted" role="status"></span>'
+                    "</span>",
+                    name,
+                    obj.pk,
+                )
+            )
+
+        placeholder.__name__ = name
+        for attribute in LAZY_ATTRIBUTES:
+            if hasattr(func, attribute):
+                setattr(placeholder, attribute, getattr(func, attribute))
+        return placeholder
+
+    def _render_lazy_cell(self, obj: Any, column: Any) -> str:
+        # As the changelist would have rendered it, see django.contrib.admin.templatetags.admin_list.items_for_result
+        _, func, value = lookup_field(column, obj, self)
+        empty_value_display = getattr(func, "empty_value_display", self.get_empty_value_display())  # type: ignore[attr-defined]
+        return str(conditional_escape(display_for_value(value, empty_value_display, getattr(func, "boolean", False))))
+
+
+class CachedResultList:
+    """
+    Stands in for the results of a cached changelist page, so we can count them (as the changelist view does) without
+    reading them, which we only do if the rendered results have gone from the cache
+    """
+
+    def __init__(self, queryset: Any, count: int):
+        self.queryset = queryset
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.queryset)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.queryset[key]
+
+
+class CachedChangeList(ChangeList):
+    """
+    A changelist that takes its counts from the cache, for CachedChangeListMixin
+    """
+
+    result_count: int
+    full_result_count: Optional[int]
+    result_list: Any
+
+    def get_results(self, request: HttpRequest) -> None:
+        self.jazzmin_cache_key = self.model_admin.get_changelist_cache_key(request, self)
+        cached = cache.get(self.jazzmin_cache_key) if self.jazzmin_cache_key else None
+        if cached is None:
+            super().get_results(request)
+            if self.jazzmin_cache_key:
+                counts = {
+                    "result_count": self.result_count,
+                    "full_result_count": self.full_result_count,
+                    "rows": len(self.result_list),
+                }
+                cache.set(self.jazzmin_cache_key, counts, timeout=self.model_admin.jazzmin_cache_timeout)
+            return
+
+        # As ChangeList.get_results does, with the counts we have
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        paginator.__dict__["count"] = cached["result_count"]
+        self.result_count = cached["result_count"]
+        self.full_result_count = cached["full_result_count"]
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(self.full_result_count)
+        self.can_show_all = self.result_count <= self.list_max_show_all
+        self.multi_page = self.result_count > self.list_per_page
+        if (self.show_all and self.can_show_all) or not self.multi_page:
+            queryset = self.queryset._clone()
+        else:
+            try:
+                queryset = paginator.page(self.page_num).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+        self.result_list = CachedResultList(queryset, cached["rows"])
+        self.paginator = paginator
+
+
+class CachedChangeListMixin:
+    """
+    Cache changelist pages, the result counts, and the rendered results (see change_list.html), by the query, the
+    columns shown, and the user's permissions. Saving or deleting the model (or those in jazzmin_cache_models) moves
+    its version on, so cached pages are never stale, call bump_changelist_version after changing objects without
+    signals (e.g with update() or bulk_create()), which actions on the changelist do for you.
+
+    Use it ahead of ModelAdmin, e.g class BookAdmin(CachedChangeListMixin, admin.ModelAdmin)
+    """
+
+    model: Any
+    admin_site: Any
+
+    # How long to cache pages for (seconds), None for as long as the cache keeps them
+    jazzmin_cache_timeout: Optional[int] = 300
+    # Other models (app_label.model_name) the changelist shows, e.g through list_display or __str__
+    jazzmin_cache_models: Sequence[str] = ()
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        CACHED_MODELS.update(self.get_cache_models())
+        connect_changelist_receivers(self.get_cache_models())
+
+    def get_cache_models(self) -> List[str]:
+        return [self.model._meta.label_lower, *[x.lower() for x in self.jazzmin_cache_models]]
+
+    def get_changelist(self, request: HttpRequest, **kwargs: Any) -> Any:
+        return CachedChangeList
+
+    def get_changelist_cache_key(self, request: HttpRequest, cl: ChangeList) -> Optional[str]:
+        """
+        The key to cache the changelist page under, or None not to cache it (e.g list_editable, as the formset needs
+        the results)
+        """
+        if request.method != "GET" or cl.list_editable:
+            return None
+
+        models = self.get_cache_models()
+        versions = cache.get_many([CHANGELIST_VERSION_KEY.format(x) for x in models])
+        # Works out the request's tenant, whose settings the results can depend on
+        get_request_settings(request, self.admin_site.name)
+        vary = {
+            "site": get_cache_scope(request),
+            "query": sorted(request.GET.lists()),
+            "columns": [column_name(x) for x in cl.list_display],
+            "language": get_language(),
+            "timezone": timezone.get_current_timezone_name(),
+            "user": self.get_changelist_cache_vary(request),
+            "versions": [versions.get(CHANGELIST_VERSION_KEY.format(x)) for x in models],
+        }
+        digest = hashlib.md5(json.dumps(vary, sort_keys=True, default=str).encode()).hexdigest()
+        return CHANGELIST_KEY.format(self.model._meta.label_lower, digest)
+
+    def get_changelist_cache_vary(self, request: HttpRequest) -> Any:
+        """
+        What the page depends on about the user, their permissions, override it if get_queryset depends on the user
+        """
+        user = request.user
+        return [user.is_superuser, sorted(user.get_all_permissions())]
+
+    def response_action(self, request: HttpRequest, queryset: Any) -> Any:
+        response = super().response_action(request, queryset)  # type: ignore[misc]
+        # Actions may change the objects without sending signals
+        bump_changelist_version(self.model)
+        return response
+
+
+def bump_changelist_version(sender: Any, **kwargs: Any) -> None:
+    """
+    Move on the version of the model (and any the signal was about), so its cached changelists (see
+    CachedChangeListMixin) aren't used again, connected to post_save, post_delete and m2m_changed for those models (see
+    connect_changelist_receivers)
+    """
+    models = {sender, type(kwargs["instance"]) if "instance" in kwargs else None, kwargs.get("model")}
+    for model in models:
+        label = getattr(getattr(model, "_meta", None), "label_lower", None)
+        if label in CACHED_MODELS:
+            cache.set(CHANGELIST_VERSION_KEY.format(label), uuid.uuid4().hex, timeout=None)
+
+
+class DirtyRowsFormSet(BaseModelFormSet):
+    """
+    A list_editable formset that only binds the rows that were sent (see DirtyRowsMixin), those left out are unbound
+    forms showing the object as it is (from rows, the changelist's results), so they're neither validated nor saved
+    """
+
+    rows: Optional[Sequence[Any]] = None
+
+    def is_sent(self, i: int) -> bool:
+        return "{}-{}".format(self.add_prefix(i), self.model._meta.pk.name) in self.data
+
+    def _construct_form(self, i: int, **kwargs: Any) -> Any:
+        rows = self.rows
+        if self.is_bound and rows is not None and i < min(self.initial_form_count(), len(rows)) and not self.is_sent(i):
+            form = super()._construct_form(i, data=None, files=None, instance=rows[i], **kwargs)
+            # Unbound forms compare their (empty) data to the object, so would look changed to changelist_view
+            form.has_changed = lambda: False
+            return form
+        return super()._construct_form(i, **kwargs)
+
+    def is_valid(self) -> bool:
+        if not self.is_bound:
+            return False
+        self.errors
+        return all(form.is_valid() for form in self.forms if form.is_bound) and not self.non_form_errors()
+
+
+class DirtyRowsMixin:
+    """
+    Only send, validate and save the list_editable rows that have changed, change_list.js leaves the others out of the
+    form, and they're saved together with one bulk_update (in the same transaction as their log entries), unless that
+    would skip code that runs on save (see can_bulk_update).
+
+    Use it ahead of ModelAdmin, e.g class BookAdmin(DirtyRowsMixin, admin.ModelAdmin)
+    """
+
+    model: Any
+
+    # Tells change_list.js it can leave out the rows that haven't changed
+    jazzmin_dirty_rows = True
+    # Save the changed rows with bulk_update where it's safe to
+    jazzmin_bulk_update = True
+
+    def get_changelist_instance(self, request: HttpRequest) -> ChangeList:
+        cl: ChangeList = super().get_changelist_instance(request)  # type: ignore[misc]
+        setattr(request, "jazzmin_changelist", cl)
+        return cl
+
+    def get_changelist_formset(self, request: HttpRequest, **kwargs: Any) -> Any:
+        kwargs.setdefault("formset", DirtyRowsFormSet)
+        formset = super().get_changelist_formset(request, **kwargs)  # type: ignore[misc]
+        # The objects of the rows not sent, the formset's queryset only has those that were
+        cl = getattr(request, "jazzmin_changelist", None)
+        formset.rows = cl.result_list if cl is not None else None
+        return formset
+
+    def changelist_view(self, request: HttpRequest, extra_context: Optional[Dict[str, Any]] = None) -> HttpResponseBase:
+        if request.method != "POST" or "_save" not in request.POST or not self.can_bulk_update(request):
+            return super().changelist_view(request, extra_context)  # type: ignore[misc]
+
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            pending: List[Any] = []
+            setattr(request, "jazzmin_bulk_update", pending)
+            response = super().changelist_view(request, extra_context)  # type: ignore[misc]
+            self.bulk_update(request, pending)
+        return response
+
+    def save_model(self, request: HttpRequest, obj: Any, form: Any, change: bool) -> None:
+        pending = getattr(request, "jazzmin_bulk_update", None)
+        if pending is None:
+            super().save_model(request, obj, form, change)  # type: ignore[misc]
+        else:
+            pending.append((obj, form.changed_data))
+
+    def can_bulk_update(self, request: HttpRequest) -> bool:
+        """
+        Whether we can save rows with bulk_update, which doesn't call the model's save() or save_model(), or send
+        pre_save/post_save signals, so only if none of these do anything beyond what django (or jazzmin) does
+        """
+        return bool(
+            self.jazzmin_bulk_update
+            and self.model.save is models.Model.save
+            and type(self).save_model is DirtyRowsMixin.save_model
+            and not any(has_other_receivers(signal, self.model) for signal in (pre_save, post_save))
+        )
+
+    def bulk_update(self, request: HttpRequest, pending: List[Any]) -> None:
+        """
+        Save the changed fields of the objects from the changed rows, along with any auto_now fields, running each
+        field's pre_save as save() would (e.g so file fields store their uploads)
+        """
+        if not pending:
+            return
+
+        objs = [obj for obj, changed in pending]
+        changed = {name for obj, names in pending for name in names}
+        fields = [x for x in self.model._meta.concrete_fields if x.name in changed or getattr(x, "auto_now", False)]
+        for obj in objs:
+            for field in fields:
+                setattr(obj, field.attname, field.pre_save(obj, False))
+
+        self.model._default_manager.bulk_update(objs, [x.name for x in fields])
+        # What our post_save receivers would have done
+        if self.model._meta.label_lower in TRACKED_MODELS:
+            mark_changed(self.model)
+        bump_changelist_version(self.model)
+
+
+def has_other_receivers(signal: Signal, model: Any) -> bool:
+    """
+    Whether anything other than jazzmin is connected to the signal for the model (or every model)
+    """
+    senders = {id(None), id(model)}
+    for receiver in signal.receivers:
+        dispatch_uid, sender = receiver[0]
+        if sender in senders and not (isinstance(dispatch_uid, str) and dispatch_uid.startswith("jazzmin_")):
+            return True
+    return False
+
+
+def connect_changelist_receivers(labels: Iterable[str]) -> None:
+    """
+    Connect bump_changelist_version to the saves and deletes of the given models (app_label.model_name), and changes to
+    their many to many relations, just for those models, as any delete receiver stops django deleting a model's objects
+    without loading them first
+    """
+    for label in labels:
+        model = apps.get_model(label)
+        post_save.connect(bump_changelist_version, sender=model, dispatch_uid="jazzmin_changelist_post_save_" + label)
+        post_delete.connect(
+            bump_changelist_version, sender=model, dispatch_uid="jazzmin_changelist_post_delete_" + label
+        )
+        for field in model._meta.get_fields():
+            if field.many_to_many:
+                through = field.remote_field.through if field.concrete else field.through
+                m2m_changed.connect(
+                    bump_changelist_version,
+                    sender=through,
+                    dispatch_uid="jazzmin_changelist_m2m_changed_{}_{}".format(label, through._meta.label_lower),
+                )
+
+
+def column_name(column: Any) -> str:
+    """
+    The name of a list_display item, which can be a field/attribute name or a callable
+    """
+    return column if isinstance(column, str) else getattr(column, "__name__", str(column))
@@ -0,0 +1,174 @@
+"""
+N+1 query detection, QueryInspectorMiddleware records the queries run for admin pages, working out what ran each one
+(a list_display column, a readonly field, a list filter or a template variable in an inline) from the stack, so we can
+report the same query being run over and over for rows/forms, along with the select_related/prefetch_related that would
+avoid it.
+"""
+
+import re
+import sys
+from collections import defaultdict
+from types import FrameType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from django.contrib.admin import FieldListFilter
+from django.contrib.admin.helpers import AdminReadonlyField
+from django.template.base import VariableNode
+
+from .mixins import column_name
+
+# How many times the same query has to run, from the same place, to be reported
+REPEATED_QUERIES = 3
+
+# How far up the stack we look for what ran a query
+MAX_DEPTH = 80
+
+PARAMS_RE = re.compile(r"%s(?:\s*,\s*%s)+")
+TABLE_RE = re.compile(r"\bFROM\s+[\"`\[]?(\w+)", re.IGNORECASE)
+
+
+class Origin(NamedTuple):
+    # list_display, readonly_fields, list_filter or inline
+    kind: str
+    name: str
+    model: Any
+    # The row/form object the query was for, if we know
+    pk: Any
+
+
+class QueryInspector:
+    """
+    A database execute wrapper (see django.db.connection.execute_wrapper), recording the shape of each query and where
+    it came from
+    """
+
+    def __init__(self) -> None:
+        self.active = False
+        self.total = 0
+        self.queries: List[Tuple[Optional[Origin], str]] = []
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        if self.active:
+            self.total += 1
+            self.queries.append((find_origin(sys._getframe(1)), get_shape(sql)))
+        return execute(sql, params, many, context)
+
+    def get_report(self) -> List[Dict[str, Any]]:
+        """
+        The queries run REPEATED_QUERIES times or more from the same place, most first
+        """
+        repeated: Dict[Tuple[str, str, Any, str], List[Any]] = defaultdict(list)
+        for origin, shape in self.queries:
+            if origin is not None:
+                repeated[(origin.kind, origin.name, origin.model, shape)].append(origin.pk)
+
+        report = []
+        for (kind, name, model, shape), pks in repeated.items():
+            if len(pks) < REPEATED_QUERIES:
+                continue
+            rows: Set[Any] = {x for x in pks if x is not None}
+            report.append(
+                {
+                    "kind": kind,
+                    "name": name,
+                    "model": model._meta.label if model else None,
+                    "count": len(pks),
+                    "rows": len(rows),
+                    "sql": shape,
+                    "suggestion": get_suggestion(kind, model, shape),
+                }
+            )
+
+        return sorted(report, key=lambda x: -x["count"])
+
+
+def get_shape(sql: str) -> str:
+    """
+    The query without its parameters (which the sql doesn't include anyway), and with IN (%s, %s...) collapsed, so the
+    same query for different objects has the same shape
+    """
+    return PARAMS_RE.sub("%s", sql)
+
+
+def find_origin(frame: Optional[FrameType]) -> Optional[Origin]:
+    """
+    What ran the query, from the innermost admin code on the stack we know about
+    """
+    depth = 0
+    while frame is not None and depth < MAX_DEPTH:
+        module, function, f_locals = frame.f_globals.get("__name__"), frame.f_code.co_name, frame.f_locals
+        owner = f_locals.get("self")
+
+        if module == "django.contrib.admin.templatetags.admin_list" and function == "items_for_result":
+            field_name, result = f_locals.get("field_name"), f_locals.get("result")
+            if field_name is not None:
+                return Origin(
+                    "list_display", column_name(field_name), f_locals["cl"].model, getattr(result, "pk", None)
+                )
+
+        elif module == "django.contrib.admin.helpers" and isinstance(owner, AdminReadonlyField):
+            instance = owner.form.instance
+            return Origin("readonly_fields", column_name(owner.field["field"]), type(instance), instance.pk)
+
+        elif module == "django.contrib.admin.filters" and isinstance(owner, FieldListFilter):
+            return Origin("list_filter", owner.field_path, owner.field.related_model, None)
+
+        elif module == "django.template.base" and function == "render" and isinstance(owner, VariableNode):
+            context = f_locals.get("context")
+            if context is not None and context.get("inline_admin_formset") is not None:
+                model = context["inline_admin_formset"].formset.model
+                original = getattr(context.get("inline_admin_form"), "original", None)
+                return Origin("inline", owner.filter_expression.token, model, getattr(original, "pk", None))
+
+        frame = frame.f_back
+        depth += 1
+
+    return None
+
+
+def get_suggestion(kind: str, model: Any, sql: str) -> Optional[str]:
+    """
+    The select_related/prefetch_related that would fetch the table the query reads along with the objects
+    """
+    match = TABLE_RE.search(sql)
+    if not match or model is None:
+        return None
+
+    lookup = find_relation(model, match.group(1))
+    if lookup is None:
+        return None
+
+    method, path = lookup
+    if kind == "list_display" and method == "select_related":
+        return 'list_select_related = ["{}"]'.format(path)
+    return '.{}("{}")'.format(method, path)
+
+
+def find_relation(model: Any, table: str, depth: int = 2) -> Optional[Tuple[str, str]]:
+    """
+    The relation (as select_related or prefetch_related, and its lookup) from the model to the table, following
+    forward relations up to depth deep
+    """
+    relations = [x for x in model._meta.get_fields() if x.is_relation and x.related_model not in (None, model)]
+    for field in relations:
+        if field.related_model._meta.db_table == table:
+            return _method(field), _accessor(field)
+
+    if depth > 1:
+        for field in relations:
+            if _method(field) != "select_related":
+                continue
+            nested = find_relation(field.related_model, table, depth - 1)
+            if nested is not None:
+                return nested[0], "{}__{}".format(field.name, nested[1])
+
+    return None
+
+
+def _method(field: Any) -> str:
+    return "select_related" if field.many_to_one or field.one_to_one else "prefetch_related"
+
+
+def _accessor(field: Any) -> str:
+    # Reverse relations are followed by their accessor, e.g book_set
+    return str(field.get_accessor_name() if field.auto_created and not field.concrete else field.name)
@@ -0,0 +1,17 @@
+from typing import Any
+
+from django.core.signals import request_started, setting_changed
+
+from .stats import connect_receivers
+
+
+def connect_on_first_request(**kwargs: Any) -> None:
+    # By now the admin sites have their models
+    request_started.disconnect(dispatch_uid="jazzmin_stats_request_started")
+    connect_receivers()
+
+
+# Keep track of which models have changed, so the jazzmin_stats command only recounts those
+connect_receivers()
+request_started.connect(connect_on_first_request, dispatch_uid="jazzmin_stats_request_started")
+setting_changed.connect(connect_receivers, dispatch_uid="jazzmin_stats_setting_changed")
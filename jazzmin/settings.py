@@ -1,11 +1,18 @@
 import copy
 import logging
-from typing import Any, Dict
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.http import HttpRequest
 from django.templatetags.static import static
+from django.urls import get_script_prefix
+from django.utils.translation import get_language
 
-from .utils import get_admin_url, get_model_meta
+from .dashboard import normalise_widget
+from .utils import get_admin_site, get_admin_url, get_current_app, get_model_meta
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +76,27 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     # Icons that are used when one is not manually specified
     "default_icon_parents": "fas fa-chevron-circle-right",
     "default_icon_children": "fas fa-circle",
+    # Counts to show against models in the side menu and dashboard, keyed on model e.g {"loans.bookloan": callable},
+    # the callable takes no arguments and returns a number or a queryset to count (counts are shared by all users)
+    "model_badges": {},
+    # Seconds a badge count stays fresh for, and how long after that a stale count is shown while it is refreshed
+    "model_badges_ttl": 60,
+    "model_badges_stale_ttl": 600,
+    # How many badges to count at once in the background (1 counts them one after another)
+    "model_badges_workers": 4,
+    #############
+    # Dashboard #
+    #############
+    # Widgets to show above the apps on the dashboard, see jazzmin.dashboard.DEFAULT_WIDGET for the options
+    "dashboard_widgets": [],
+    # How many widgets to load at once (1 loads them one after another)
+    "dashboard_widget_workers": 4,
+    # Show model counts and recent activity on the dashboard, from snapshots made by the jazzmin_stats command
+    "dashboard_stats": False,
+    # Models to count e.g ["books.book"] (defaults to every model registered with an admin site)
+    "dashboard_stats_models": [],
+    # How many days of activity to show
+    "dashboard_stats_days": 14,
     #################
     # Related Modal #
     #################
@@ -82,6 +110,19 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "custom_js": None,
     # Whether to link font from fonts.googleapis.com (use custom_css to supply font otherwise)
     "use_google_fonts_cdn": True,
+    # Whether to use the copy of the font bundled with jazzmin instead (takes precedence over use_google_fonts_cdn)
+    "use_self_hosted_fonts": False,
+    # Whether to register a service worker that serves jazzmin's static files cache first (needs jazzmin.urls)
+    "use_service_worker": False,
+    # Whether links and search/filter forms in the admin swap in just the content of the next page, keeping the navbar,
+    # sidebar and footer, instead of loading the whole page
+    "partial_navigation": False,
+    # Whether searching, filtering, sorting and paging changelists only fetch (and swap in) the results, instead of
+    # loading the whole page
+    "changelist_ajax": False,
+    # Changelists showing more rows than this (e.g 200) only put the rows you can see in the page, adding the rest as
+    # you scroll (not for list_editable), None to turn off
+    "changelist_virtual_rows": None,
     # Whether to show the UI customizer on the sidebar
     "show_ui_builder": False,
     # Whether to show the theme chooser dropdown in the top navbar
@@ -100,6 +141,17 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "changeform_format_overrides": {},
     # Add a language dropdown into the admin
     "language_chooser": False,
+    ################
+    # Multi tenant #
+    ################
+    # Callable that receives the request and returns a hashable key for its tenant (e.g lambda r: r.get_host())
+    "tenant_key": None,
+    # Callable that receives a tenant key and returns the JAZZMIN_SETTINGS to override for that tenant
+    "tenant_settings": None,
+    # How many resolved settings (per admin site, tenant and language) to keep, least recently used are dropped
+    "tenant_cache_size": 128,
+    # The tenant keys you serve (or a callable returning them), for what looks at every tenant (e.g jazzmin_icons)
+    "tenants": None,
 }
 
 #######################################
@@ -194,6 +246,43 @@ THEMES = {
     "vapor": "vendor/bootswatch/vapor/bootstrap.min.css",
 }
 
+
+# Cookies holding the theme and color scheme chosen in the theme chooser, set by main.js
+THEME_COOKIE = "jazzmin_theme"
+THEME_MODE_COOKIE = "jazzmin_theme_mode"
+
+# Sent by partial navigation, asking for just the content of the page
+PARTIAL_HEADER = "X-Jazzmin-Partial"
+
+# Sent by changelists (see changelist_ajax), asking for just their results
+FRAGMENT_HEADER = "X-Jazzmin-Fragment"
+
+
+def get_allowed_themes(request: Optional[HttpRequest] = None, admin_site: Optional[str] = None) -> List[str]:
+    """
+    Get the themes that can be used, the configured theme, and the default we fall back to, along with JAZZMIN_THEMES
+    (which defaults to every theme if the theme chooser or UI builder are shown)
+
+    The theme chooser and UI builder are those of the request's admin site and tenant, without a request (as in
+    collectstatic, see finders.py) every theme is allowed if any of the tenants listed in the tenants setting show them
+    """
+    theme = getattr(settings, "JAZZMIN_UI_TWEAKS", {}).get("theme")
+    allowed = getattr(settings, "JAZZMIN_THEMES", None)
+    if allowed is None:
+        if request is not None:
+            site_settings = [get_request_settings(request, admin_site)]
+        else:
+            admin_site = admin_site or "admin"
+            site_settings = [get_settings(admin_site)]
+            site_settings += [get_settings(admin_site, tenant=x) for x in get_tenants(admin_site)]
+
+        if any(x["show_theme_chooser"] or x["show_ui_builder"] for x in site_settings):
+            return list(THEMES.keys())
+        allowed = []
+
+    return [x for x in THEMES.keys() if x in ("default", theme) or x in allowed]
+
+
 CHANGEFORM_TEMPLATES = {
     "single": "jazzmin/includes/single.html",
     "carousel": "jazzmin/includes/carousel.html",
@@ -214,11 +303,89 @@ def get_search_model_string(search_model: str) -> str:
     return "{app}.{model_name}".format(app=app, model_name=model_name.lower())
 
 
-def get_settings() -> Dict[str, Any]:
+# Fully resolved settings, keyed on (site name, tenant, language, script prefix) as reversed urls vary by all of them,
+# populated on first use, bounded by tenant_cache_size and emptied whenever django settings change
+_site_settings: "OrderedDict[Tuple[str, Optional[Hashable], Optional[str], str], Dict[str, Any]]" = OrderedDict()
+_site_settings_lock = threading.Lock()
+
+
+def clear_settings_cache(**kwargs: Any) -> None:
+    with _site_settings_lock:
+        _site_settings.clear()
+
+
+setting_changed.connect(clear_settings_cache)
+
+
+def get_settings(admin_site: str = "admin", tenant: Optional[Hashable] = None) -> Dict[str, Any]:
+    """
+    Get the jazzmin settings resolved against the given admin site (by name) and tenant, these are computed once per
+    site, tenant and language, so treat the returned dict as read only
+    """
+    key = (admin_site, tenant, get_language(), get_script_prefix())
+    with _site_settings_lock:
+        if key in _site_settings:
+            _site_settings.move_to_end(key)
+            return _site_settings[key]
+
+    jazzmin_settings = _resolve_settings(admin_site, tenant)
+    max_size = (
+        getattr(settings, "JAZZMIN_SETTINGS", {}).get("tenant_cache_size") or DEFAULT_SETTINGS["tenant_cache_size"]
+    )
+    with _site_settings_lock:
+        _site_settings[key] = jazzmin_settings
+        while len(_site_settings) > max_size:
+            _site_settings.popitem(last=False)
+
+    return jazzmin_settings
+
+
+def get_request_settings(request: Optional[HttpRequest], admin_site: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get the jazzmin settings for this request, using the admin site serving it, and its tenant if tenant_key is set
+    """
+    admin_site = admin_site or get_current_app(request)
+    jazzmin_settings = get_settings(admin_site)
+    if request is None or not jazzmin_settings["tenant_key"]:
+        return jazzmin_settings
+
+    # Only work out the tenant once per request
+    if not hasattr(request, "jazzmin_tenant"):
+        setattr(request, "jazzmin_tenant", jazzmin_settings["tenant_key"](request))
+
+    tenant = getattr(request, "jazzmin_tenant")
+    if tenant is None:
+        return jazzmin_settings
+
+    return get_settings(admin_site, tenant=tenant)
+
+
+def get_tenants(admin_site: str = "admin") -> List[Hashable]:
+    """
+    Get the tenant keys from the tenants setting, which may be a callable returning them
+    """
+    tenants = get_settings(admin_site)["tenants"]
+    if callable(tenants):
+        tenants = tenants()
+    return list(tenants or [])
+
+
+def _resolve_settings(admin_site: str, tenant: Optional[Hashable] = None) -> Dict[str, Any]:
     jazzmin_settings = copy.deepcopy(DEFAULT_SETTINGS)
     user_settings = {x: y for x, y in getattr(settings, "JAZZMIN_SETTINGS", {}).items() if y is not None}
     jazzmin_settings.update(user_settings)
 
+    # Layer on the overrides for this tenant
+    if tenant is not None and jazzmin_settings["tenant_settings"]:
+        tenant_settings = jazzmin_settings["tenant_settings"](tenant) or {}
+        jazzmin_settings.update({x: y for x, y in tenant_settings.items() if y is not None})
+
+    # Fall back to the titles of the admin site we are resolving for
+    site = get_admin_site(admin_site)
+    jazzmin_settings["site_title"] = jazzmin_settings["site_title"] or getattr(site, "site_title", None)
+    jazzmin_settings["site_header"] = jazzmin_settings["site_header"] or getattr(site, "site_header", None)
+    jazzmin_settings["site_brand"] = jazzmin_settings["site_brand"] or getattr(site, "site_header", None)
+
     # Extract search model configuration from search_model setting
     if jazzmin_settings["search_model"]:
         if not isinstance(jazzmin_settings["search_model"], list):
@@ -227,8 +394,9 @@ def get_settings() -> Dict[str, Any]:
         jazzmin_settings["search_models_parsed"] = []
         for search_model in jazzmin_settings["search_model"]:
             jazzmin_search_model = {}
-            jazzmin_search_model["search_url"] = get_admin_url(get_search_model_string(search_model))
-
+            jazzmin_search_model["search_url"] = get_admin_url(
+                get_search_model_string(search_model), admin_site=admin_site
+            )
             model_meta = get_model_meta(search_model)
             if model_meta:
                 jazzmin_search_model["search_name"] = model_meta.verbose_name_plural.title()
@@ -248,6 +416,12 @@ def get_settings() -> Dict[str, Any]:
     # Ensure icon model names and classes are lower case
     jazzmin_settings["icons"] = {x.lower(): y.lower() for x, y in jazzmin_settings.get("icons", {}).items()}
 
+    # Ensure badge model names are lower case
+    jazzmin_settings["model_badges"] = {x.lower(): y for x, y in jazzmin_settings.get("model_badges", {}).items()}
+
+    # Fill in the defaults for each dashboard widget
+    jazzmin_settings["dashboard_widgets"] = [normalise_widget(x) for x in jazzmin_settings["dashboard_widgets"]]
+
     # Default the site icon using the site logo
     jazzmin_settings["site_icon"] = jazzmin_settings["site_icon"] or jazzmin_settings["site_logo"]
 
@@ -265,7 +439,28 @@ def get_settings() -> Dict[str, Any]:
     return jazzmin_settings
 
 
-def get_ui_tweaks() -> Dict[str, Any]:
+def get_chosen_theme(
+    request: Optional[HttpRequest], theme: str, theme_mode: str, admin_site: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Get the theme and color scheme chosen in the theme chooser, falling back to the given ones
+    """
+    if request is None or not get_request_settings(request, admin_site)["show_theme_chooser"]:
+        return theme, theme_mode
+
+    chosen_theme = request.COOKIES.get(THEME_COOKIE, theme)
+    chosen_mode = request.COOKIES.get(THEME_MODE_COOKIE, theme_mode)
+    return (
+        chosen_theme if chosen_theme in THEMES and chosen_theme in get_allowed_themes(request, admin_site) else theme,
+        chosen_mode if chosen_mode in ("light", "dark", "auto") else theme_mode,
+    )
+
+
+def get_ui_tweaks(request: Optional[HttpRequest] = None) -> Dict[str, Any]:
+    """
+    Get the UI tweaks, with the theme and color scheme the user picked in the theme chooser (stored in cookies by
+    main.js) in place of the configured ones, if we have a request and the theme chooser is enabled
+    """
     raw_tweaks = copy.deepcopy(DEFAULT_UI_TWEAKS)
     user_tweaks = getattr(settings, "JAZZMIN_UI_TWEAKS", {})
     raw_tweaks.update(user_tweaks)
@@ -324,12 +519,16 @@ def get_ui_tweaks() -> Dict[str, Any]:
         logger.warning("default_theme_mode must be light, dark, or auto; using light")
         default_theme_mode = "light"
 
+    theme, theme_mode = get_chosen_theme(request, theme, default_theme_mode)
+
     theme_body_classes = " theme-{}".format(theme)
 
     ret = {
         "raw": raw_tweaks,
         "theme": {"name": theme, "src": static(THEMES[theme])},
         "default_theme_mode": default_theme_mode,
+        # The users choice of color scheme, or the default
+        "theme_mode": theme_mode,
         "sidebar_classes": classes("sidebar", "sidebar_disable_expand"),
         "navbar_classes": classes("navbar", "no_navbar_border", "navbar_small_text"),
         "body_classes": classes(
@@ -347,7 +546,25 @@ def get_ui_tweaks() -> Dict[str, Any]:
         "brand_classes": classes("brand_small_text", "brand_colour"),
         "footer_classes": classes("footer_small_text"),
         "button_classes": tweaks["button_classes"],
-        "theme_list": list(THEMES.keys()),
+        "theme_list": get_allowed_themes(request),
     }
 
     return ret
+
+
+def is_partial_request(request: Optional[HttpRequest]) -> bool:
+    """
+    Whether partial navigation (see partial_navigation) is asking for just the content of the page
+    """
+    if request is None or PARTIAL_HEADER not in request.headers:
+        return False
+    return bool(get_request_settings(request)["partial_navigation"])
+
+
+def is_fragment_request(request: Optional[HttpRequest]) -> bool:
+    """
+    Whether a changelist (see changelist_ajax) is asking for just its results
+    """
+    if request is None or FRAGMENT_HEADER not in request.headers:
+        return False
+    return bool(get_request_settings(request)["changelist_ajax"])
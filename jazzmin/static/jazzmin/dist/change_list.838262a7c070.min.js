@@ -0,0 +1,34 @@
+(function($){'use strict';const LAZY_BATCH_SIZE=100;$.fn.search_filters=function(){$(this).change(function(){const $field=$(this);const $option=$field.find('option:selected');const select_name=$option.data('name');if(select_name){$field.attr('name',select_name);}else{$field.removeAttr('name');}});$(this).trigger('change');};function getMinimuInputLength(element){return window.filterInputLength[element.data('name')]??window.filterInputLengthDefault;}
+function searchFilters(){const $ele=$('.search-filter');$ele.search_filters();$ele.each(function(){const $this=$(this);$this.select2({minimumInputLength:getMinimuInputLength($this)});});const $mptt=$('.search-filter-mptt');if($mptt.length){$mptt.search_filters();$mptt.select2({minimumInputLength:getMinimuInputLength($mptt),templateResult:function(data){if(!data.element){return data.text;}
+const $element=$(data.element);let $wrapper=$('<span></span>');$wrapper.attr('style',$($element[0]).attr('style'));$wrapper.text(data.text);return $wrapper;},});}}
+function initVirtualTable(table){const form=table.closest('form');const tbody=table.tBodies[0];const rows=Array.from(document.getElementById('result_list_rows').content.children);const checkboxes=rows.map(function(row){return row.querySelector('input.action-select');}).filter(Boolean);const columns=table.tHead.rows[0].cells.length;const spacers=[spacer(),spacer(),spacer()];let rowHeight,start,end,frame;function spacer(){const row=document.createElement('tr');const cell=document.createElement('td');row.setAttribute('aria-hidden','true');cell.colSpan=columns;cell.style.padding='0';cell.style.border='0';row.appendChild(cell);return row;}
+function measure(){tbody.replaceChildren(rows[0]);rowHeight=tbody.offsetHeight||40;start=end=-1;}
+function render(){frame=null;if(!table.isConnected){window.removeEventListener('scroll',update);window.removeEventListener('resize',resize);return;}
+const viewport=window.innerHeight;const top=-tbody.getBoundingClientRect().top;let first=Math.max(0,Math.floor((top-viewport)/rowHeight));const last=Math.max(first,Math.min(rows.length,Math.ceil((top+2*viewport)/rowHeight)));if(first===start&&last===end){return;}
+start=first;end=last;const topSpacers=start%2?[spacers[0]]:[spacers[0],spacers[1]];topSpacers[0].firstChild.style.height=(start*rowHeight)+'px';spacers[1].firstChild.style.height='0';spacers[2].firstChild.style.height=((rows.length-end)*rowHeight)+'px';tbody.replaceChildren.apply(tbody,topSpacers.concat(rows.slice(start,end),[spacers[2]]));}
+function update(){if(!frame){frame=window.requestAnimationFrame(render);}}
+function resize(){measure();update();}
+measure();render();window.addEventListener('scroll',update,{passive:true});window.addEventListener('resize',resize);if(window.Actions&&checkboxes.length){window.Actions(checkboxes);}
+form.addEventListener('submit',function(){form.querySelectorAll('input.jazzmin-virtual-selected').forEach(function(input){input.remove();});checkboxes.forEach(function(checkbox){if(checkbox.checked&&!checkbox.isConnected){const input=document.createElement('input');input.type='hidden';input.name=checkbox.name;input.value=checkbox.value;input.className='jazzmin-virtual-selected';form.appendChild(input);}});});}
+function loadLazyCells(table){const template=document.getElementById('result_list_rows');const placeholders=Array.from(table.querySelectorAll('[data-jazzmin-lazy]')).concat(template?Array.from(template.content.querySelectorAll('[data-jazzmin-lazy]')):[]);const byPk=new Map();const columns=new Set();placeholders.forEach(function(placeholder){const pk=placeholder.getAttribute('data-pk');byPk.set(pk,(byPk.get(pk)||[]).concat([placeholder]));columns.add(placeholder.getAttribute('data-jazzmin-lazy'));});const pks=Array.from(byPk.keys());for(let i=0;i<pks.length;i+=LAZY_BATCH_SIZE){const batch=pks.slice(i,i+LAZY_BATCH_SIZE);const params=new URLSearchParams();columns.forEach(function(column){params.append('column',column);});batch.forEach(function(pk){params.append('pk',pk);});fetch(table.getAttribute('data-jazzmin-lazy-url')+'?'+params.toString(),{credentials:'same-origin'}).then(function(response){if(!response.ok){throw new Error(response.statusText);}
+return response.json();}).then(function(cells){batch.forEach(function(pk){byPk.get(pk).forEach(function(placeholder){placeholder.innerHTML=(cells[pk]||{})[placeholder.getAttribute('data-jazzmin-lazy')]||'';placeholder.removeAttribute('data-jazzmin-lazy');});});}).catch(function(){batch.forEach(function(pk){byPk.get(pk).forEach(function(placeholder){placeholder.innerHTML='<i class="fas fa-exclamation-triangle text-warning"></i>';});});});}}
+function initResults($results){$('.related-lookup',$results).append('<i class="fa fa-search"></i>')
+$('.actions select',$results).addClass('form-control').select2({width:'element'});$('#changelist .results table',$results).not('.table').addClass('table table-striped');$('#result_list[data-jazzmin-virtual]',$results).each(function(){initVirtualTable(this);});$('#result_list[data-jazzmin-lazy-url]',$results).each(function(){loadLazyCells(this);});$results.find('#changelist-form[data-jazzmin-dirty-rows]').addBack('#changelist-form[data-jazzmin-dirty-rows]').each(function(){initDirtyRows(this);});}
+function hasChanged(element){if(element.type==='checkbox'||element.type==='radio'){return element.checked!==element.defaultChecked;}
+if(element.tagName==='SELECT'){return Array.from(element.options).some(function(option){return option.selected!==option.defaultSelected;});}
+if(element.type==='file'){return element.files.length>0;}
+return element.value!==element.defaultValue;}
+function initDirtyRows(form){const total=form.querySelector('input[name$="-TOTAL_FORMS"]');if(!total){return;}
+const prefix=total.name.slice(0,-'-TOTAL_FORMS'.length);const pattern=new RegExp('^'+prefix.replace(/[.*+?^${}()|[\]\\]/g,'\\$&')+'-(\\d+)-');form.addEventListener('submit',function(e){if(e.defaultPrevented||!e.submitter||e.submitter.name!=='_save'){return;}
+const rows=new Map();Array.from(form.elements).forEach(function(element){const match=element.name&&!element.disabled&&element.name.match(pattern);if(!match){return;}
+const row=rows.get(match[1])||{elements:[],changed:false};row.elements.push(element);row.changed=row.changed||hasChanged(element);rows.set(match[1],row);});const unchanged=[];rows.forEach(function(row){if(!row.changed){unchanged.push.apply(unchanged,row.elements);}});unchanged.forEach(function(element){element.disabled=true;});setTimeout(function(){unchanged.forEach(function(element){element.disabled=false;});});});}
+function initColumns($chooser){$chooser.on('click','[data-jazzmin-columns-apply]',function(){const hidden=$chooser.find('input:not(:checked)').map(function(){return this.value;}).get();document.cookie=$chooser.data('cookie')+'='+encodeURIComponent(hidden.join(','))+';path=/;max-age=31536000;SameSite=Lax';const url=new URL(window.location.href);url.searchParams.delete('o');window.location.assign(url.href);});}
+function initAjax($search){const $main=$search.closest('main');const state={jazzminChangelist:true,jazzmin:document.body.hasAttribute('data-jazzmin-root')};let controller=null;let timer=null;function load(url,push){if(controller){controller.abort();}
+controller=new AbortController();clearTimeout(timer);document.body.classList.add('jazzmin-loading');fetch(url,{headers:{'X-Jazzmin-Fragment':'1'},credentials:'same-origin',signal:controller.signal}).then(function(response){if(!response.ok||response.redirected){throw new Error(response.statusText);}
+return response.text();}).then(function(html){const $fragment=$('<div>').html(html);['#change-list-date-hierarchy','#changelist-result-count','#changelist-form'].forEach(function(selector){$(selector).replaceWith($fragment.find(selector));});const $results=$('#changelist-form');const actionCheckboxes=$results[0].querySelectorAll('tr input.action-select');if(window.Actions&&actionCheckboxes.length){window.Actions(actionCheckboxes);}
+initResults($results);window.history[push?'pushState':'replaceState'](state,'',url);}).catch(function(error){if(error.name!=='AbortError'){window.location.assign(url);}}).finally(function(){document.body.classList.remove('jazzmin-loading');});}
+function searchUrl(){const params=new URLSearchParams(new FormData($search[0]));return window.location.pathname+'?'+params.toString();}
+$search.on('submit',function(e){e.preventDefault();load(searchUrl(),true);});$search.on('input','#searchbar',function(){clearTimeout(timer);timer=setTimeout(function(){load(searchUrl(),true);},300);});$search.on('change','select',function(){load(searchUrl(),true);});$main.on('click','#changelist-form a[href^="?"], #change-list-date-hierarchy a[href^="?"]',function(e){if(e.button!==0||e.metaKey||e.ctrlKey||e.shiftKey||e.altKey){return;}
+e.preventDefault();load(this.href,true);});if(!window.history.state){window.history.replaceState(state,'',window.location.href);}
+window.onpopstate=function(e){if(e.state&&e.state.jazzminChangelist&&!e.state.jazzmin&&$.contains(document,$search[0])){load(window.location.href,false);}};}
+window.jazzmin.onLoad(function(){initResults($(document));searchFilters();initColumns($('#jazzmin-columns'));const $search=$('#changelist-search[data-jazzmin-ajax]');if($search.length){initAjax($search);}});})(django.jQuery);
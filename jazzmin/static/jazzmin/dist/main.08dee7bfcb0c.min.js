@@ -0,0 +1,12 @@
+(function($){'use strict';window.jazzmin=window.jazzmin||{};window.jazzmin.onLoad=function(fn){document.addEventListener('jazzmin:load',function(){fn($);});if(!window.jazzmin.swapping){$(fn);}};function setCookie(key,value){const expires=new Date();expires.setTime(expires.getTime()+(value*24*60*60*1000));document.cookie=key+'='+value+';expires='+expires.toUTCString()+'; SameSite=Strict;path=/';}
+function getCookie(key){const keyValue=document.cookie.match('(^|;) ?'+key+'=([^;]*)(;|$)');return keyValue?keyValue[2]:null;}
+function handleMenu(){$('[data-widget=pushmenu], [data-lte-toggle=sidebar]').on('click',function(){const menuClosed=getCookie('jazzy_menu')==='closed';if(!menuClosed){setCookie('jazzy_menu','closed');}else{setCookie('jazzy_menu','open');}});}
+function setActiveLinks(){const url=window.location.pathname;$('#jazzy-navigation a.nav-link.active').removeClass('active');$('#jazzy-navigation li.menu-open').removeClass('menu-is-opening menu-open');const $breadcrumb=$('.breadcrumb a').last();const $link=$('a[href="'+url+'"]');const $parent_link=$('a[href="'+$breadcrumb.attr('href')+'"]');if($link.length){$link.addClass('active');}else if($parent_link.length){$parent_link.addClass('active');};const $a_active=$('a.nav-link.active');const $main_li_parent=$a_active.closest('li.nav-item.has-treeview');const $ul_child=$main_li_parent.children('ul');$ul_child.show();$main_li_parent.addClass('menu-is-opening menu-open');};function initThemeChooser(){const $themeSelect=$('#jazzmin-theme-select');const $modeSelect=$('#jazzmin-mode-select');if(!$themeSelect.length&&!$modeSelect.length){return;}
+const savedTheme=localStorage.getItem('jazzmin-theme');if(savedTheme&&$themeSelect.length){$themeSelect.val(savedTheme);}
+const savedMode=localStorage.getItem('jazzmin-theme-mode');if(savedMode&&$modeSelect.length){$modeSelect.val(savedMode);}
+function savePreference(key,cookie,value){localStorage.setItem(key,value);document.cookie=cookie+'='+encodeURIComponent(value)+';path=/;max-age=31536000;SameSite=Lax';}
+$themeSelect.on('change',function(){const newTheme=$(this).val();const $themeCSS=$('#jazzmin-theme');const base=$themeCSS.data('theme-base');const $adminlteCSS=$('#adminlte-css');$adminlteCSS.attr('href',$adminlteCSS.data(newTheme==='default'?'full':'components'));if(newTheme==='default'){$themeCSS.removeAttr('href');}else{$themeCSS.attr('href',base+'/'+newTheme+'/bootstrap.min.css');}
+$('body').removeClass(function(index,className){return(className.match(/(^|\s)theme-\S+/g)||[]).join(' ');}).addClass('theme-'+newTheme);savePreference('jazzmin-theme','jazzmin_theme',newTheme);});$modeSelect.on('change',function(){const mode=$(this).val();var resolved=mode==='auto'?(window.matchMedia&&window.matchMedia('(prefers-color-scheme: dark)').matches?'dark':'light'):mode;document.documentElement.setAttribute('data-bs-theme',resolved);savePreference('jazzmin-theme-mode','jazzmin_theme_mode',mode);});$('#jazzy-theme-chooser').on('click',function(e){e.stopPropagation();});}
+function loadDashboardWidgets(){$('[data-jazzmin-widget-url]').each(function(){const $widget=$(this);$.get($widget.data('jazzmin-widget-url')).done(function(html){$widget.replaceWith(html);}).fail(function(){$widget.html($('<p class="text-muted mb-0">').text($widget.data('jazzmin-widget-error')));});});}
+$(document).ready(function(){handleMenu();initThemeChooser();});window.jazzmin.onLoad(function(){setActiveLinks()
+loadDashboardWidgets();const $changeListTable=$('#changelist .results table');if($changeListTable.length&&!$changeListTable.hasClass('table table-striped')){$changeListTable.addClass('table table-striped');};});})(jQuery);
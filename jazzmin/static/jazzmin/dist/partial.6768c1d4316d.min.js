@@ -0,0 +1,30 @@
+(function(){'use strict';const HEADER='X-Jazzmin-Partial';const FULL_LOAD_SCRIPTS=['admin/js/inlines','admin/js/cancel'];const root=document.body.getAttribute('data-jazzmin-root');let controller=null;let serverClasses=document.body.className.split(/\s+/).filter(Boolean);let partialAssets=[];function isPartialUrl(url){return url.origin===window.location.origin&&url.pathname.indexOf(root)===0;}
+function optedOut(element){return element.closest('[data-jazzmin-partial="false"]')!==null;}
+function fullLoad(url){window.location.assign(url);}
+function loadedScripts(){return new Set(Array.from(document.querySelectorAll('script[src]')).map(function(script){return script.src;}));}
+function needsFullLoad(doc){const loaded=loadedScripts();return Array.from(doc.head.querySelectorAll('script[src]')).some(function(script){return!loaded.has(script.src)||FULL_LOAD_SCRIPTS.some(function(name){return script.src.indexOf(name)!==-1;});});}
+function runScript(original){return new Promise(function(resolve){const script=document.createElement('script');for(const attribute of original.attributes){script.setAttribute(attribute.name,attribute.value);}
+script.async=false;if(original.src){script.onload=resolve;script.onerror=resolve;}
+script.text=original.text;original.replaceWith(script);if(!original.src){resolve();}});}
+function isJavascript(script){return!script.type||script.type==='text/javascript'||script.type==='module';}
+function swapStyles(doc){partialAssets.forEach(function(element){element.remove();});partialAssets=[];const current=new Set(Array.from(document.querySelectorAll('link[rel=stylesheet]')).map(function(link){return link.href;}));doc.head.querySelectorAll('link[rel=stylesheet], style').forEach(function(element){if(element.tagName==='LINK'&&current.has(element.href)){return;}
+const clone=document.importNode(element,true);document.head.appendChild(clone);partialAssets.push(clone);});}
+function swapBodyClasses(doc){const classes=doc.body.className.split(/\s+/).filter(Boolean);document.body.classList.remove.apply(document.body.classList,serverClasses);document.body.classList.add.apply(document.body.classList,classes);serverClasses=classes;}
+function reinitialiseDjango(){const actionCheckboxes=document.querySelectorAll('tr input.action-select');if(window.Actions&&actionCheckboxes.length){window.Actions(actionCheckboxes);}
+if(window.DateTimeShortcuts){window.DateTimeShortcuts.init();}
+if(window.SelectFilter){document.querySelectorAll('select.selectfilter, select.selectfilterstacked').forEach(function(el){window.SelectFilter.init(el.id,el.dataset.fieldName,parseInt(el.dataset.isStacked,10));});}
+if(window.django&&django.jQuery&&django.jQuery.fn.djangoAdminSelect2){django.jQuery('.admin-autocomplete').not('[name*=__prefix__]').djangoAdminSelect2();}}
+function swap(doc,url,push){const main=doc.querySelector('main.app-main');if(!doc.body.hasAttribute('data-jazzmin-partial')||!main||needsFullLoad(doc)){return fullLoad(url);}
+document.title=doc.title;swapStyles(doc);swapBodyClasses(doc);document.querySelector('main.app-main').replaceWith(document.adoptNode(main));if(push){window.history.pushState({jazzmin:true},'',url);}
+const target=window.location.hash&&document.getElementById(window.location.hash.slice(1));if(target){target.scrollIntoView();}else{window.scrollTo(0,0);}
+const loaded=loadedScripts();const scripts=Array.from(main.querySelectorAll('script')).filter(isJavascript);Array.from(doc.body.children).forEach(function(element){if(element.tagName==='SCRIPT'&&isJavascript(element)&&!(element.defer&&loaded.has(element.src))){document.body.appendChild(document.adoptNode(element));scripts.push(element);}});window.jazzmin.swapping=true;return scripts.reduce(function(previous,script){return previous.then(function(){return runScript(script);});},Promise.resolve()).then(function(){reinitialiseDjango();document.dispatchEvent(new CustomEvent('jazzmin:load'));}).finally(function(){window.jazzmin.swapping=false;});}
+function visit(url,push){if(controller){controller.abort();}
+controller=new AbortController();document.body.classList.add('jazzmin-loading');const headers={};headers[HEADER]='1';return fetch(url,{headers:headers,credentials:'same-origin',signal:controller.signal}).then(function(response){const contentType=response.headers.get('Content-Type')||'';if(!response.ok||contentType.indexOf('text/html')!==0){return fullLoad(url);}
+const finalUrl=response.redirected?response.url:url;return response.text().then(function(html){return swap(new DOMParser().parseFromString(html,'text/html'),finalUrl,push);});}).catch(function(error){if(error.name!=='AbortError'){fullLoad(url);}}).finally(function(){document.body.classList.remove('jazzmin-loading');});}
+document.addEventListener('click',function(e){const link=e.target.closest('a[href]');if(!link||e.defaultPrevented||e.button!==0||e.metaKey||e.ctrlKey||e.shiftKey||e.altKey){return;}
+const href=link.getAttribute('href');if((link.target&&link.target!=='_self')||link.hasAttribute('download')||href.charAt(0)==='#'||optedOut(link)){return;}
+const url=new URL(link.href);if(!isPartialUrl(url)||(url.hash&&url.pathname===window.location.pathname&&url.search===window.location.search)){return;}
+e.preventDefault();visit(url.href,true);});document.addEventListener('submit',function(e){const form=e.target;if(e.defaultPrevented||(form.method||'get').toLowerCase()!=='get'||form.target||optedOut(form)){return;}
+const url=new URL(form.action||window.location.href);if(!isPartialUrl(url)){return;}
+const data=new FormData(form);if(e.submitter&&e.submitter.name){data.append(e.submitter.name,e.submitter.value);}
+url.search=new URLSearchParams(data).toString();e.preventDefault();visit(url.href,true);});window.addEventListener('popstate',function(e){if(e.state&&e.state.jazzmin){visit(window.location.href,false);}});window.history.replaceState({jazzmin:true},'',window.location.href);})();
@@ -0,0 +1,19 @@
+!function(o){"use strict";var s=0;function i(t){for(var e in this.props={title:"",body:"",footer:"",modalClass:"fade",modalDialogClass:"",options:null,onCreate:null,onDispose:null,onSubmit:null,backdrop:true},t)this.props[e]=t[e];this.id="bootstrap-show-modal-"+s,s++,this.show()}i.prototype.createContainerElement=function(){var t=this;this.element=document.createElement("div"),this.element.id=this.id,this.element.setAttribute("class","modal "+this.props.modalClass),this.element.setAttribute("tabindex","-1"),this.element.setAttribute("aria-labelledby",this.id),this.element.innerHTML='<div class="modal-dialog '+this.props.modalDialogClass+'"><div class="modal-content"><div class="modal-header"><h5 class="modal-title"></h5><button type="button" class="btn-close" data-bs-dismiss="modal" aria-label="Close"></button></div><div class="modal-body"></div><div class="modal-footer"></div></div></div>',document.body.appendChild(this.element),this.titleElement=this.element.querySelector(".modal-title"),this.bodyElement=this.element.querySelector(".modal-body"),this.footerElement=this.element.querySelector(".modal-footer"),this.element.addEventListener("hidden.bs.modal",function(){t.dispose()}),this.props.onCreate&&this.props.onCreate(this)},i.prototype.show=function(){if(!this.element){this.createContainerElement()}var opts={backdrop:this.props.backdrop!==undefined?this.props.backdrop:true};if(this.props.options){for(var k in this.props.options){opts[k]=this.props.options[k]}}if(!this.bsModal){this.bsModal=new bootstrap.Modal(this.element,opts)}this.bsModal.show();if(this.props.title){this.titleElement.style.display="";this.titleElement.innerHTML=this.props.title}else{this.titleElement.style.display="none"}if(this.props.body){this.bodyElement.style.display="";this.bodyElement.innerHTML=this.props.body}else{this.bodyElement.style.display="none"}if(this.props.footer){this.footerElement.style.display="";this.footerElement.innerHTML=this.props.footer}else{this.footerElement.style.display="none"}},i.prototype.hide=function(){if(this.bsModal){this.bsModal.hide()}},i.prototype.dispose=function(){if(this.bsModal){this.bsModal.dispose();this.bsModal=null}if(this.element&&this.element.parentNode){this.element.parentNode.removeChild(this.element)}this.props.onDispose&&this.props.onDispose(this)},o.extend({showModal:function(t){if(t.buttons){var e,f="";for(e in t.buttons){f+='<button type="button" class="btn btn-primary" data-value="'+e+'" data-bs-dismiss="modal">'+t.buttons[e]+"</button>"}t.footer=f}return new i(t)},showAlert:function(t){return t.buttons={OK:"OK"},this.showModal(t)},showConfirm:function(t){return t.footer='<button class="btn btn-secondary btn-false btn-cancel">'+t.textFalse+'</button><button class="btn btn-primary btn-true">'+t.textTrue+"</button>",t.onCreate=function(e){o(e.element).on("click",".btn",function(t){t.preventDefault(),e.hide(),e.props.onSubmit(-1!==t.target.getAttribute("class").indexOf("btn-true"),e)})},this.showModal(t)}})}(jQuery);
+(function($){'use strict';let relatedModalCounter=0;function checkIfInIframe(){return window.top!==window.self;}
+function dismissModal(){if(checkIfInIframe()){const parentWindow=window.parent;parentWindow.dismissModal();return;}
+var modalEl=$('.related-modal-'+relatedModalCounter)[0];if(modalEl){var bsModal=bootstrap.Modal.getInstance(modalEl);if(bsModal){bsModal.hide();}}
+relatedModalCounter-=1;}
+function showModal(title,body,e){if(checkIfInIframe()){const parentWindow=window.parent;parentWindow.showModal(title,body,e);return;}
+relatedModalCounter+=1;$.showModal({title:title,body:body,backdrop:false,modalDialogClass:"modal-dialog-centered modal-lg",modalClass:"fade modal-wide related-modal-"+relatedModalCounter,onDispose:function(){var lastModal=$("div[class*='related-modal-']").last();if(lastModal){lastModal.focus();}}});const modalEl=$("div[class*='related-modal-']");const iframeEl=modalEl.find('#related-modal-iframe');if(e.data.lookup===true){iframeEl.on('load',function(){const iframeObj=$(this).get(0);const iframeWindow=iframeObj.contentWindow;iframeWindow.opener=window;});}}
+function dismissRelatedLookupModal(win,chosenId){const windowName=win.name;const widgetName=windowName.replace(/^(change|add|delete|lookup)_/,'');let widgetEl;if(checkIfInIframe){const secondLastIframe=$('iframe.related-iframe',win.parent.document).eq(-2);let documentContext;if(secondLastIframe.length){documentContext=secondLastIframe.contents();}else{documentContext=$(win.parent.document);}
+widgetEl=documentContext.find('#'+widgetName);}else{widgetEl=$('#'+widgetName);}
+const widgetVal=widgetEl.val();if(widgetEl.hasClass('vManyToManyRawIdAdminField')&&Boolean(widgetVal)){widgetEl.val(widgetVal+', '+chosenId);}else{widgetEl.val(chosenId);}
+dismissModal();}
+window.dismissRelatedObjectModal=dismissModal;window.dismissRelatedLookupPopup=dismissRelatedLookupModal;window.showModal=showModal;function presentRelatedObjectModal(e){let linkEl=$(this);let href=(linkEl.attr('href')||'');if(href===''){return;}
+e.preventDefault();e.stopImmediatePropagation();linkEl.blur();let iframeName=linkEl.attr('id');let iframeSrc=href;const modalTitle=linkEl.attr('title');if(e.data.lookup!==true){let iframeSrcRandom=String(Math.round(Math.random()*999999));if(iframeSrc.indexOf('?')===-1){iframeSrc+='?_modal='+iframeSrcRandom;}else{iframeSrc+='&_modal='+iframeSrcRandom;}}
+if(iframeSrc.indexOf('_popup=1')===-1){if(iframeSrc.indexOf('?')===-1){iframeSrc+='?_popup=1';}else{iframeSrc+='&_popup=1';}}
+let iframeHTML='<iframe id="related-modal-iframe" name="'+iframeName+'" src="'+iframeSrc+'" frameBorder="0" class="related-iframe"></iframe>';let iframeInternalModalClass='related-modal';if(window.top!==window.self){iframeInternalModalClass+=' related-modal__nested';}
+showModal(modalTitle,iframeHTML,e);return false;}
+function presentRelatedObjectModalOnClickOn(selector,lookup){let el=$(selector);el.removeAttr('onclick');el.unbind('click');el.click({lookup:lookup},presentRelatedObjectModal);}
+function init(){presentRelatedObjectModalOnClickOn('a.related-widget-wrapper-link',false);presentRelatedObjectModalOnClickOn('a.related-lookup',true);presentRelatedObjectModalOnClickOn('a.dynamic_raw_id-related-lookup',true);}
+window.jazzmin.onLoad(init);django.jQuery(document).on('formset:added',init);})(jQuery);
@@ -111,13 +111,14 @@
     }
 
     function applySelect2() {
-        // Apply select2 to any select boxes that don't yet have it
-        // and are not part of the django's empty-form inline
-        const noSelect2 = '.empty-form select, .select2-hidden-accessible, .selectfilter, .selector-available select, .selector-chosen select, select[data-autocomplete-light-function=select2]';
-        $('select').not(noSelect2).select2({ width: '100%' });
+        // Apply select2 to any select boxes that don't yet have it, are not part of the django's empty-form inline
+        // and aren't autocomplete fields (which django initialises itself), using django.jQuery, as that is the
+        // jQuery the one copy of select2 is attached to
+        const noSelect2 = '.empty-form select, .select2-hidden-accessible, .admin-autocomplete, .selectfilter, .selector-available select, .selector-chosen select, select[data-autocomplete-light-function=select2]';
+        django.jQuery('select').not(noSelect2).select2({ width: '100%' });
     }
 
-    $(document).ready(function () {
+    window.jazzmin.onLoad(function () {
         const $carousel = $('#content-main form #jazzy-carousel');
         const $tabs = $('#content-main form #jazzy-tabs');
         const $collapsible = $('#content-main form #jazzy-collapsible');
@@ -135,14 +136,14 @@
         else if ($collapsible.length) { handleCollapsible($collapsible); }
 
         applySelect2();
+    });
 
-        $('body').on('change', '.related-widget-wrapper select', function(e) {
-            const event = $.Event('django:update-related');
-            $(this).trigger(event);
-            if (!event.isDefaultPrevented() && typeof(window.updateRelatedObjectLinks) !== 'undefined') {
-                updateRelatedObjectLinks(this);
-            }
-        });
+    $('body').on('change', '.related-widget-wrapper select', function(e) {
+        const event = $.Event('django:update-related');
+        $(this).trigger(event);
+        if (!event.isDefaultPrevented() && typeof(window.updateRelatedObjectLinks) !== 'undefined') {
+            updateRelatedObjectLinks(this);
+        }
     });
 
     // Apply select2 to all select boxes when new inline row is created
@@ -1,6 +1,10 @@
+// Uses django.jQuery, which Select2 (see jazzmin.widgets.get_select2_media) is attached to
 (function($) {
     'use strict';
 
+    // Rows we load lazy cells for in one request, see LAZY_MAX_OBJECTS in jazzmin/mixins.py
+    const LAZY_BATCH_SIZE = 100;
+
     $.fn.search_filters = function () {
         $(this).change(function () {
             const $field = $(this);
@@ -50,14 +54,343 @@
         }
     }
 
-    $(document).ready(function () {
+    function initVirtualTable(table) {
+        /*
+         Virtual tables (see changelist_virtual_rows) come with their rows in a <template>, we only put the rows in view
+         (and a screen either side) in the table, with spacer rows standing in for the rest.
+
+         Rows keep their checkboxes while out of the table, so actions (which we give every checkbox) and select all
+         work as usual, we just add the selected rows that aren't in the table to the form when it's submitted.
+         */
+        const form = table.closest('form');
+        const tbody = table.tBodies[0];
+        const rows = Array.from(document.getElementById('result_list_rows').content.children);
+        const checkboxes = rows.map(function (row) { return row.querySelector('input.action-select'); }).filter(Boolean);
+        const columns = table.tHead.rows[0].cells.length;
+        // Bootstrap stripes odd rows, so we use one or two top spacers to keep each row odd/even
+        const spacers = [spacer(), spacer(), spacer()];
+        let rowHeight, start, end, frame;
+
+        function spacer() {
+            const row = document.createElement('tr');
+            const cell = document.createElement('td');
+            row.setAttribute('aria-hidden', 'true');
+            cell.colSpan = columns;
+            cell.style.padding = '0';
+            cell.style.border = '0';
+            row.appendChild(cell);
+            return row;
+        }
+
+        function measure() {
+            tbody.replaceChildren(rows[0]);
+            rowHeight = tbody.offsetHeight || 40;
+            start = end = -1;
+        }
+
+        function render() {
+            frame = null;
+            if (!table.isConnected) {
+                window.removeEventListener('scroll', update);
+                window.removeEventListener('resize', resize);
+                return;
+            }
+
+            const viewport = window.innerHeight;
+            const top = -tbody.getBoundingClientRect().top;
+            let first = Math.max(0, Math.floor((top - viewport) / rowHeight));
+            const last = Math.max(first, Math.min(rows.length, Math.ceil((top + 2 * viewport) / rowHeight)));
+            if (first === start && last === end) {
+                return;
+            }
+            start = first;
+            end = last;
+
+            const topSpacers = start % 2 ? [spacers[0]] : [spacers[0], spacers[1]];
+            topSpacers[0].firstChild.style.height = (start * rowHeight) + 'px';
+            spacers[1].firstChild.style.height = '0';
+            spacers[2].firstChild.style.height = ((rows.length - end) * rowHeight) + 'px';
+            tbody.replaceChildren.apply(tbody, topSpacers.concat(rows.slice(start, end), [spacers[2]]));
+        }
+
+        function update() {
+            if (!frame) {
+                frame = window.requestAnimationFrame(render);
+            }
+        }
+
+        function resize() {
+            measure();
+            update();
+        }
+
+        measure();
+        render();
+        window.addEventListener('scroll', update, {passive: true});
+        window.addEventListener('resize', resize);
+
+        if (window.Actions && checkboxes.length) {
+            window.Actions(checkboxes);
+        }
+
+        form.addEventListener('submit', function () {
+            form.querySelectorAll('input.jazzmin-virtual-selected').forEach(function (input) {
+                input.remove();
+            });
+            checkboxes.forEach(function (checkbox) {
+                if (checkbox.checked && !checkbox.isConnected) {
+                    const input = document.createElement('input');
+                    input.type = 'hidden';
+                    input.name = checkbox.name;
+                    input.value = checkbox.value;
+                    input.className = 'jazzmin-virtual-selected';
+                    form.appendChild(input);
+                }
+            });
+        });
+    }
+
+    function loadLazyCells(table) {
+        /*
+         Cells of slow columns (see LazyColumnsMixin) come as placeholders, which we fill in from the server, a batch of
+         rows at a time (including the rows of virtual tables that aren't in the table)
+         */
+        const template = document.getElementById('result_list_rows');
+        const placeholders = Array.from(table.querySelectorAll('[data-jazzmin-lazy]')).concat(
+            template ? Array.from(template.content.querySelectorAll('[data-jazzmin-lazy]')) : []
+        );
+        const byPk = new Map();
+        const columns = new Set();
+        placeholders.forEach(function (placeholder) {
+            const pk = placeholder.getAttribute('data-pk');
+            byPk.set(pk, (byPk.get(pk) || []).concat([placeholder]));
+            columns.add(placeholder.getAttribute('data-jazzmin-lazy'));
+        });
+
+        const pks = Array.from(byPk.keys());
+        for (let i = 0; i < pks.length; i += LAZY_BATCH_SIZE) {
+            const batch = pks.slice(i, i + LAZY_BATCH_SIZE);
+            const params = new URLSearchParams();
+            columns.forEach(function (column) {
+                params.append('column', column);
+            });
+            batch.forEach(function (pk) {
+                params.append('pk', pk);
+            });
+
+            fetch(table.getAttribute('data-jazzmin-lazy-url') + '?' + params.toString(), {credentials: 'same-origin'}).then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.json();
+            }).then(function (cells) {
+                batch.forEach(function (pk) {
+                    byPk.get(pk).forEach(function (placeholder) {
+                        placeholder.innerHTML = (cells[pk] || {})[placeholder.getAttribute('data-jazzmin-lazy')] || '';
+                        placeholder.removeAttribute('data-jazzmin-lazy');
+                    });
+                });
+            }).catch(function () {
+                batch.forEach(function (pk) {
+                    byPk.get(pk).forEach(function (placeholder) {
+                        placeholder.innerHTML = '<i class="fas fa-exclamation-triangle text-warning"></i>';
+                    });
+                });
+            });
+        }
+    }
+
+    function initResults($results) {
         // Ensure all raw_id_fields have the search icon in them
-        $('.related-lookup').append('<i class="fa fa-search"></i>')
+        $('.related-lookup', $results).append('<i class="fa fa-search"></i>')
 
         // Allow for styling of selects
-        $('.actions select').addClass('form-control').select2({ width: 'element' });
+        $('.actions select', $results).addClass('form-control').select2({ width: 'element' });
+
+        $('#changelist .results table', $results).not('.table').addClass('table table-striped');
+
+        $('#result_list[data-jazzmin-virtual]', $results).each(function () {
+            initVirtualTable(this);
+        });
+
+        $('#result_list[data-jazzmin-lazy-url]', $results).each(function () {
+            loadLazyCells(this);
+        });
+
+        $results.find('#changelist-form[data-jazzmin-dirty-rows]').addBack('#changelist-form[data-jazzmin-dirty-rows]').each(function () {
+            initDirtyRows(this);
+        });
+    }
+
+    function hasChanged(element) {
+        if (element.type === 'checkbox' || element.type === 'radio') {
+            return element.checked !== element.defaultChecked;
+        }
+        if (element.tagName === 'SELECT') {
+            return Array.from(element.options).some(function (option) {
+                return option.selected !== option.defaultSelected;
+            });
+        }
+        if (element.type === 'file') {
+            return element.files.length > 0;
+        }
+        return element.value !== element.defaultValue;
+    }
+
+    function initDirtyRows(form) {
+        // Only send the list_editable rows that have changed (see DirtyRowsMixin), the server leaves the others alone
+        const total = form.querySelector('input[name$="-TOTAL_FORMS"]');
+        if (!total) {
+            return;
+        }
+        const prefix = total.name.slice(0, -'-TOTAL_FORMS'.length);
+        const pattern = new RegExp('^' + prefix.replace(/[.*+?^${}()|[\]\\]/g, '\\$&') + '-(\\d+)-');
+
+        form.addEventListener('submit', function (e) {
+            if (e.defaultPrevented || !e.submitter || e.submitter.name !== '_save') {
+                return;
+            }
+            const rows = new Map();
+            Array.from(form.elements).forEach(function (element) {
+                const match = element.name && !element.disabled && element.name.match(pattern);
+                if (!match) {
+                    return;
+                }
+                const row = rows.get(match[1]) || {elements: [], changed: false};
+                row.elements.push(element);
+                row.changed = row.changed || hasChanged(element);
+                rows.set(match[1], row);
+            });
+
+            const unchanged = [];
+            rows.forEach(function (row) {
+                if (!row.changed) {
+                    unchanged.push.apply(unchanged, row.elements);
+                }
+            });
+            unchanged.forEach(function (element) {
+                element.disabled = true;
+            });
+            // The form's data is read once this event is over, so we can put them back straight after
+            setTimeout(function () {
+                unchanged.forEach(function (element) {
+                    element.disabled = false;
+                });
+            });
+        });
+    }
+
+    function initColumns($chooser) {
+        // The column chooser (see ColumnChooserMixin), the server leaves out the columns we keep in the cookie
+        $chooser.on('click', '[data-jazzmin-columns-apply]', function () {
+            const hidden = $chooser.find('input:not(:checked)').map(function () {
+                return this.value;
+            }).get();
+            document.cookie = $chooser.data('cookie') + '=' + encodeURIComponent(hidden.join(',')) + ';path=/;max-age=31536000;SameSite=Lax';
+
+            // Sorting refers to columns by position, which may have moved
+            const url = new URL(window.location.href);
+            url.searchParams.delete('o');
+            window.location.assign(url.href);
+        });
+    }
+
+    function initAjax($search) {
+        /*
+         With changelist_ajax on, searching, filtering, sorting and paging fetch just the results (the server renders
+         them when it sees our header), which we swap in, rather than loading the whole page
+         */
+        const $main = $search.closest('main');
+        // Leave going back/forward to partial navigation (partial.js) if it's on
+        const state = {jazzminChangelist: true, jazzmin: document.body.hasAttribute('data-jazzmin-root')};
+        let controller = null;
+        let timer = null;
+
+        function load(url, push) {
+            if (controller) {
+                controller.abort();
+            }
+            controller = new AbortController();
+            clearTimeout(timer);
+            document.body.classList.add('jazzmin-loading');
+
+            fetch(url, {headers: {'X-Jazzmin-Fragment': '1'}, credentials: 'same-origin', signal: controller.signal}).then(function (response) {
+                if (!response.ok || response.redirected) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            }).then(function (html) {
+                const $fragment = $('<div>').html(html);
+                ['#change-list-date-hierarchy', '#changelist-result-count', '#changelist-form'].forEach(function (selector) {
+                    $(selector).replaceWith($fragment.find(selector));
+                });
+                const $results = $('#changelist-form');
+                const actionCheckboxes = $results[0].querySelectorAll('tr input.action-select');
+                if (window.Actions && actionCheckboxes.length) {
+                    window.Actions(actionCheckboxes);
+                }
+                initResults($results);
+                window.history[push ? 'pushState' : 'replaceState'](state, '', url);
+            }).catch(function (error) {
+                if (error.name !== 'AbortError') {
+                    window.location.assign(url);
+                }
+            }).finally(function () {
+                document.body.classList.remove('jazzmin-loading');
+            });
+        }
+
+        function searchUrl() {
+            const params = new URLSearchParams(new FormData($search[0]));
+            return window.location.pathname + '?' + params.toString();
+        }
+
+        $search.on('submit', function (e) {
+            e.preventDefault();
+            load(searchUrl(), true);
+        });
+
+        // Search as you type (once you stop), and filter as soon as a filter changes
+        $search.on('input', '#searchbar', function () {
+            clearTimeout(timer);
+            timer = setTimeout(function () {
+                load(searchUrl(), true);
+            }, 300);
+        });
+        $search.on('change', 'select', function () {
+            load(searchUrl(), true);
+        });
+
+        // Sorting, paging and the date hierarchy (links to the changelist with a different querystring)
+        $main.on('click', '#changelist-form a[href^="?"], #change-list-date-hierarchy a[href^="?"]', function (e) {
+            if (e.button !== 0 || e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) {
+                return;
+            }
+            e.preventDefault();
+            load(this.href, true);
+        });
+
+        if (!window.history.state) {
+            window.history.replaceState(state, '', window.location.href);
+        }
+        window.onpopstate = function (e) {
+            if (e.state && e.state.jazzminChangelist && !e.state.jazzmin && $.contains(document, $search[0])) {
+                load(window.location.href, false);
+            }
+        };
+    }
+
+    window.jazzmin.onLoad(function () {
+        initResults($(document));
 
         searchFilters();
+
+        initColumns($('#jazzmin-columns'));
+
+        const $search = $('#changelist-search[data-jazzmin-ajax]');
+        if ($search.length) {
+            initAjax($search);
+        }
     });
 
-})(jQuery);
+})(django.jQuery);
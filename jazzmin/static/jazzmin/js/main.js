@@ -1,6 +1,19 @@
 (function($) {
     'use strict';
 
+    window.jazzmin = window.jazzmin || {};
+
+    window.jazzmin.onLoad = function (fn) {
+        /*
+         Run a page initialiser once the page has loaded, and again whenever partial navigation (partial.js) swaps in
+         the content of another page (when it has just loaded the script calling this, it only runs it then)
+         */
+        document.addEventListener('jazzmin:load', function () { fn($); });
+        if (!window.jazzmin.swapping) {
+            $(fn);
+        }
+    };
+
     function setCookie(key, value) {
         const expires = new Date();
         expires.setTime(expires.getTime() + (value * 24 * 60 * 60 * 1000));
@@ -30,6 +43,8 @@
          item from the breadcrumbs
          */
         const url = window.location.pathname;
+        $('#jazzy-navigation a.nav-link.active').removeClass('active');
+        $('#jazzy-navigation li.menu-open').removeClass('menu-is-opening menu-open');
         const $breadcrumb = $('.breadcrumb a').last();
         const $link = $('a[href="' + url + '"]');
         const $parent_link = $('a[href="' + $breadcrumb.attr('href') + '"]');
@@ -68,12 +83,22 @@
             $modeSelect.val(savedMode);
         }
 
+        // Choices are also kept in cookies, so the server renders the right stylesheets on the next page load
+        function savePreference(key, cookie, value) {
+            localStorage.setItem(key, value);
+            document.cookie = cookie + '=' + encodeURIComponent(value) + ';path=/;max-age=31536000;SameSite=Lax';
+        }
+
         // Theme switching — #jazzmin-theme link is always present in the DOM
         $themeSelect.on('change', function () {
             const newTheme = $(this).val();
             const $themeCSS = $('#jazzmin-theme');
             const base = $themeCSS.data('theme-base');
 
+            // The default theme uses the bootstrap bundled with adminLTE, other themes bring their own
+            const $adminlteCSS = $('#adminlte-css');
+            $adminlteCSS.attr('href', $adminlteCSS.data(newTheme === 'default' ? 'full' : 'components'));
+
             if (newTheme === 'default') {
                 $themeCSS.removeAttr('href');
             } else {
@@ -84,7 +109,7 @@
                 return (className.match(/(^|\s)theme-\S+/g) || []).join(' ');
             }).addClass('theme-' + newTheme);
 
-            localStorage.setItem('jazzmin-theme', newTheme);
+            savePreference('jazzmin-theme', 'jazzmin_theme', newTheme);
         });
 
         // Color scheme switching
@@ -94,7 +119,7 @@
                 ? (window.matchMedia && window.matchMedia('(prefers-color-scheme: dark)').matches ? 'dark' : 'light')
                 : mode;
             document.documentElement.setAttribute('data-bs-theme', resolved);
-            localStorage.setItem('jazzmin-theme-mode', mode);
+            savePreference('jazzmin-theme-mode', 'jazzmin_theme_mode', mode);
         });
 
         // Keep dropdown open when interacting with selects
@@ -103,15 +128,34 @@
         });
     }
 
-    $(document).ready(function () {
-        // Set active status on links
-        setActiveLinks()
+    function loadDashboardWidgets() {
+        /*
+         Fetch the data for any lazy dashboard widgets, all at once
+         */
+        $('[data-jazzmin-widget-url]').each(function () {
+            const $widget = $(this);
+            $.get($widget.data('jazzmin-widget-url')).done(function (html) {
+                $widget.replaceWith(html);
+            }).fail(function () {
+                $widget.html($('<p class="text-muted mb-0">').text($widget.data('jazzmin-widget-error')));
+            });
+        });
+    }
 
+    $(document).ready(function () {
         // When we use the menu, store its state in a cookie to preserve it
         handleMenu();
 
         // Theme chooser (navbar dropdown)
         initThemeChooser();
+    });
+
+    window.jazzmin.onLoad(function () {
+        // Set active status on links
+        setActiveLinks()
+
+        // Load lazy dashboard widgets
+        loadDashboardWidgets();
 
         // Add minimal changelist styling to templates that we have been unable to override (e.g MPTT)
         // Needs to be here and not in change_list.js because this is the only JS we are guaranteed to run
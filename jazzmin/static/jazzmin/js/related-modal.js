@@ -183,9 +183,7 @@
         presentRelatedObjectModalOnClickOn('a.dynamic_raw_id-related-lookup', true);
     }
 
-    $(document).ready(function(){
-        init()
-    });
+    window.jazzmin.onLoad(init);
 
     django.jQuery(document).on('formset:added', init);
 
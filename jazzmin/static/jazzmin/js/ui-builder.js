@@ -109,6 +109,10 @@
             const base = $themeCSS.data('theme-base');
             const newTheme = $(this).val();
 
+            // The default theme uses the bootstrap bundled with adminLTE, other themes bring their own
+            const $adminlteCSS = $('#adminlte-css');
+            $adminlteCSS.attr('href', $adminlteCSS.data(newTheme === 'default' ? 'full' : 'components'));
+
             if (newTheme === 'default') {
                 $themeCSS.removeAttr('href');
             } else {
@@ -0,0 +1,152 @@
+"""
+Dashboard statistics, precomputed into the cache by the jazzmin_stats management command (or precompute_dashboard_stats
+from your own scheduler), so the dashboard only ever reads snapshots.
+
+Saves and deletes mark their model as changed (see connect_receivers), so only those models are recounted next time.
+"""
+
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Set, Type
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.admin.models import LogEntry
+from django.contrib.admin.sites import all_sites
+from django.core.cache import cache
+from django.db.models import Count, Model
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from .settings import get_settings
+
+COUNTS_KEY = "jazzmin:stats:counts"
+ACTIVITY_KEY = "jazzmin:stats:activity"
+CHANGED_KEY = "jazzmin:stats:changed:{}"
+
+# The models (app_label.model_name) mark_changed is connected to
+TRACKED_MODELS: Set[str] = set()
+
+
+def stats_enabled() -> bool:
+    """
+    Read straight from django settings, as this is checked on every save
+    """
+    return bool(getattr(settings, "JAZZMIN_SETTINGS", {}).get("dashboard_stats"))
+
+
+def mark_changed(sender: Type[Model], **kwargs: Any) -> None:
+    """
+    Note that the given model has changed, so it is recounted on the next precompute
+    """
+    if stats_enabled():
+        cache.set(CHANGED_KEY.format(sender._meta.label_lower), time.time(), timeout=None)
+
+
+def connect_receivers(**kwargs: Any) -> None:
+    """
+    Connect mark_changed to the saves and deletes of the models we count (and LogEntry, for the activity), only while
+    dashboard_stats is on, as any delete receiver stops django deleting a model's objects without loading them first.
+
+    Models registered with an admin site are only known once the admin has autodiscovered them, so this runs for the
+    first request too (see receivers.py), and whenever JAZZMIN_SETTINGS change
+    """
+    models: Dict[str, Type[Model]] = {}
+    if stats_enabled():
+        models = {**get_stats_models(get_settings()), LogEntry._meta.label_lower: LogEntry}
+
+    for label in TRACKED_MODELS - set(models):
+        model = apps.get_model(label)
+        post_save.disconnect(sender=model, dispatch_uid="jazzmin_stats_post_save_{}".format(label))
+        post_delete.disconnect(sender=model, dispatch_uid="jazzmin_stats_post_delete_{}".format(label))
+
+    for label, model in models.items():
+        post_save.connect(mark_changed, sender=model, dispatch_uid="jazzmin_stats_post_save_{}".format(label))
+        post_delete.connect(mark_changed, sender=model, dispatch_uid="jazzmin_stats_post_delete_{}".format(label))
+
+    TRACKED_MODELS.clear()
+    TRACKED_MODELS.update(models)
+
+
+def get_stats_models(options: Dict[str, Any]) -> Dict[str, Type[Model]]:
+    """
+    Get the models to count keyed on app_label.model_name, those given in dashboard_stats_models, or else every model
+    registered with an admin site
+    """
+    if options["dashboard_stats_models"]:
+        models = [apps.get_model(x) for x in options["dashboard_stats_models"]]
+    else:
+        models = [model for site in all_sites for model in site._registry]
+
+    return {model._meta.label_lower: model for model in models}
+
+
+def precompute_dashboard_stats(options: Dict[str, Any], full: bool = False) -> List[str]:
+    """
+    Recount any models that have changed since they were last counted (or all of them if full), and rebuild the
+    activity histogram if needed, returns what was recomputed
+    """
+    models = get_stats_models(options)
+    changed_keys = {label: CHANGED_KEY.format(label) for label in list(models) + ["admin.logentry"]}
+    cached = cache.get_many([COUNTS_KEY, ACTIVITY_KEY] + list(changed_keys.values()))
+    counts: Dict[str, Dict[str, Any]] = cached.get(COUNTS_KEY) or {}
+    recomputed = []
+
+    def is_stale(snapshot: Optional[Dict[str, Any]], label: str) -> bool:
+        changed_at = cached.get(changed_keys[label])
+        return full or snapshot is None or (changed_at is not None and changed_at >= snapshot["computed_at"])
+
+    for label, model in models.items():
+        if is_stale(counts.get(label), label):
+            # Take the time before counting, so changes made while we count get picked up next time
+            computed_at = time.time()
+            counts[label] = {"count": model._default_manager.count(), "computed_at": computed_at}
+            recomputed.append(label)
+
+    cache.set(COUNTS_KEY, {x: y for x, y in counts.items() if x in models}, timeout=None)
+
+    activity = cached.get(ACTIVITY_KEY)
+    today = timezone.localdate().isoformat()
+    if is_stale(activity, "admin.logentry") or activity["date"] != today:
+        cache.set(ACTIVITY_KEY, get_activity(options["dashboard_stats_days"]), timeout=None)
+        recomputed.append("activity")
+
+    return recomputed
+
+
+def get_activity(days: int) -> Dict[str, Any]:
+    """
+    Count the admin log entries for each of the last few days
+    """
+    computed_at = time.time()
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    per_day = dict(
+        LogEntry.objects.filter(action_time__date__gte=start)
+        .annotate(day=TruncDate("action_time"))
+        .order_by()
+        .values("day")
+        .annotate(count=Count("id"))
+        .values_list("day", "count")
+    )
+    labels = [start + timedelta(days=x) for x in range(days)]
+
+    return {
+        "labels": [x.isoformat() for x in labels],
+        "values": [per_day.get(x, 0) for x in labels],
+        "date": today.isoformat(),
+        "computed_at": computed_at,
+    }
+
+
+def get_dashboard_stats() -> Dict[str, Any]:
+    """
+    Read the latest snapshots, counts keyed on app_label.model_name and the activity histogram
+    """
+    cached = cache.get_many([COUNTS_KEY, ACTIVITY_KEY])
+    counts = cached.get(COUNTS_KEY) or {}
+    return {
+        "counts": {label: snapshot["count"] for label, snapshot in counts.items()},
+        "activity": cached.get(ACTIVITY_KEY),
+    }
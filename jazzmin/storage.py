@@ -0,0 +1,152 @@
+"""
+Static files storages that write gzip (and brotli, if the brotli package is installed) siblings for jazzmin's assets
+during collectstatic, so they can be served precompressed (e.g by nginx's gzip_static/brotli_static) rather than being
+compressed on the fly.
+
+Compression runs on a process pool, and files whose content hasn't changed since the last collectstatic are skipped.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, StaticFilesStorage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JAZZMIN_STATIC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# Where we keep the content hash of each compressed file, relative to STATIC_ROOT
+INDEX_NAME = "jazzmin/compressed.json"
+
+COMPRESS_EXTENSIONS = (".css", ".js", ".svg", ".json", ".ttf", ".eot", ".map")
+
+# Smaller files aren't worth compressing, and compressed files that don't save much aren't worth keeping
+MIN_SIZE = 512
+MAX_RATIO = 0.95
+
+
+def is_jazzmin_asset(source_storage: Any) -> bool:
+    location = getattr(source_storage, "location", None)
+    return isinstance(location, str) and os.path.abspath(location) == JAZZMIN_STATIC
+
+
+def should_compress(name: str) -> bool:
+    return name.endswith(COMPRESS_EXTENSIONS)
+
+
+def compress_file(path: str) -> List[str]:
+    """
+    Write .gz (and .br) siblings for the given file, returning the paths written
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+
+    written = []
+    compressors: List[Tuple[str, Callable[[bytes], bytes]]] = [(".gz", _gzip)]
+    if brotli is not None:
+        compressors.append((".br", _brotli))
+
+    for suffix, compress in compressors:
+        compressed_path = path + suffix
+        compressed = compress(content)
+        if len(content) < MIN_SIZE or len(compressed) > len(content) * MAX_RATIO:
+            if os.path.exists(compressed_path):
+                os.remove(compressed_path)
+            continue
+        with open(compressed_path, "wb") as f:
+            f.write(compressed)
+        written.append(compressed_path)
+
+    return written
+
+
+def _gzip(content: bytes) -> bytes:
+    # A fixed mtime, so the same content always compresses to the same bytes
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+def _brotli(content: bytes) -> bytes:
+    compressed: bytes = brotli.compress(content)
+    return compressed
+
+
+def content_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class CompressedStaticFilesMixin:
+    """
+    Mixin for a local filesystem static files storage, that compresses jazzmin's assets after post processing
+    """
+
+    path: Any
+
+    def post_process(self, paths: Dict[str, Tuple[Any, str]], dry_run: bool = False, **options: Any) -> Iterator[Any]:
+        to_compress = set()
+        parent = getattr(super(), "post_process", None)
+        if parent is not None:
+            for name, hashed_name, processed in parent(paths, dry_run, **options):
+                yield name, hashed_name, processed
+                if isinstance(processed, Exception) or name not in paths or not is_jazzmin_asset(paths[name][0]):
+                    continue
+                to_compress.add(name)
+                if hashed_name:
+                    to_compress.add(hashed_name)
+        else:
+            to_compress = {name for name, (storage, _) in paths.items() if is_jazzmin_asset(storage)}
+
+        if dry_run:
+            return
+
+        for name, written in self.compress(sorted(x for x in to_compress if should_compress(x))):
+            for compressed_path in written:
+                yield name, name + os.path.splitext(compressed_path)[1], True
+
+    def compress(self, names: List[str]) -> List[Tuple[str, List[str]]]:
+        """
+        Compress the given files, skipping any that haven't changed since they were last compressed
+        """
+        index_path = self.path(INDEX_NAME)
+        index = self._read_index(index_path)
+        hashes = {name: content_hash(self.path(name)) for name in names}
+        changed = [name for name in names if index.get(name) != hashes[name]]
+
+        workers = getattr(settings, "JAZZMIN_COMPRESS_WORKERS", None) or os.cpu_count() or 1
+        paths = [self.path(name) for name in changed]
+        if workers <= 1 or len(paths) <= 1:
+            results = [compress_file(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                results = list(pool.map(compress_file, paths, chunksize=8))
+
+        index.update(hashes)
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        with open(index_path, "w") as f:
+            json.dump(index, f, indent=0, sort_keys=True)
+
+        return list(zip(changed, results))
+
+    def _read_index(self, index_path: str) -> Dict[str, str]:
+        try:
+            with open(index_path) as f:
+                index: Dict[str, str] = json.load(f)
+                return index
+        except (OSError, ValueError):
+            return {}
+
+
+class CompressedStaticFilesStorage(CompressedStaticFilesMixin, StaticFilesStorage):
+    pass
+
+
+class CompressedManifestStaticFilesStorage(CompressedStaticFilesMixin, ManifestStaticFilesStorage):
+    pass
@@ -0,0 +1,71 @@
+// Jazzmin service worker, serves jazzmin's static files from its cache, hashed urls (from ManifestStaticFilesStorage, or
+// jazzmin's bundles) never change so are served cache first, others can change in place when collectstatic runs, so
+// are served from the cache while we fetch them again for next time (stale-while-revalidate)
+'use strict';
+
+const CACHE = 'jazzmin-{{ version }}';
+const PRECACHE = {{ precache|safe }};
+const CACHED_PREFIXES = {{ prefixes|safe }};
+
+// e.g main.55e7cbb9ba48.css, or change_list.838262a7c070.min.js
+const HASHED = /\.[0-9a-f]{12}\.[^/]+$/;
+
+self.addEventListener('install', function (event) {
+    event.waitUntil(
+        caches.open(CACHE).then(function (cache) {
+            return cache.addAll(PRECACHE);
+        }).then(function () {
+            return self.skipWaiting();
+        })
+    );
+});
+
+self.addEventListener('activate', function (event) {
+    event.waitUntil(
+        caches.keys().then(function (keys) {
+            return Promise.all(keys.filter(function (key) {
+                return key.indexOf('jazzmin-') === 0 && key !== CACHE;
+            }).map(function (key) {
+                return caches.delete(key);
+            }));
+        }).then(function () {
+            return self.clients.claim();
+        })
+    );
+});
+
+self.addEventListener('fetch', function (event) {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+
+    const url = new URL(request.url);
+    const cached = url.origin === self.location.origin && CACHED_PREFIXES.some(function (prefix) {
+        return url.pathname.indexOf(prefix) === 0;
+    });
+    if (!cached) {
+        return;
+    }
+
+    event.respondWith(
+        caches.open(CACHE).then(function (cache) {
+            return cache.match(request).then(function (cached) {
+                if (cached && HASHED.test(url.pathname)) {
+                    return cached;
+                }
+                const fetched = fetch(request).then(function (response) {
+                    if (response.ok) {
+                        cache.put(request, response.clone());
+                    }
+                    return response;
+                });
+                if (!cached) {
+                    return fetched;
+                }
+                event.waitUntil(fetched.catch(function () {}));
+                return cached;
+            });
+        })
+    );
+});
@@ -5,11 +5,12 @@ import logging
 import urllib.parse
 from typing import Any, Callable, Dict, List, Optional, Union
 
+from django import forms
 from django.conf import settings
 from django.contrib.admin import ListFilter
 from django.contrib.admin.helpers import AdminForm, Fieldset, InlineAdminFormSet
 from django.contrib.admin.models import LogEntry
-from django.contrib.admin.sites import all_sites
+from django.contrib.admin.templatetags.base import InclusionAdminNode
 from django.contrib.admin.views.main import PAGE_VAR, ChangeList
 from django.contrib.auth import get_user_model
 from django.contrib.auth.context_processors import PermWrapper
@@ -18,24 +19,41 @@ from django.core.handlers.wsgi import WSGIRequest
 from django.db.models.base import ModelBase
 from django.http import HttpRequest
 from django.template import Context, Library
+from django.template.base import Parser, Token
 from django.template.defaultfilters import capfirst
 from django.template.loader import get_template
 from django.templatetags.static import static
-from django.utils.html import escape
+from django.utils.html import escape, format_html_join
 from django.utils.safestring import SafeText, mark_safe
 from django.utils.text import get_text_list, slugify
 from django.utils.translation import gettext
 
 from .. import version
-from ..settings import CHANGEFORM_TEMPLATES, get_settings, get_ui_tweaks
+from ..badges import get_model_badges
+from ..bundles import get_bundle
+from ..compat import NoReverseMatch, reverse
+from ..dashboard import get_dashboard_widgets as load_dashboard_widgets
+from ..date_hierarchy import get_date_hierarchy
+from ..icons import get_fontawesome_css as get_fontawesome_css_path
+from ..settings import (
+    CHANGEFORM_TEMPLATES,
+    get_request_settings,
+    get_ui_tweaks,
+    is_fragment_request,
+    is_partial_request,
+)
+from ..stats import get_dashboard_stats as read_dashboard_stats
 from ..utils import (
     get_admin_url,
+    get_cache_scope,
+    get_current_app,
     get_filter_id,
     get_installed_apps,
     has_fieldsets_check,
     make_menu,
     order_with_respect_to,
 )
+from ..widgets import get_select2_media
 
 User = get_user_model()
 register = Library()
@@ -48,6 +66,8 @@ def _side_menu_items_for_app(
     app_custom_links: list[dict[str, Any]],
     options: dict[str, Any],
     ordering: list[str],
+    badges: dict[str, int],
+    counts: dict[str, int],
 ) -> list[dict[str, Any]]:
     """Build ordered menu items (models + custom links) for one app in the side menu."""
     menu_items: list[dict[str, Any]] = []
@@ -58,8 +78,12 @@ def _side_menu_items_for_app(
         model["url"] = model["admin_url"]
         model["model_str"] = model_str
         model["icon"] = options["icons"].get(model_str, options["default_icon_children"])
+        model["badge"] = badges.get(model_str)
+        model["count"] = counts.get(model_str)
         menu_items.append(model)
 
+    for link in app_custom_links:
+        link["badge"] = link["count"] = None
     menu_items.extend(app_custom_links)
     custom_link_names = [x.get("name", "").lower() for x in app_custom_links]
     model_ordering = [
@@ -85,9 +109,13 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict[
     if not user:
         return []
 
-    options = get_settings()
+    request = context.get("request")
+    admin_site = get_current_app(request)
+    options = get_request_settings(request, admin_site)
     ordering = [x.lower() for x in options.get("order_with_respect_to", [])]
     installed_apps = get_installed_apps()
+    badges = get_model_badges(options, get_cache_scope(request))
+    counts = read_dashboard_stats()["counts"] if options["dashboard_stats"] else {}
     available_apps: list[dict[str, Any]] = copy.deepcopy(context.get(using, []))
 
     for app_label in options.get("custom_links", {}):
@@ -97,7 +125,7 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict[
             )
 
     custom_links = {
-        app_name: make_menu(user, links, options, allow_appmenus=False)
+        app_name: make_menu(user, links, options, allow_appmenus=False, admin_site=admin_site)
         for app_name, links in options.get("custom_links", {}).items()
     }
 
@@ -108,7 +136,7 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict[
             continue
         app_custom_links = custom_links.get(app_label, [])
         app["icon"] = options["icons"].get(app_label, options["default_icon_parents"])
-        menu_items = _side_menu_items_for_app(app, app_label, app_custom_links, options, ordering)
+        menu_items = _side_menu_items_for_app(app, app_label, app_custom_links, options, ordering, badges, counts)
         if menu_items:
             app["models"] = menu_items
             menu.append(app)
@@ -120,21 +148,73 @@ def get_side_menu(context: Context, using: str = "available_apps") -> List[Dict[
     return menu
 
 
+@register.simple_tag(takes_context=True)
+def get_dashboard_widgets(context: Context) -> List[Dict[str, Any]]:
+    """
+    Get the dashboard widgets the user can see, with their data loaded
+    """
+    request = context.get("request")
+    if not request:
+        return []
+    return load_dashboard_widgets(request, get_request_settings(request))
+
+
+@register.simple_tag(takes_context=True)
+def get_dashboard_stats(context: Context) -> Dict[str, Any]:
+    """
+    Get the precomputed dashboard statistics if they are enabled, with the activity shaped like a series widget
+    """
+    if not get_request_settings(context.get("request"))["dashboard_stats"]:
+        return {"counts": {}, "activity": None}
+
+    stats = read_dashboard_stats()
+    return {"counts": stats["counts"], "activity": {"value": stats["activity"]} if stats["activity"] else None}
+
+
+@register.simple_tag
+def dashboard_table(data: Any) -> Dict[str, List[Any]]:
+    """
+    Get the headers and rows for a table widget, from {"headers": [...], "rows": [[...]]} or just a list of rows
+    """
+    if isinstance(data, dict):
+        return {"headers": list(data.get("headers") or []), "rows": list(data.get("rows") or [])}
+    return {"headers": [], "rows": list(data or [])}
+
+
+@register.simple_tag
+def dashboard_series(data: Any) -> List[Dict[str, Any]]:
+    """
+    Get the points for a series widget, from {"labels": [...], "values": [...]} or a list of (label, value) pairs,
+    with each value as a percentage of the largest
+    """
+    if isinstance(data, dict):
+        data = zip(data.get("labels") or [], data.get("values") or [])
+    points = [{"label": label, "value": value} for label, value in data or []]
+    largest = max([x["value"] for x in points] + [0])
+    for point in points:
+        point["percent"] = round(point["value"] * 100 / largest) if largest else 0
+    return points
+
+
 @register.simple_tag
-def get_top_menu(user: AbstractUser, admin_site: str = "admin") -> List[Dict[str, Any]]:
+def get_top_menu(
+    user: AbstractUser, admin_site: str = "admin", request: Optional[HttpRequest] = None
+) -> List[Dict[str, Any]]:
     """
     Produce the menu for the top nav bar
     """
-    options = get_settings()
+    options = get_request_settings(request, admin_site)
     return make_menu(user, options.get("topmenu_links", []), options, allow_appmenus=True, admin_site=admin_site)
 
 
 @register.simple_tag
-def get_user_menu(user: AbstractUser, admin_site: str = "admin") -> List[Dict[str, Any]]:
+def get_user_menu(
+    user: AbstractUser, admin_site: str = "admin", request: Optional[HttpRequest] = None
+) -> List[Dict[str, Any]]:
     """
     Produce the menu for the user dropdown
     """
-    options = get_settings()
+    options = get_request_settings(request, admin_site)
     return make_menu(
         user,
         options.get("usermenu_links", []),
@@ -147,29 +227,77 @@ def get_user_menu(user: AbstractUser, admin_site: str = "admin") -> List[Dict[st
 @register.simple_tag
 def get_jazzmin_settings(request: WSGIRequest) -> Dict[str, Any]:
     """
-    Get Jazzmin settings, update any defaults from the request, and return
+    Get Jazzmin settings, resolved against the admin site (and tenant) serving this request
+    """
+    return get_request_settings(request)
+
+
+@register.simple_tag
+def is_partial(request: Optional[HttpRequest]) -> bool:
+    """
+    Whether to render just the content of the page, for partial navigation
+    """
+    return is_partial_request(request)
+
+
+@register.simple_tag
+def is_fragment(request: Optional[HttpRequest]) -> bool:
+    """
+    Whether to render just the results of a changelist, for changelist_ajax
     """
-    settings = get_settings()
+    return is_fragment_request(request)
 
-    admin_site = {x.name: x for x in all_sites}.get("admin", {})
-    if not settings["site_title"]:
-        settings["site_title"] = getattr(admin_site, "site_title", None)
 
-    if not settings["site_header"]:
-        settings["site_header"] = getattr(admin_site, "site_header", None)
+@register.simple_tag(takes_context=True)
+def get_jazzmin_ui_tweaks(context: Context) -> Dict[str, Any]:
+    """
+    Return Jazzmin ui tweaks, with the theme the user has chosen (if any)
+    """
+    return get_ui_tweaks(context.get("request"))
 
-    if not settings["site_brand"]:
-        settings["site_brand"] = getattr(admin_site, "site_header", None)
 
-    return settings
+@register.simple_tag
+def jazzmin_bundle(entry: str) -> SafeText:
+    """
+    Deferred script tags for one of jazzmin's javascript bundles (see bundles.py)
+    """
+    return format_html_join("\n", '<script src="{}" defer></script>', ((static(x),) for x in get_bundle(entry)))
 
 
 @register.simple_tag
-def get_jazzmin_ui_tweaks() -> Dict[str, Any]:
+def get_jazzmin_bundle(entry: str) -> List[str]:
     """
-    Return Jazzmin ui tweaks
+    Get the urls for one of jazzmin's javascript bundles, e.g to preload them
     """
-    return get_ui_tweaks()
+    return [static(x) for x in get_bundle(entry)]
+
+
+@register.simple_tag
+def with_select2(media: Optional[forms.Media] = None) -> forms.Media:
+    """
+    Add Select2 to the given media (or just get Select2), merged so there is only ever one copy on the page
+    """
+    return (media or forms.Media()) + get_select2_media()
+
+
+@register.simple_tag
+def get_fontawesome_css() -> str:
+    """
+    Get the Font Awesome css to load, the subset made by the jazzmin_icons command if there is one
+    """
+    return get_fontawesome_css_path()
+
+
+@register.simple_tag
+def get_service_worker_url() -> Optional[str]:
+    """
+    Get the url of jazzmin's service worker, or None if jazzmin.urls isn't included
+    """
+    try:
+        return str(reverse("jazzmin:service_worker"))
+    except NoReverseMatch:
+        logger.warning("Include jazzmin.urls to use the service worker")
+        return None
 
 
 @register.simple_tag
@@ -181,7 +309,7 @@ def get_jazzmin_version() -> str:
 
 
 @register.simple_tag
-def get_user_avatar(user: AbstractUser) -> str:
+def get_user_avatar(user: AbstractUser, request: Optional[HttpRequest] = None) -> str:
     """
     For the given user, try to get the avatar image, which can be one of:
 
@@ -190,7 +318,7 @@ def get_user_avatar(user: AbstractUser) -> str:
         - A callable that receives the user instance e.g lambda u: u.profile.image.url
     """
     no_avatar = str(static("vendor/adminlte/img/user2-160x160.jpg"))
-    options = get_settings()
+    options = get_request_settings(request)
     avatar_field_name: Optional[Union[str, Callable[..., str]]] = options.get("user_avatar")
 
     if not avatar_field_name:
@@ -390,12 +518,12 @@ def as_json(value: Union[List[Any], Dict[str, Any]]) -> str:
 
 
 @register.simple_tag
-def get_changeform_template(adminform: AdminForm) -> str:
+def get_changeform_template(adminform: AdminForm, request: Optional[HttpRequest] = None) -> str:
     """
     Go get the correct change form template based on the modeladmin being used,
     the default template, or the overridden one for this modeladmin
     """
-    options = get_settings()
+    options = get_request_settings(request, adminform.model_admin.admin_site.name)
     has_fieldsets = has_fieldsets_check(adminform)
     inlines = adminform.model_admin.inlines
     has_inlines = inlines and len(inlines) > 0
@@ -435,6 +563,59 @@ def can_view_self(perms: PermWrapper) -> bool:
     return bool(perms[User._meta.app_label][view_perm])
 
 
+@register.simple_tag(takes_context=True)
+def is_virtual_table(context: Context, cl: ChangeList, results: List[Any]) -> bool:
+    """
+    Whether to render the results as a virtual table (see changelist_virtual_rows), never for list_editable, as all of
+    its forms need submitting
+    """
+    # change_list_results.html is rendered by django's result_list tag, which leaves the request off the context's data
+    request = getattr(context, "request", None)
+    rows = get_request_settings(request, cl.model_admin.admin_site.name)["changelist_virtual_rows"]
+    # Streamed changelists (see StreamingChangeListMixin) only render their first rows here
+    count = cl.result_count if getattr(cl, "jazzmin_streaming", False) else len(results)
+    return bool(rows) and not cl.formset and count > rows
+
+
+@register.simple_tag(takes_context=True)
+def get_changelist_columns(context: Context, cl: ChangeList) -> List[Dict[str, Any]]:
+    """
+    The columns for the column chooser, if the model admin uses ColumnChooserMixin
+    """
+    get_column_choices = getattr(cl.model_admin, "get_column_choices", None)
+    request = context.get("request")
+    return get_column_choices(request) if get_column_choices and request else []
+
+
+@register.simple_tag(takes_context=True)
+def get_query_report(context: Context) -> List[Dict[str, Any]]:
+    """
+    The repeated (N+1) queries QueryInspectorMiddleware has seen so far, if it's installed
+    """
+    inspector = getattr(context.get("request"), "jazzmin_query_inspector", None)
+    return inspector.get_report() if inspector is not None and inspector.active else []
+
+
+@register.tag(name="jazzmin_date_hierarchy")
+def jazzmin_date_hierarchy(parser: Parser, token: Token) -> InclusionAdminNode:
+    """
+    django's date_hierarchy, with the buckets cached/worked out from the first and last dates for model admins that ask
+    (see jazzmin.date_hierarchy)
+    """
+    return InclusionAdminNode(
+        parser, token, func=get_date_hierarchy, template_name="date_hierarchy.html", takes_context=False
+    )
+
+
+@register.simple_tag
+def get_lazy_columns_url(cl: ChangeList) -> str:
+    """
+    Where to load lazy cells from, if the model admin uses LazyColumnsMixin
+    """
+    get_url = getattr(cl.model_admin, "get_lazy_columns_url", None)
+    return get_url() if get_url else ""
+
+
 @register.simple_tag
 def header_class(header: Dict[str, Any], forloop: Dict[str, Any]) -> str:
     """
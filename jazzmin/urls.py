@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+app_name = "jazzmin"
+
+urlpatterns = [
+    path("dashboard/widgets/<slug:slug>/", views.dashboard_widget, name="dashboard_widget"),
+    path("service-worker.js", views.service_worker, name="service_worker"),
+]
@@ -1,13 +1,16 @@
+import hashlib
 import logging
-from typing import Any, Callable, Dict, List, Set, TypeVar, Union
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar, Union
 from urllib.parse import urlencode
 
 from django.apps import apps
 from django.contrib.admin import ListFilter
 from django.contrib.admin.helpers import AdminForm
+from django.contrib.admin.sites import AdminSite, all_sites
 from django.contrib.auth.models import AbstractUser
 from django.db.models.base import Model, ModelBase
 from django.db.models.options import Options
+from django.http import HttpRequest
 from django.utils.translation import gettext
 
 from jazzmin.compat import NoReverseMatch, reverse
@@ -77,6 +80,32 @@ def get_admin_url(instance: Any, admin_site: str = "admin", from_app: bool = Fal
     return str(url)
 
 
+def get_admin_site(name: str = "admin") -> Optional[AdminSite]:
+    """
+    Find a registered admin site by its name (the instance namespace used when reversing its urls)
+    """
+    for site in all_sites:
+        if site.name == name:
+            return site
+    return None
+
+
+def get_current_app(request: Optional[HttpRequest]) -> str:
+    """
+    Get the name of the admin site serving this request, admin views set this as request.current_app
+    """
+    return getattr(request, "current_app", None) or "admin"
+
+
+def get_cache_scope(request: Optional[HttpRequest]) -> str:
+    """
+    Part of a cache key for what the settings vary by, the admin site serving this request and its tenant (set by
+    get_request_settings), hashed as tenants can be any hashable
+    """
+    tenant = getattr(request, "jazzmin_tenant", None)
+    return "{}:{}".format(get_current_app(request), hashlib.md5(repr(tenant).encode()).hexdigest())
+
+
 def get_filter_id(spec: ListFilter) -> str:
     return str(getattr(spec, "field_path", getattr(spec, "parameter_name", spec.title)))
 
@@ -245,5 +274,13 @@ def attr(**kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
     return decorator
 
 
+def lazy_column(timeout: Optional[int] = 300, **kwargs: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Mark a list_display callable as slow, with LazyColumnsMixin the changelist loads its cells after the page, caching
+    them (per object and version) for timeout seconds, other kwargs are set as with attr e.g short_description
+    """
+    return attr(jazzmin_lazy=True, jazzmin_lazy_timeout=timeout, **kwargs)
+
+
 def get_installed_apps() -> List[str]:
     return [app_config.label for app_config in apps.get_app_configs()]
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import urllib.parse
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpRequest
+from django.template.response import TemplateResponse
+from django.templatetags.static import static
+from django.views.decorators.cache import never_cache
+
+from . import version
+from .bundles import BUNDLES, get_bundle
+from .dashboard import get_widget, load_widget_data
+from .icons import FONTAWESOME_CSS, get_fontawesome_css
+from .middleware import get_critical_assets
+from .settings import get_request_settings
+from .utils import get_admin_site
+
+# Static files (under STATIC_URL) the service worker serves from its cache, cache first only if their urls are hashed
+SERVICE_WORKER_PREFIXES = ["vendor/", "jazzmin/", "admin/js/vendor/", "admin/css/vendor/"]
+
+# The Font Awesome fonts almost every page uses, the rest are cached when first used
+FONTAWESOME_PRECACHE = ("fa-solid-900", "fa-regular-400")
+
+
+@staff_member_required  # type: ignore[untyped-decorator]
+def dashboard_widget(request: HttpRequest, slug: str) -> TemplateResponse:
+    """
+    Render the data for a single (lazy) dashboard widget, of the admin site given (site=)
+    """
+    site = get_admin_site(request.GET.get("site") or "admin")
+    if site is None or not site.has_permission(request):
+        raise Http404
+
+    # As the admin site's views would, so we read its settings (and cache entries)
+    request.current_app = site.name
+    options = get_request_settings(request)
+    widget = get_widget(options, slug)
+    if not widget or not request.user.has_perms(widget["permissions"]):
+        raise Http404
+
+    widget = {**widget, "value": None, "url": None, "error": False}
+    load_widget_data(request, [widget], options)
+    return TemplateResponse(request, "jazzmin/dashboard/widget_body.html", {"widget": widget})
+
+
+@never_cache  # type: ignore[untyped-decorator]
+def service_worker(request: HttpRequest) -> TemplateResponse:
+    """
+    The service worker that precaches jazzmin's static files (see use_service_worker), versioned by the jazzmin version
+    and the files it precaches, so it (and its cache) is replaced when either changes
+    """
+    options = get_request_settings(request)
+    if not options["use_service_worker"]:
+        raise Http404
+
+    precache = [url for url, _ in get_critical_assets(request)]
+    precache += [static(x) for entry in BUNDLES if entry not in ("main", "ui_builder") for x in get_bundle(entry)]
+    if get_fontawesome_css() == FONTAWESOME_CSS:
+        precache += [static("vendor/fontawesome-free/webfonts/{}.woff2".format(x)) for x in FONTAWESOME_PRECACHE]
+
+    static_path = urllib.parse.urlparse(settings.STATIC_URL or "/static/").path
+    digest = hashlib.md5(json.dumps(precache).encode()).hexdigest()[:8]
+    context = {
+        "version": "{}-{}".format(version, digest),
+        "precache": json.dumps(precache),
+        "prefixes": json.dumps([static_path + x for x in SERVICE_WORKER_PREFIXES]),
+    }
+
+    response = TemplateResponse(
+        request, "jazzmin/service_worker.js", context, content_type="application/javascript; charset=utf-8"
+    )
+    # Let the worker control the admin pages, not just those under this url
+    response["Service-Worker-Allowed"] = "/"
+    return response
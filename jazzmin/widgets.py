@@ -1,18 +1,36 @@
 from typing import Any
 
 from django import forms
+from django.conf import settings
+from django.contrib.admin.widgets import get_select2_language
 from django.forms.widgets import Select, SelectMultiple
 
 
+def get_select2_media() -> forms.Media:
+    """
+    The Select2 that ships with django (the one autocomplete_fields use), with the same paths as django's autocomplete
+    widgets, so when both are on a page, media merging leaves one copy, attached to django.jQuery
+    """
+    extra = "" if settings.DEBUG else ".min"
+    i18n_name = get_select2_language()
+    i18n_file = ("admin/js/vendor/select2/i18n/{}.js".format(i18n_name),) if i18n_name else ()
+    return forms.Media(
+        js=(
+            "admin/js/vendor/jquery/jquery{}.js".format(extra),
+            "admin/js/vendor/select2/select2.full{}.js".format(extra),
+            *i18n_file,
+            "admin/js/jquery.init.js",
+        ),
+        css={"screen": ("admin/css/vendor/select2/select2{}.css".format(extra),)},
+    )
+
+
 class JazzminSelect(Select):
     template_name = "jazzmin/widgets/select.html"
 
     @property
     def media(self) -> forms.Media:
-        return forms.Media(
-            css={"all": ("vendor/select2/css/select2.min.css",)},
-            js=("vendor/select2/js/select2.min.js",),
-        )
+        return get_select2_media()
 
 
 class JazzminSelectMultiple(SelectMultiple):
@@ -25,7 +43,4 @@ class JazzminSelectMultiple(SelectMultiple):
 
     @property
     def media(self) -> forms.Media:
-        return forms.Media(
-            css={"all": ("vendor/select2/css/select2.min.css",)},
-            js=("vendor/select2/js/select2.min.js",),
-        )
+        return get_select2_media()
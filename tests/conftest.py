@@ -1,11 +1,30 @@
 import copy
+from typing import Any, Dict
 
 import pytest
+from django.core.signals import setting_changed
 from django.urls import reverse
 
 from .test_app.library.factories import BookFactory
 
 
+class JazzminSettings(Dict[str, Any]):
+    """
+    JAZZMIN_SETTINGS that tests tweak in place, let anything caching resolved settings know when they change
+    """
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.changed()
+
+    def changed(self):
+        setting_changed.send(sender=self.__class__, setting="JAZZMIN_SETTINGS", value=self, enter=True)
+
+
 @pytest.fixture
 def change_form_context(admin_client):
     book = BookFactory()
@@ -16,6 +35,6 @@ def change_form_context(admin_client):
 
 @pytest.fixture(scope="function")
 def custom_jazzmin_settings(settings):
-    original_settings = copy.deepcopy(settings.JAZZMIN_SETTINGS)
+    original_settings = JazzminSettings(copy.deepcopy(settings.JAZZMIN_SETTINGS))
     settings.JAZZMIN_SETTINGS = original_settings
     yield original_settings
@@ -2,11 +2,13 @@ import re
 
 import django
 import pytest
+from bs4 import BeautifulSoup
 
+from jazzmin.bundles import get_bundle
 from jazzmin.compat import reverse
 
 from .test_app.library.books.models import Book
-from .test_app.library.factories import BookFactory
+from .test_app.library.factories import AuthorFactory, BookFactory
 
 
 @pytest.mark.django_db
@@ -284,6 +286,8 @@ def test_list(admin_client):
         "admin/change_list_results.html": 1,
         "admin/date_hierarchy.html": 1,
         "admin/pagination.html": 1,
+        "jazzmin/includes/change_list_columns.html": 1,
+        "jazzmin/includes/change_list_result_count.html": 1,
         "django/forms/widgets/attrs.html": 27,
         "django/forms/widgets/checkbox.html": 5,
         "django/forms/widgets/hidden.html": 11,
@@ -308,6 +312,8 @@ def test_list(admin_client):
         "admin/change_list_results.html",
         "admin/date_hierarchy.html",
         "admin/pagination.html",
+        "jazzmin/includes/change_list_columns.html",
+        "jazzmin/includes/change_list_result_count.html",
         "django/forms/widgets/attrs.html",
         "django/forms/widgets/checkbox.html",
         "django/forms/widgets/hidden.html",
@@ -388,3 +394,176 @@ def test_delete(admin_client):
     # We deleted our object, and are now back on the changelist
     assert not Book.objects.all().exists()
     assert response.resolver_match.url_name == "books_book_changelist"
+
+
+@pytest.mark.django_db
+def test_preload_middleware(admin_client, settings, custom_jazzmin_settings):
+    """
+    Admin pages get Link: rel=preload headers for their critical assets, following the theme in use
+    """
+    settings.MIDDLEWARE = settings.MIDDLEWARE + ["jazzmin.middleware.PreloadMiddleware"]
+    settings.JAZZMIN_UI_TWEAKS = {"theme": "darkly"}
+
+    response = admin_client.get(reverse("admin:books_book_changelist"))
+    links = response["Link"].split(", ")
+
+    assert "</static/vendor/adminlte/css/adminlte-components.min.css>; rel=preload; as=style" in links
+    assert "</static/vendor/bootswatch/darkly/bootstrap.min.css>; rel=preload; as=style" in links
+    assert "</static/vendor/fontawesome-free/css/all.min.css>; rel=preload; as=style" in links
+    assert "</static/{}>; rel=preload; as=script".format(get_bundle("main")[0]) in links
+
+    response = admin_client.get(reverse("admin:jsi18n"))
+    assert "Link" not in response
+
+
+@pytest.mark.django_db
+def test_service_worker(admin_client, client, custom_jazzmin_settings):
+    """
+    When enabled, admin pages register the service worker, which precaches the critical assets
+    """
+    assert client.get(reverse("jazzmin:service_worker")).status_code == 404
+    assert "serviceWorker" not in admin_client.get(reverse("admin:index")).content.decode()
+
+    custom_jazzmin_settings["use_service_worker"] = True
+
+    response = client.get(reverse("jazzmin:service_worker"))
+    content = response.content.decode()
+
+    assert response["Content-Type"].startswith("application/javascript")
+    assert response["Service-Worker-Allowed"] == "/"
+    assert '"/static/{}"'.format(get_bundle("main")[0]) in content
+    assert '"/static/vendor/"' in content
+    assert "const HASHED = /\\.[0-9a-f]{12}\\.[^/]+$/;" in content
+
+    response = admin_client.get(reverse("admin:index"))
+    register = "navigator.serviceWorker.register('{}'".format(reverse("jazzmin:service_worker"))
+    assert register in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_partial_navigation(admin_client, custom_jazzmin_settings):
+    """
+    With partial navigation on, pages asked for with our header only render their content, not the navbar/sidebar
+    """
+    url = reverse("admin:books_book_changelist")
+
+    response = admin_client.get(url, headers={"X-Jazzmin-Partial": "1"})
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.find(id="jazzy-sidebar") and not soup.body.has_attr("data-jazzmin-partial")
+
+    custom_jazzmin_settings["partial_navigation"] = True
+
+    response = admin_client.get(url)
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.body["data-jazzmin-root"] == reverse("admin:index")
+    assert soup.find("script", src="/static/{}".format(get_bundle("partial")[0]))
+
+    response = admin_client.get(url, headers={"X-Jazzmin-Partial": "1"})
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.body.has_attr("data-jazzmin-partial")
+    assert not soup.find(id="jazzy-sidebar") and not soup.find(id="jazzy-navbar") and not soup.find("footer")
+    assert soup.title.text.strip().startswith("Select book to change")
+    assert soup.head.find("script", src=re.compile("admin/js/actions"))
+    assert soup.find("main").find(id="changelist")
+    assert not soup.find("script", src="/static/{}".format(get_bundle("main")[0]))
+
+
+@pytest.mark.django_db
+def test_partial_navigation_headers(admin_client, settings, custom_jazzmin_settings):
+    """
+    With partial navigation on, admin pages vary on our header, and partial pages don't get preload headers, as the
+    page that loaded them already has its assets
+    """
+    settings.MIDDLEWARE = settings.MIDDLEWARE + [
+        "jazzmin.middleware.VaryMiddleware",
+        "jazzmin.middleware.PreloadMiddleware",
+    ]
+    url = reverse("admin:books_book_changelist")
+
+    response = admin_client.get(url)
+    assert "X-Jazzmin-Partial" not in response.get("Vary", "")
+
+    custom_jazzmin_settings["partial_navigation"] = True
+
+    response = admin_client.get(url)
+    assert "X-Jazzmin-Partial" in response["Vary"] and "Link" in response
+
+    response = admin_client.get(url, headers={"X-Jazzmin-Partial": "1"})
+    assert "X-Jazzmin-Partial" in response["Vary"] and "Link" not in response
+
+
+@pytest.mark.django_db
+def test_changelist_fragment(admin_client, custom_jazzmin_settings):
+    """
+    With changelist_ajax on, changelists asked for with our header only render their results
+    """
+    BookFactory.create_batch(3, title="Jazz")
+    BookFactory(title="Blues")
+    url = reverse("admin:books_book_changelist")
+
+    custom_jazzmin_settings["changelist_ajax"] = True
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+    assert soup.find(id="changelist-search").has_attr("data-jazzmin-ajax")
+
+    response = admin_client.get(url, {"q": "Jazz", "o": "1"}, headers={"X-Jazzmin-Fragment": "1"})
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert not soup.find("html") and not soup.find(id="changelist-search") and not soup.find(id="jazzy-sidebar")
+    assert soup.find(id="changelist-result-count")
+    assert len(soup.find(id="changelist-form").find_all("input", class_="action-select")) == 3
+    assert soup.find(id="changelist-form").find("ul", class_="pagination")
+
+
+@pytest.mark.django_db
+def test_changelist_fragment_headers(admin_client, settings, custom_jazzmin_settings):
+    """
+    With changelist_ajax on, admin pages vary on our header, and fragments don't get preload headers
+    """
+    settings.MIDDLEWARE = settings.MIDDLEWARE + [
+        "jazzmin.middleware.VaryMiddleware",
+        "jazzmin.middleware.PreloadMiddleware",
+    ]
+    url = reverse("admin:books_book_changelist")
+
+    response = admin_client.get(url)
+    assert "X-Jazzmin-Fragment" not in response.get("Vary", "")
+
+    custom_jazzmin_settings["changelist_ajax"] = True
+
+    response = admin_client.get(url)
+    assert "X-Jazzmin-Fragment" in response["Vary"] and "Link" in response
+
+    response = admin_client.get(url, headers={"X-Jazzmin-Fragment": "1"})
+    assert "X-Jazzmin-Fragment" in response["Vary"] and "Link" not in response
+
+
+@pytest.mark.django_db
+def test_virtual_result_table(admin_client, custom_jazzmin_settings):
+    """
+    Pages with more results than changelist_virtual_rows render their rows in a template, unless list_editable
+    """
+    AuthorFactory.create_batch(3)
+    url = reverse("admin:books_author_changelist")
+    custom_jazzmin_settings["changelist_virtual_rows"] = 2
+
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+    table = soup.find(id="result_list")
+    assert table.has_attr("data-jazzmin-virtual")
+    assert not table.find("tbody").find_all("tr")
+    assert len(soup.find(id="result_list_rows").find_all("input", class_="action-select")) == 3
+
+    # Books are list_editable
+    soup = BeautifulSoup(admin_client.get(reverse("admin:books_book_changelist")).content, "html.parser")
+    assert not soup.find(id="result_list_rows")
+
+    custom_jazzmin_settings["changelist_virtual_rows"] = 3
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+    assert not soup.find(id="result_list").has_attr("data-jazzmin-virtual")
+    assert len(soup.find(id="result_list").find("tbody").find_all("tr")) == 3
+
+    # Tenants can override it
+    custom_jazzmin_settings.update(
+        {"tenant_key": lambda r: r.get_host(), "tenant_settings": lambda host: {"changelist_virtual_rows": len(host)}}
+    )
+    soup = BeautifulSoup(admin_client.get(url, HTTP_HOST="a").content, "html.parser")
+    assert soup.find(id="result_list").has_attr("data-jazzmin-virtual")
@@ -5,6 +5,7 @@ from django.contrib.auth.models import User
 from django.utils.html import format_html
 from django.utils.timesince import timesince
 
+from jazzmin.mixins import CachedChangeListMixin, ColumnChooserMixin, DirtyRowsMixin, StreamingChangeListMixin
 from jazzmin.utils import attr
 
 from ..loans.admin import BookLoanInline
@@ -18,7 +19,7 @@ class BooksInline(admin.TabularInline):
 
 
 @admin.register(Book)
-class BookAdmin(admin.ModelAdmin):
+class BookAdmin(DirtyRowsMixin, admin.ModelAdmin):
     fieldsets = (
         ("general", {"fields": ("title", "author", "library"), "description": "General book fields"}),
         ("other", {"fields": ("genre", "summary", "isbn", "published_on", "pages")}),
@@ -43,8 +44,9 @@ class BookAdmin(admin.ModelAdmin):
 
 
 @admin.register(Author)
-class AuthorAdmin(admin.ModelAdmin):
+class AuthorAdmin(ColumnChooserMixin, StreamingChangeListMixin, admin.ModelAdmin):
     list_display = ("last_name", "first_name", "date_of_birth", "date_of_death")
+    jazzmin_hidden_columns = ("date_of_death",)
     fields = ("first_name", "last_name", ("date_of_birth", "date_of_death"))
     inlines = (BooksInline,)
 
@@ -79,5 +81,5 @@ class CustomUserAdmin(UserAdmin):
 
 
 @admin.register(Genre)
-class GenreAdmin(admin.ModelAdmin):
+class GenreAdmin(CachedChangeListMixin, admin.ModelAdmin):
     search_fields = ("name",)
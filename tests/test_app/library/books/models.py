@@ -23,6 +23,7 @@ class Book(models.Model):
     published_on = models.DateField()
     last_print = models.DateField(auto_now_add=True)
     pages = models.IntegerField(null=True)
+    cover = models.FileField(upload_to="covers", blank=True)
 
     def get_absolute_url(self):
         return reverse("admin:books_book_change", args=(self.id,))
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.urls import path
 
+from jazzmin.mixins import LazyColumnsMixin
+from jazzmin.utils import lazy_column
+
 from .models import BookLoan, Library
 from .views import CustomView
 
@@ -49,5 +52,9 @@ class BookLoanAdmin(admin.ModelAdmin):
 
 
 @admin.register(Library)
-class LibraryAdmin(admin.ModelAdmin):
-    list_display = ("name", "address", "librarian")
+class LibraryAdmin(LazyColumnsMixin, admin.ModelAdmin):
+    list_display = ("name", "address", "librarian", "book_count")
+
+    @lazy_column(short_description="Books")
+    def book_count(self, obj):
+        return obj.books.count()
@@ -20,6 +20,7 @@ def make_messages(request):
 urlpatterns = [
     path("", RedirectView.as_view(pattern_name="admin:index", permanent=False)),
     path("admin/doc/", include("django.contrib.admindocs.urls")),
+    path("jazzmin/", include("jazzmin.urls")),
     path("make_messages/", make_messages, name="make_messages"),
     path("i18n/", include("django.conf.urls.i18n")),
 ]
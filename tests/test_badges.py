@@ -0,0 +1,122 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.core.cache import cache
+from django.urls import reverse
+
+from jazzmin import badges
+from jazzmin.settings import get_request_settings, get_settings
+from jazzmin.utils import get_cache_scope
+
+from .test_app.library.books.models import Book
+from .test_app.library.factories import BookFactory
+
+# The admin site, without a tenant
+SCOPE = get_cache_scope(None)
+
+
+@pytest.fixture
+def badge_settings(custom_jazzmin_settings):
+    cache.clear()
+    custom_jazzmin_settings.update(
+        {
+            "model_badges": {"books.Book": lambda: Book.objects.all(), "loans.library": lambda: 7},
+            "model_badges_workers": 1,
+        }
+    )
+    yield get_settings()
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_refresh_model_badges(badge_settings):
+    """
+    Querysets are counted, numbers are used as is, and both are cached
+    """
+    BookFactory.create_batch(3)
+
+    assert badges.refresh_model_badges(["books.book", "loans.library"], badge_settings, SCOPE) == {
+        "books.book": 3,
+        "loans.library": 7,
+    }
+    assert cache.get(badges.CACHE_KEY.format(SCOPE, "books.book"))[0] == 3
+
+
+@pytest.mark.django_db
+def test_get_model_badges_refreshes_in_background(badge_settings, monkeypatch):
+    """
+    Missing or stale counts are refreshed in the background, stale counts are still shown in the meantime
+    """
+    scheduled = []
+    monkeypatch.setattr(badges, "schedule_refresh", lambda models, options, scope: scheduled.append(models))
+
+    assert badges.get_model_badges(badge_settings, SCOPE) == {}
+    assert scheduled == [["books.book", "loans.library"]]
+
+    badges.refresh_model_badges(["books.book", "loans.library"], badge_settings, SCOPE)
+    scheduled.clear()
+    assert badges.get_model_badges(badge_settings, SCOPE) == {"books.book": 0, "loans.library": 7}
+    assert scheduled == []
+
+    stale_settings = dict(badge_settings, model_badges_ttl=-1)
+    assert badges.get_model_badges(stale_settings, SCOPE) == {"books.book": 0, "loans.library": 7}
+    assert scheduled == [["books.book", "loans.library"]]
+
+
+@pytest.mark.django_db
+def test_schedule_refresh_only_once(badge_settings, monkeypatch):
+    """
+    A model already being refreshed is not refreshed again
+    """
+    submitted = []
+    monkeypatch.setattr(badges._background, "submit", lambda func, models, options, scope: submitted.append(models))
+
+    badges.schedule_refresh(["books.book"], badge_settings, SCOPE)
+    badges.schedule_refresh(["books.book", "loans.library"], badge_settings, SCOPE)
+
+    assert submitted == [["books.book"], ["loans.library"]]
+
+
+@pytest.mark.django_db
+def test_side_menu_badges(admin_client, badge_settings, monkeypatch):
+    """
+    Cached counts are rendered against their models in the side menu
+    """
+    monkeypatch.setattr(badges, "schedule_refresh", lambda models, options, scope: None)
+    BookFactory.create_batch(2)
+    badges.refresh_model_badges(["books.book", "loans.library"], badge_settings, SCOPE)
+
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+    sidebar = soup.find(id="jazzy-sidebar")
+
+    assert sidebar.find("a", href=reverse("admin:books_book_changelist")).find(class_="badge").text == "2"
+    assert sidebar.find("a", href=reverse("admin:loans_library_changelist")).find(class_="badge").text == "7"
+    assert sidebar.find("a", href=reverse("admin:books_author_changelist")).find(class_="badge") is None
+
+
+@pytest.mark.django_db
+def test_badges_per_tenant(rf, badge_settings, custom_jazzmin_settings, monkeypatch):
+    """
+    Tenants can count models their own way, so each has its own counts, and refreshes
+    """
+    submitted = []
+    monkeypatch.setattr(badges._background, "submit", lambda func, models, options, scope: submitted.append(scope))
+    custom_jazzmin_settings.update(
+        {
+            "tenant_key": lambda r: r.get_host(),
+            "tenant_settings": lambda host: {"model_badges": {"loans.library": lambda: len(host)}},
+        }
+    )
+
+    requests = [rf.get("/", HTTP_HOST=host) for host in ("a.com", "bb.com")]
+    for request in requests:
+        options = get_request_settings(request)
+        assert badges.get_model_badges(options, get_cache_scope(request)) == {}
+        badges.refresh_model_badges(["loans.library"], options, get_cache_scope(request))
+
+    assert submitted == [get_cache_scope(x) for x in requests]
+    assert len(set(submitted)) == 2
+    assert [badges.get_model_badges(get_request_settings(x), get_cache_scope(x)) for x in requests] == [
+        {"loans.library": 5},
+        {"loans.library": 6},
+    ]
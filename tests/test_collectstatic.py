@@ -4,6 +4,7 @@ sourceMappingURL=bootstrap.min.css.map; the .map files must be present
 or collectstatic fails (e.g. with Whitenoise).
 """
 
+import gzip
 import os
 
 import pytest
@@ -76,3 +77,52 @@ def test_bootswatch_css_map_files_exist_when_referenced():
             content = f.read()
         if ref in content and not os.path.isfile(map_path):
             pytest.fail(f"{css_path} references bootstrap.min.css.map but {map_path} is missing (see #651)")
+
+
+@pytest.mark.django_db
+def test_collectstatic_skips_unused_themes(tmp_path, settings, custom_jazzmin_settings):
+    """
+    With jazzmin's finder, only the allowed themes (and optionally no source maps) are collected
+    """
+    custom_jazzmin_settings["show_theme_chooser"] = False
+    settings.JAZZMIN_UI_TWEAKS = {"theme": "darkly"}
+    settings.JAZZMIN_THEMES = ["flatly"]
+    settings.JAZZMIN_STATIC_SOURCE_MAPS = False
+    settings.STATICFILES_FINDERS = [
+        "django.contrib.staticfiles.finders.FileSystemFinder",
+        "jazzmin.finders.AppDirectoriesFinder",
+    ]
+
+    with override_settings(STATIC_ROOT=str(tmp_path)):
+        call_command("collectstatic", "--noinput", verbosity=0)
+
+    assert sorted(os.listdir(tmp_path / "vendor" / "bootswatch")) == ["darkly", "default", "flatly"]
+    assert not list(tmp_path.glob("vendor/**/*.map"))
+    assert (tmp_path / "admin" / "js").is_dir()
+
+
+@pytest.mark.django_db
+def test_collectstatic_precompresses_jazzmin_assets(tmp_path, settings, custom_jazzmin_settings):
+    """
+    jazzmin's assets get gzipped siblings, other apps assets are left alone, and unchanged files aren't recompressed
+    """
+    custom_jazzmin_settings["show_theme_chooser"] = False
+    settings.JAZZMIN_COMPRESS_WORKERS = 2
+    settings.STATICFILES_FINDERS = ["jazzmin.finders.AppDirectoriesFinder"]
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "jazzmin.storage.CompressedStaticFilesStorage"},
+    }
+
+    with override_settings(STATIC_ROOT=str(tmp_path)):
+        call_command("collectstatic", "--noinput", verbosity=0)
+
+        css = tmp_path / "vendor" / "adminlte" / "css" / "adminlte.min.css"
+        compressed = tmp_path / "vendor" / "adminlte" / "css" / "adminlte.min.css.gz"
+        assert gzip.decompress(compressed.read_bytes()) == css.read_bytes()
+        assert (tmp_path / "admin" / "js" / "cancel.js.gz").exists()
+        assert not (tmp_path / "admin" / "js" / "core.js.gz").exists()
+
+        os.utime(compressed, (0, 0))
+        call_command("collectstatic", "--noinput", verbosity=0)
+        assert compressed.stat().st_mtime == 0
@@ -124,3 +124,90 @@ def test_changeform_section_ordering(change_form_context, order):
     fieldsets = get_sections(admin_form, inline_formsets)
 
     assert tuple(x.name for x in fieldsets) == order
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "theme,stylesheets",
+    [
+        ("default", ["vendor/adminlte/css/adminlte.min.css"]),
+        ("darkly", ["vendor/adminlte/css/adminlte-components.min.css", "vendor/bootswatch/darkly/bootstrap.min.css"]),
+    ],
+)
+def test_theme_loads_bootstrap_once(theme, stylesheets, admin_client, client, settings):
+    """
+    Bootswatch themes bring their own bootstrap, so we only load the adminLTE components alongside them
+    """
+    settings.JAZZMIN_UI_TWEAKS = {"theme": theme}
+
+    for response in [admin_client.get(reverse("admin:index")), client.get(reverse("admin:login"))]:
+        soup = BeautifulSoup(response.content, "html.parser")
+        hrefs = [x["href"] for x in soup.find_all("link", rel="stylesheet") if x.get("href")]
+
+        assert [x for x in hrefs if "adminlte" in x or "bootswatch" in x] == ["/static/" + x for x in stylesheets]
+
+
+@pytest.mark.django_db
+def test_theme_chosen_in_cookie(admin_client, custom_jazzmin_settings, settings):
+    """
+    The theme and color scheme chosen in the theme chooser are rendered server side, when they're allowed
+    """
+    settings.JAZZMIN_UI_TWEAKS = {"theme": "flatly"}
+    custom_jazzmin_settings["show_theme_chooser"] = True
+    url = reverse("admin:index")
+
+    admin_client.cookies["jazzmin_theme"] = "darkly"
+    admin_client.cookies["jazzmin_theme_mode"] = "dark"
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+
+    assert soup.find("link", id="jazzmin-theme")["href"] == "/static/vendor/bootswatch/darkly/bootstrap.min.css"
+    assert soup.find("html")["data-bs-theme"] == "dark"
+    assert soup.find(id="jazzmin-theme-select").find("option", selected=True)["value"] == "darkly"
+    assert soup.find(id="jazzmin-mode-select").find("option", selected=True)["value"] == "dark"
+
+    admin_client.cookies["jazzmin_theme"] = "nope"
+    admin_client.cookies["jazzmin_theme_mode"] = "nope"
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+
+    assert soup.find("link", id="jazzmin-theme")["href"] == "/static/vendor/bootswatch/flatly/bootstrap.min.css"
+    assert soup.find("html")["data-bs-theme"] == "light"
+
+    admin_client.cookies["jazzmin_theme"] = "darkly"
+    custom_jazzmin_settings["show_theme_chooser"] = False
+    soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+
+    assert soup.find("link", id="jazzmin-theme")["href"] == "/static/vendor/bootswatch/flatly/bootstrap.min.css"
+
+
+@pytest.mark.django_db
+def test_self_hosted_fonts(admin_client, client, custom_jazzmin_settings):
+    """
+    The bundled font replaces the google fonts one, and its most used files are preloaded
+    """
+    custom_jazzmin_settings["use_self_hosted_fonts"] = True
+
+    for response in [admin_client.get(reverse("admin:index")), client.get(reverse("admin:login"))]:
+        soup = BeautifulSoup(response.content, "html.parser")
+
+        assert soup.find("link", href="/static/vendor/source-sans-pro/source-sans-pro.css")
+        assert [x["href"] for x in soup.find_all("link", rel="preload", attrs={"as": "font"})] == [
+            "/static/vendor/source-sans-pro/source-sans-pro-latin-400-normal.woff2",
+            "/static/vendor/source-sans-pro/source-sans-pro-latin-700-normal.woff2",
+        ]
+        assert "fonts.googleapis.com" not in response.content.decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url_name", ["admin:books_book_add", "admin:books_book_changelist"])
+def test_select2_loaded_once(url_name, admin_client):
+    """
+    Jazzmin's selects and filters share the Select2 django's autocomplete fields use, so it only loads once
+    """
+    response = admin_client.get(reverse(url_name))
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    scripts = [x["src"] for x in soup.find_all("script", src=True) if "select2" in x["src"]]
+    stylesheets = [x["href"] for x in soup.find_all("link", rel="stylesheet", href=True) if "select2" in x["href"]]
+
+    assert [x for x in scripts if "i18n" not in x] == ["/static/admin/js/vendor/select2/select2.full.min.js"]
+    assert stylesheets == ["/static/admin/css/vendor/select2/select2.min.css"]
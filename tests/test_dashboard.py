@@ -0,0 +1,144 @@
+import pytest
+from bs4 import BeautifulSoup
+from django.contrib.admin import AdminSite
+from django.core.cache import cache
+from django.urls import reverse
+
+from jazzmin.dashboard import normalise_widget
+from jazzmin.utils import get_current_app
+
+from .test_app.library.factories import UserFactory
+
+
+@pytest.fixture
+def widget_calls(custom_jazzmin_settings):
+    cache.clear()
+    calls = []
+
+    def data(value):
+        def func(request):
+            calls.append(value)
+            return value
+
+        return func
+
+    custom_jazzmin_settings["dashboard_widgets"] = [
+        {"name": "Books", "data": data(42)},
+        {"name": "Top Authors", "type": "table", "data": data({"headers": ["Name"], "rows": [["Ann"], ["Bob"]]})},
+        {"name": "Loans", "type": "series", "data": data({"labels": ["Mon", "Tue"], "values": [5, 10]})},
+        {"name": "Secret", "data": data(1), "permissions": ["books.delete_book"]},
+        {"name": "Broken", "data": lambda request: 1 / 0},
+    ]
+    yield calls
+    cache.clear()
+
+
+def test_normalise_widget():
+    """
+    Widgets get a slug, and a template for their type
+    """
+    widget = normalise_widget({"name": "Pending Loans", "type": "table"})
+
+    assert widget["slug"] == "pending-loans"
+    assert widget["template"] == "jazzmin/dashboard/table.html"
+    assert widget["cache_ttl"] == 60
+
+
+@pytest.mark.django_db
+def test_dashboard_widgets(admin_client, widget_calls):
+    """
+    Widgets render on the dashboard, and their data is cached between requests
+    """
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert soup.find(id="widget-books").find(class_="display-6").text == "42"
+    assert [x.text for x in soup.find(id="widget-top-authors").find_all("td")] == ["Ann", "Bob"]
+    assert [x["style"] for x in soup.find(id="widget-loans").find_all(class_="progress-bar")] == [
+        "width: 50%",
+        "width: 100%",
+    ]
+    assert "Could not load this widget" in soup.find(id="widget-broken").text
+    assert len(widget_calls) == 4
+
+    widget_calls.clear()
+    admin_client.get(reverse("admin:index"))
+
+    assert widget_calls == []
+
+
+@pytest.mark.django_db
+def test_dashboard_widget_permissions(client, widget_calls):
+    """
+    Widgets are only shown to users with their permissions
+    """
+    user = UserFactory(permissions=["books.view_book"])
+    client.force_login(user)
+
+    response = client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert soup.find(id="widget-books")
+    assert not soup.find(id="widget-secret")
+    assert client.get(reverse("jazzmin:dashboard_widget", kwargs={"slug": "secret"})).status_code == 404
+
+
+@pytest.mark.django_db
+def test_lazy_dashboard_widget(admin_client, widget_calls, custom_jazzmin_settings):
+    """
+    Lazy widgets are loaded from their own url, after the dashboard has rendered
+    """
+    custom_jazzmin_settings["dashboard_widgets"] = [{"name": "Books", "data": lambda request: 42, "lazy": True}]
+    url = reverse("jazzmin:dashboard_widget", kwargs={"slug": "books"})
+
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert soup.find(id="widget-books").find(attrs={"data-jazzmin-widget-url": url + "?site=admin"})
+    assert not soup.find(id="widget-books").find(class_="display-6")
+
+    response = admin_client.get(url, {"site": "admin"})
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert soup.find(class_="display-6").text == "42"
+
+
+@pytest.mark.django_db
+def test_lazy_dashboard_widget_site(admin_client, custom_jazzmin_settings):
+    """
+    Lazy widgets load with the settings (and cache entries) of the admin site they're on
+    """
+    other = AdminSite(name="other")
+    sites = []
+
+    def data(request):
+        sites.append(get_current_app(request))
+        return 42
+
+    custom_jazzmin_settings["dashboard_widgets"] = [{"name": "Books", "data": data, "lazy": True}]
+    url = reverse("jazzmin:dashboard_widget", kwargs={"slug": "books"})
+
+    admin_client.get(url, {"site": other.name})
+    admin_client.get(url, {"site": "admin"})
+    admin_client.get(url, {"site": other.name})
+
+    assert sites == ["other", "admin"]
+    assert admin_client.get(url, {"site": "missing"}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_dashboard_widgets_per_tenant(admin_client, widget_calls, custom_jazzmin_settings):
+    """
+    Tenants with widgets of the same name each get their own (cached) data
+    """
+
+    def tenant_settings(host):
+        return {"dashboard_widgets": [{"name": "Books", "data": lambda request: len(host)}]}
+
+    custom_jazzmin_settings.update({"tenant_key": lambda r: r.get_host(), "tenant_settings": tenant_settings})
+
+    for _ in range(2):
+        for host, value in (("a.com", "5"), ("bb.com", "6")):
+            response = admin_client.get(reverse("admin:index"), HTTP_HOST=host)
+            soup = BeautifulSoup(response.content, "html.parser")
+            assert soup.find(id="widget-books").find(class_="display-6").text == value
@@ -0,0 +1,77 @@
+import datetime
+
+import pytest
+from bs4 import BeautifulSoup
+from django.contrib import admin
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from jazzmin.date_hierarchy import date_range
+
+from .test_app.library.books.models import Book
+from .test_app.library.factories import BookFactory
+
+
+@pytest.fixture
+def book_admin(monkeypatch):
+    cache.clear()
+    model_admin = admin.site._registry[Book]
+    monkeypatch.setattr(model_admin, "jazzmin_date_hierarchy_cache", 60, raising=False)
+    yield model_admin
+    cache.clear()
+
+
+def get_choices(client, **params):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse("admin:books_book_changelist"), params)
+    hierarchy = BeautifulSoup(response.content, "html.parser").find(id="change-list-date-hierarchy")
+    distinct = [x["sql"] for x in queries.captured_queries if "DISTINCT" in x["sql"] or "MAX(" in x["sql"]]
+    return [x.text.strip() for x in hierarchy.find_all("a") if x.has_attr("href") or "active" in x["class"]], distinct
+
+
+@pytest.mark.django_db
+def test_cached_buckets(admin_client, book_admin):
+    """
+    The years/months/days are cached for the changelist's query
+    """
+    for year in (2019, 2021):
+        BookFactory(published_on=datetime.date(year, 3, 1))
+
+    choices, queries = get_choices(admin_client)
+    assert choices == ["2019", "2021"]
+    assert queries
+
+    assert get_choices(admin_client) == (["2019", "2021"], [])
+
+    # Another query (a drill down), reads its own
+    choices, queries = get_choices(admin_client, published_on__year="2019")
+    assert choices == ["‹ All dates", "March 2019"]
+    assert queries
+
+
+@pytest.mark.django_db
+def test_buckets_from_bounds(admin_client, book_admin, monkeypatch):
+    """
+    Buckets can come from the first and last dates, rather than a DISTINCT over the results
+    """
+    monkeypatch.setattr(book_admin, "jazzmin_date_hierarchy_from_bounds", True, raising=False)
+    for year in (2019, 2021):
+        BookFactory(published_on=datetime.date(year, 3, 1))
+
+    choices, queries = get_choices(admin_client)
+    assert choices == ["2019", "2020", "2021"]
+    assert not any("DISTINCT" in x for x in queries)
+
+
+def test_date_range():
+    first, last = datetime.date(2019, 11, 30), datetime.date(2020, 2, 2)
+    assert [x.year for x in date_range(first, last, "year")] == [2019, 2020]
+    assert [(x.year, x.month) for x in date_range(first, last, "month")] == [
+        (2019, 11),
+        (2019, 12),
+        (2020, 1),
+        (2020, 2),
+    ]
+    assert len(list(date_range(first, last, "day"))) == 65
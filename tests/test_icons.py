@@ -0,0 +1,90 @@
+import re
+from io import StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.core.management import call_command
+from django.urls import reverse
+
+from jazzmin import icons
+
+
+@pytest.fixture
+def fontawesome_css():
+    with open(icons.FONTAWESOME_DIR + "/css/all.min.css") as f:
+        return f.read()
+
+
+def test_find_icons(custom_jazzmin_settings):
+    """
+    Icons come from jazzmin's templates/js, and the jazzmin settings
+    """
+    custom_jazzmin_settings["icons"] = {"books.book": "fas fa-rocket"}
+
+    found = icons.find_icons()
+
+    assert {"fa-rocket", "fa-palette", "fa-chevron-circle-right", "fa-bars"} <= found
+    assert "fa-dragon" not in found
+
+
+def test_find_icons_per_tenant(custom_jazzmin_settings):
+    """
+    Icons in the settings of the tenants we're given are found too
+    """
+    custom_jazzmin_settings.update(
+        {
+            "tenant_key": lambda r: r.get_host(),
+            "tenant_settings": lambda host: {"icons": {"books.book": "fas fa-" + host.split(".")[0]}},
+            "tenants": lambda: ["dragon.com"],
+        }
+    )
+
+    found = icons.find_icons()
+
+    assert "fa-dragon" in found
+
+
+def test_subset_css(fontawesome_css):
+    """
+    Only the glyph rules for the icons we use are kept, along with everything else, and fonts point at the originals
+    """
+    subset, code_points = icons.subset_css(fontawesome_css, {"fa-house", "fa-rocket"})
+
+    assert ".fa-house:before" in subset
+    assert ".fa-rocket:before" in subset
+    assert ".fa-dragon:before" not in subset
+    assert ".fa-spin{" in subset
+    assert code_points == {0xF015, 0xF135}
+    assert "url(../../vendor/fontawesome-free/webfonts/fa-solid-900.woff2)" in subset
+    assert len(subset) < len(fontawesome_css) / 3
+
+
+def test_subset_css_with_subset_fonts(fontawesome_css):
+    """
+    The subset fonts replace the originals we subset, leaving the others alone
+    """
+    subset, _ = icons.subset_css(fontawesome_css, {"fa-house"}, "webfonts/{}.woff2")
+
+    font_faces = re.findall(r"@font-face\{[^}]*\}", subset)
+    assert 'src:url(webfonts/fa-solid-900.woff2) format("woff2")}' in font_faces[2]
+    assert "fa-v4compatibility.woff2" in font_faces[-1]
+    assert "../../vendor/fontawesome-free/webfonts/fa-v4compatibility.woff2" in font_faces[-1]
+
+
+@pytest.mark.django_db
+def test_jazzmin_icons_command(admin_client, tmp_path, settings):
+    """
+    The command writes the subset into our static files, and base.html switches over to it
+    """
+    settings.STATICFILES_DIRS = [str(tmp_path)]
+
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.find("link", href="/static/vendor/fontawesome-free/css/all.min.css")
+
+    call_command("jazzmin_icons", "--icon", "fa-dragon", stdout=StringIO())
+
+    assert ".fa-dragon:before" in (tmp_path / icons.SUBSET_CSS).read_text()
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.find("link", href="/static/" + icons.SUBSET_CSS)
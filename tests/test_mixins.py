@@ -0,0 +1,340 @@
+import pytest
+from asgiref.sync import async_to_sync
+from bs4 import BeautifulSoup
+from django.contrib import admin
+from django.contrib.admin.models import LogEntry
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.http import StreamingHttpResponse
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import translation
+
+from jazzmin.mixins import CHANGELIST_VERSION_KEY, LAZY_KEY, bump_changelist_version
+from jazzmin.utils import get_cache_scope
+
+from .test_app.library.books.models import Author, Book, Genre
+from .test_app.library.factories import AuthorFactory, BookFactory, GenreFactory, LibraryFactory
+from .test_app.library.loans.models import Library
+
+
+@pytest.fixture
+def author_admin(monkeypatch):
+    model_admin = admin.site._registry[Author]
+    monkeypatch.setattr(model_admin, "list_per_page", 2)
+    monkeypatch.setattr(model_admin, "jazzmin_stream_chunk_size", 2)
+    return model_admin
+
+
+@pytest.mark.django_db
+def test_show_all_streams_rows(admin_client, author_admin):
+    """
+    Show all sends the page with the first chunk of rows, then the rest as they're read
+    """
+    authors = AuthorFactory.create_batch(5)
+    url = reverse("admin:books_author_changelist")
+
+    response = admin_client.get(url, {"all": ""})
+    assert isinstance(response, StreamingHttpResponse)
+
+    soup = BeautifulSoup(b"".join(response.streaming_content), "html.parser")
+    rows = soup.find(id="result_list").find("tbody").find_all("tr")
+    assert [row["class"] for row in rows] == [["even"], ["odd"], ["even"], ["odd"], ["even"]]
+    assert {int(x["value"]) for x in soup.find_all("input", class_="action-select")} == {x.pk for x in authors}
+    assert soup.find("footer")
+
+
+@pytest.mark.django_db
+def test_show_all_streams_rows_asgi(admin_user, author_admin):
+    """
+    Under ASGI the rows are streamed from an async iterator, so django doesn't read them all before sending any
+    """
+    authors = AuthorFactory.create_batch(5)
+    client = AsyncClient()
+    client.force_login(admin_user)
+
+    async def get():
+        response = await client.get(reverse("admin:books_author_changelist"), {"all": ""})
+        assert response.is_async
+        return b"".join([x async for x in response.streaming_content])
+
+    soup = BeautifulSoup(async_to_sync(get)(), "html.parser")
+    assert {int(x["value"]) for x in soup.find_all("input", class_="action-select")} == {x.pk for x in authors}
+    assert soup.find("footer")
+
+
+@pytest.mark.django_db
+def test_only_show_all_streams(admin_client, author_admin):
+    """
+    Paged results, and show all with no more results than a chunk, render as usual
+    """
+    AuthorFactory.create_batch(3)
+    url = reverse("admin:books_author_changelist")
+
+    response = admin_client.get(url)
+    assert not response.streaming
+    assert len(BeautifulSoup(response.content, "html.parser").find_all("input", class_="action-select")) == 2
+
+    author_admin.jazzmin_stream_chunk_size = 3
+    response = admin_client.get(url, {"all": ""})
+    assert not response.streaming
+    assert len(BeautifulSoup(response.content, "html.parser").find_all("input", class_="action-select")) == 3
+
+
+@pytest.mark.django_db
+def test_column_chooser(admin_client):
+    """
+    Hidden columns are left out of the results, the defaults until the user chooses, and some can't be hidden
+    """
+    AuthorFactory()
+    url = reverse("admin:books_author_changelist")
+
+    def columns():
+        soup = BeautifulSoup(admin_client.get(url).content, "html.parser")
+        chooser = {x["value"]: x.has_attr("checked") for x in soup.find(id="jazzmin-columns").find_all("input")}
+        cells = soup.find(id="result_list").find("tbody").find("tr").find_all(["th", "td"])
+        return chooser, [x for cell in cells for x in cell.get("class", []) if x.startswith("field-")]
+
+    chooser, fields = columns()
+    assert chooser == {"last_name": True, "first_name": True, "date_of_birth": True, "date_of_death": False}
+    assert fields == ["field-last_name", "field-first_name", "field-date_of_birth"]
+
+    admin_client.cookies["jazzmin_columns_books_author"] = "first_name%2Cdate_of_birth"
+    chooser, fields = columns()
+    assert chooser == {"last_name": True, "first_name": False, "date_of_birth": False, "date_of_death": True}
+    assert fields == ["field-last_name", "field-date_of_death"]
+
+    # The first column links to the author, so stays, as do list_display_links/list_editable
+    admin_client.cookies["jazzmin_columns_books_author"] = "last_name%2Cfirst_name%2Cdate_of_birth%2Cdate_of_death"
+    assert columns()[1] == ["field-last_name"]
+
+
+def test_column_select_related(rf, monkeypatch):
+    """
+    The lookups columns need are only selected while the column is shown
+    """
+    model_admin = admin.site._registry[Author]
+    monkeypatch.setattr(model_admin, "jazzmin_column_select_related", {"first_name": ["profile"]})
+    request = rf.get("/")
+
+    assert model_admin.get_list_select_related(request) == ["profile"]
+    request.COOKIES["jazzmin_columns_books_author"] = "first_name"
+    assert model_admin.get_list_select_related(request) is False
+
+
+@pytest.mark.django_db
+def test_lazy_columns(admin_client, django_assert_max_num_queries, monkeypatch):
+    """
+    Lazy columns render placeholders, their cells are loaded (and cached) for a batch of objects at a time
+    """
+    cache.clear()
+    library = LibraryFactory()
+    BookFactory.create_batch(2, library=library)
+    other = LibraryFactory()
+
+    soup = BeautifulSoup(admin_client.get(reverse("admin:loans_library_changelist")).content, "html.parser")
+    lazy_url = soup.find(id="result_list")["data-jazzmin-lazy-url"]
+    assert lazy_url == reverse("admin:loans_library_jazzmin_lazy")
+    assert "Books" in [x.text.strip() for x in soup.find(id="result_list").find("thead").find_all("th")]
+    placeholders = soup.find_all(attrs={"data-jazzmin-lazy": "book_count"})
+    assert {x["data-pk"] for x in placeholders} == {str(library.pk), str(other.pk)}
+
+    params = {"column": ["book_count", "name", "delete"], "pk": [library.pk, other.pk]}
+    response = admin_client.get(lazy_url, params)
+    assert response.json() == {str(library.pk): {"book_count": "2"}, str(other.pk): {"book_count": "0"}}
+
+    # Libraries have no version, so cells aren't cached
+    BookFactory(library=other)
+    assert admin_client.get(lazy_url, params).json()[str(other.pk)] == {"book_count": "1"}
+
+    monkeypatch.setattr(admin.site._registry[Library], "get_lazy_version", lambda obj: "1")
+    admin_client.get(lazy_url, params)
+    BookFactory(library=other)
+    with django_assert_max_num_queries(3):
+        # Cached until the version moves on
+        assert admin_client.get(lazy_url, params).json()[str(other.pk)] == {"book_count": "1"}
+
+    assert admin_client.get(lazy_url, {"column": "book_count", "pk": "x"}).status_code == 400
+
+
+def test_lazy_cache_key(rf, monkeypatch):
+    """
+    Cached cells are localised, and can depend on the site's (or tenant's) settings
+    """
+    model_admin = admin.site._registry[Library]
+    library = Library(pk=1)
+    assert model_admin.get_lazy_cache_key(rf.get("/"), library, "book_count") is None
+
+    monkeypatch.setattr(model_admin, "get_lazy_version", lambda obj: "1")
+    request = rf.get("/")
+    request.jazzmin_tenant = "a.com"
+    with translation.override("fr"):
+        key = model_admin.get_lazy_cache_key(request, library, "book_count")
+    assert key == LAZY_KEY.format(get_cache_scope(request), "fr", "loans.library", "book_count", 1, "1")
+    assert key != model_admin.get_lazy_cache_key(rf.get("/"), library, "book_count")
+
+
+@pytest.mark.django_db
+def test_cached_changelist(admin_client):
+    """
+    Changelist pages are cached (counts and results) until the model changes, or the query does
+    """
+    cache.clear()
+    GenreFactory.create_batch(2, name="Jazz")
+    url = reverse("admin:books_genre_changelist")
+
+    def genres(**params):
+        with CaptureQueriesContext(connection) as queries:
+            soup = BeautifulSoup(admin_client.get(url, params).content, "html.parser")
+        names = [x.text for x in soup.select("#result_list tbody th")]
+        return names, any("books_genre" in x["sql"] for x in queries.captured_queries)
+
+    assert genres() == (["Jazz", "Jazz"], True)
+    assert genres() == (["Jazz", "Jazz"], False)
+
+    GenreFactory(name="Blues")
+    assert genres() == (["Blues", "Jazz", "Jazz"], True)
+    assert genres(q="Blues") == (["Blues"], True)
+    assert genres(q="Blues") == (["Blues"], False)
+
+    # Changes without signals need the version moving on by hand
+    Genre.objects.update(name="Funk")
+    assert genres(q="Blues") == (["Blues"], False)
+    bump_changelist_version(Genre)
+    assert genres(q="Blues") == ([], True)
+
+
+@pytest.mark.django_db
+def test_cached_changelist_per_tenant(admin_client, custom_jazzmin_settings):
+    """
+    Tenants can render the results differently, so each has its own cached pages
+    """
+    cache.clear()
+    GenreFactory.create_batch(2)
+    custom_jazzmin_settings.update(
+        {
+            "tenant_key": lambda r: r.get_host(),
+            "tenant_settings": lambda host: {"changelist_virtual_rows": 1 if host == "a.com" else 0},
+        }
+    )
+
+    for host, virtual in (("a.com", True), ("b.com", False), ("a.com", True)):
+        response = admin_client.get(reverse("admin:books_genre_changelist"), HTTP_HOST=host)
+        soup = BeautifulSoup(response.content, "html.parser")
+        assert soup.find(id="result_list").has_attr("data-jazzmin-virtual") is virtual
+
+
+@pytest.mark.django_db
+def test_cached_changelist_receivers():
+    """
+    Only models with cached changelists get receivers, so others can still be deleted without loading them first, and
+    their many to many relations changing moves their version on too
+    """
+    assert post_delete.has_listeners(Genre)
+    assert not post_delete.has_listeners(Session)
+    assert not post_delete.has_listeners(Library)
+
+    book, genre = BookFactory(), GenreFactory()
+    version = cache.get(CHANGELIST_VERSION_KEY.format("books.genre"))
+    book.genre.add(genre)
+    assert cache.get(CHANGELIST_VERSION_KEY.format("books.genre")) != version
+
+
+def post_rows(client, books, changed):
+    """
+    Post the list_editable form as change_list.js does, with just the changed rows
+    """
+    data = {"form-TOTAL_FORMS": len(books), "form-INITIAL_FORMS": len(books), "_save": "Save"}
+    for i, book in enumerate(books):
+        if book.pk in changed:
+            data.update({"form-{}-id".format(i): book.pk, "form-{}-title".format(i): changed[book.pk]})
+    return client.post(reverse("admin:books_book_changelist"), data)
+
+
+@pytest.mark.django_db
+def test_dirty_rows_bulk_update(admin_client, django_assert_num_queries):
+    """
+    Only the rows sent are validated and saved, together with one bulk update
+    """
+    books = sorted(BookFactory.create_batch(3), key=lambda x: -x.pk)
+    titles = {x.pk: x.title for x in books}
+
+    response = admin_client.get(reverse("admin:books_book_changelist"))
+    assert BeautifulSoup(response.content, "html.parser").find(id="changelist-form").has_attr("data-jazzmin-dirty-rows")
+
+    changed = {books[0].pk: "Changed", books[2].pk: "Also changed"}
+    with CaptureQueriesContext(connection) as queries:
+        response = post_rows(admin_client, books, changed)
+    assert response.status_code == 302
+
+    titles.update(changed)
+    assert {x.pk: x.title for x in Book.objects.all()} == titles
+    assert len([x for x in queries if x["sql"].startswith("UPDATE")]) == 1
+    assert sorted(LogEntry.objects.values_list("object_id", flat=True)) == sorted(str(x) for x in changed)
+
+
+@pytest.mark.django_db
+def test_dirty_rows_bulk_update_files(admin_client, monkeypatch, settings, tmp_path):
+    """
+    Uploads to list_editable file fields are stored, as save() would
+    """
+    settings.MEDIA_ROOT = str(tmp_path)
+    model_admin = admin.site._registry[Book]
+    monkeypatch.setattr(model_admin, "list_display", ("__str__", "title", "cover"))
+    monkeypatch.setattr(model_admin, "list_editable", ("title", "cover"))
+    book = BookFactory()
+
+    data = {
+        "form-TOTAL_FORMS": 1,
+        "form-INITIAL_FORMS": 1,
+        "form-0-id": book.pk,
+        "form-0-title": book.title,
+        "form-0-cover": SimpleUploadedFile("cover.txt", b"A cover"),
+        "_save": "Save",
+    }
+    assert admin_client.post(reverse("admin:books_book_changelist"), data).status_code == 302
+
+    book.refresh_from_db()
+    assert book.cover.name.startswith("covers/cover")
+    assert (tmp_path / book.cover.name).read_bytes() == b"A cover"
+
+
+@pytest.mark.django_db
+def test_dirty_rows_errors(admin_client):
+    """
+    Errors show against the rows sent, the others show as they are
+    """
+    books = sorted(BookFactory.create_batch(2), key=lambda x: -x.pk)
+
+    response = post_rows(admin_client, books, {books[0].pk: ""})
+    assert response.status_code == 200
+
+    soup = BeautifulSoup(response.content, "html.parser")
+    assert soup.find("input", attrs={"name": "form-1-title"})["value"] == books[1].title
+    assert soup.find("input", attrs={"name": "form-0-title"}).get("value") is None
+    assert Book.objects.get(pk=books[0].pk).title == books[0].title
+
+
+@pytest.mark.django_db
+def test_dirty_rows_without_bulk_update(admin_client, monkeypatch):
+    """
+    Rows are saved one by one when there's a receiver that bulk_update would skip
+    """
+    books = sorted(BookFactory.create_batch(2), key=lambda x: -x.pk)
+    saved = []
+
+    def receiver(sender, instance, **kwargs):
+        saved.append(instance.pk)
+
+    post_save.connect(receiver, sender=Book)
+    try:
+        post_rows(admin_client, books, {books[0].pk: "Changed"})
+    finally:
+        post_save.disconnect(receiver, sender=Book)
+
+    assert saved == [books[0].pk]
+    assert Book.objects.get(pk=books[0].pk).title == "Changed"
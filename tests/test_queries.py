@@ -0,0 +1,60 @@
+import logging
+
+import pytest
+from bs4 import BeautifulSoup
+from django.contrib import admin
+from django.urls import reverse
+
+from jazzmin.queries import find_relation, get_shape
+
+from .test_app.library.books.models import Author, Book
+from .test_app.library.factories import BookFactory, LibraryFactory
+from .test_app.library.loans.models import BookLoan, Library
+
+
+@pytest.fixture
+def inspector_middleware(settings):
+    settings.MIDDLEWARE = settings.MIDDLEWARE + ["jazzmin.middleware.QueryInspectorMiddleware"]
+
+
+def book_titles(obj):
+    return ", ".join(obj.books.values_list("title", flat=True))
+
+
+@pytest.mark.django_db
+def test_changelist_n_plus_one(admin_client, inspector_middleware, monkeypatch, caplog):
+    """
+    A list_display column querying for each row is reported, with the prefetch that would fix it
+    """
+    for library in LibraryFactory.create_batch(3):
+        BookFactory(library=library)
+    monkeypatch.setattr(admin.site._registry[Library], "list_display", ("name", book_titles))
+
+    with caplog.at_level(logging.WARNING, logger="jazzmin.middleware"):
+        response = admin_client.get(reverse("admin:loans_library_changelist"))
+
+    report = BeautifulSoup(response.content, "html.parser").find(id="jazzmin-query-report")
+    cells = [x.text.strip() for x in report.find("tbody").find("tr").find_all("td")]
+    assert cells[:3] == ["list_display book_titles (loans.Library)", "3 / 3 rows", '.prefetch_related("books")']
+    assert "ran the same query 3 times (list_display book_titles of loans.Library)" in caplog.text
+
+
+@pytest.mark.django_db
+def test_no_report(admin_client, inspector_middleware):
+    """
+    Pages without repeated queries have no report
+    """
+    LibraryFactory.create_batch(3)
+    response = admin_client.get(reverse("admin:loans_library_changelist"))
+    assert not BeautifulSoup(response.content, "html.parser").find(id="jazzmin-query-report")
+
+
+def test_shape_and_relations():
+    """
+    Queries for different objects have the same shape, and we find the relation to the table they read
+    """
+    assert get_shape('SELECT * FROM "t" WHERE "id" IN (%s, %s, %s)') == 'SELECT * FROM "t" WHERE "id" IN (%s)'
+
+    assert find_relation(Book, Author._meta.db_table) == ("select_related", "author")
+    assert find_relation(Library, Book._meta.db_table) == ("prefetch_related", "books")
+    assert find_relation(BookLoan, Author._meta.db_table) == ("select_related", "book__author")
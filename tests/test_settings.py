@@ -1,4 +1,14 @@
-from jazzmin.settings import get_search_model_string
+import pytest
+from django.contrib.admin import AdminSite
+
+from jazzmin.settings import (
+    THEMES,
+    get_allowed_themes,
+    get_request_settings,
+    get_search_model_string,
+    get_settings,
+    get_ui_tweaks,
+)
 
 
 def test_get_search_model_string():
@@ -8,3 +18,116 @@ def test_get_search_model_string():
     # the app name gets never touched
     assert get_search_model_string("Books.Book") == "Books.book"
     assert get_search_model_string("BookShelf.book") == "BookShelf.book"
+
+
+@pytest.mark.django_db
+def test_get_settings_per_admin_site(custom_jazzmin_settings):
+    """
+    Settings are resolved against the titles of the admin site they are requested for
+    """
+    custom_jazzmin_settings.update({"site_title": None, "site_header": None})
+    site = AdminSite(name="reports")
+    site.site_title = "Reports Title"
+    site.site_header = "Reports Header"
+
+    assert get_settings("reports")["site_title"] == "Reports Title"
+    assert get_settings("reports")["site_brand"] == "Reports Header"
+    assert get_settings()["site_title"] == "Django site admin"
+
+
+@pytest.mark.django_db
+def test_get_settings_is_cached_until_settings_change(custom_jazzmin_settings):
+    """
+    Resolved settings are reused between calls, and re-resolved when JAZZMIN_SETTINGS changes
+    """
+    resolved = get_settings()
+    assert get_settings() is resolved
+
+    custom_jazzmin_settings["site_title"] = "Changed"
+
+    assert get_settings() is not resolved
+    assert get_settings()["site_title"] == "Changed"
+
+
+@pytest.mark.django_db
+def test_get_request_settings_per_tenant(rf, custom_jazzmin_settings):
+    """
+    We can override settings per tenant, and only resolve each tenant once
+    """
+    calls = []
+
+    def tenant_settings(host):
+        calls.append(host)
+        return {"site_title": host.split(".")[0].title()}
+
+    custom_jazzmin_settings.update({"tenant_key": lambda r: r.get_host(), "tenant_settings": tenant_settings})
+
+    assert get_request_settings(rf.get("/", HTTP_HOST="acme.example.com"))["site_title"] == "Acme"
+    assert get_request_settings(rf.get("/", HTTP_HOST="acme.example.com"))["site_title"] == "Acme"
+    assert get_request_settings(rf.get("/", HTTP_HOST="initech.example.com"))["site_title"] == "Initech"
+    assert get_request_settings(None)["site_title"] == "Library Admin"
+    assert calls == ["acme.example.com", "initech.example.com"]
+
+
+@pytest.mark.django_db
+def test_tenant_settings_are_evicted(rf, custom_jazzmin_settings):
+    """
+    Only the most recently used settings are kept (the untenanted settings, and two tenants here)
+    """
+    calls = []
+
+    def tenant_settings(host):
+        calls.append(host)
+        return {}
+
+    custom_jazzmin_settings.update(
+        {"tenant_key": lambda r: r.get_host(), "tenant_settings": tenant_settings, "tenant_cache_size": 3}
+    )
+
+    for host in ("a.com", "b.com", "a.com", "c.com", "a.com", "b.com"):
+        get_request_settings(rf.get("/", HTTP_HOST=host))
+
+    assert calls == ["a.com", "b.com", "c.com", "b.com"]
+
+
+def test_get_allowed_themes(settings):
+    """
+    Only the configured theme (and the default) are allowed, unless we choose themes in the browser, or list them
+    """
+    settings.JAZZMIN_SETTINGS = {"show_theme_chooser": False}
+    settings.JAZZMIN_UI_TWEAKS = {"theme": "darkly"}
+    assert get_allowed_themes() == ["default", "darkly"]
+
+    settings.JAZZMIN_THEMES = ["flatly", "nope"]
+    assert get_allowed_themes() == ["default", "flatly", "darkly"]
+
+    del settings.JAZZMIN_THEMES
+    settings.JAZZMIN_SETTINGS = {"show_theme_chooser": True}
+    assert get_allowed_themes() == list(THEMES.keys())
+
+
+def test_get_allowed_themes_per_tenant(rf, settings, custom_jazzmin_settings):
+    """
+    The theme chooser can be shown for some tenants only, which decides the themes allowed (and chosen) for each, and
+    collectstatic keeps every theme if any of the listed tenants can choose them
+    """
+    settings.JAZZMIN_UI_TWEAKS = {"theme": "darkly"}
+    custom_jazzmin_settings.update(
+        {
+            "show_theme_chooser": False,
+            "tenant_key": lambda r: r.get_host(),
+            "tenant_settings": lambda host: {"show_theme_chooser": host == "acme.example.com"},
+        }
+    )
+
+    assert get_allowed_themes(rf.get("/", HTTP_HOST="acme.example.com")) == list(THEMES.keys())
+    assert get_allowed_themes(rf.get("/", HTTP_HOST="initech.example.com")) == ["default", "darkly"]
+    assert get_allowed_themes() == ["default", "darkly"]
+
+    custom_jazzmin_settings["tenants"] = ["initech.example.com", "acme.example.com"]
+    assert get_allowed_themes() == list(THEMES.keys())
+
+    for host, theme in (("acme.example.com", "flatly"), ("initech.example.com", "darkly")):
+        request = rf.get("/", HTTP_HOST=host)
+        request.COOKIES["jazzmin_theme"] = "flatly"
+        assert get_ui_tweaks(request)["theme"]["name"] == theme
@@ -0,0 +1,89 @@
+from io import StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.contrib.admin.models import ADDITION, LogEntry
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+
+from jazzmin.settings import get_settings
+from jazzmin.stats import CHANGED_KEY, TRACKED_MODELS, get_dashboard_stats, precompute_dashboard_stats
+
+from .test_app.library.factories import AuthorFactory, BookFactory, GenreFactory
+
+
+@pytest.fixture
+def stats_settings(custom_jazzmin_settings):
+    cache.clear()
+    custom_jazzmin_settings.update({"dashboard_stats": True, "dashboard_stats_models": ["books.book", "books.author"]})
+    yield get_settings()
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_precompute_only_changed_models(stats_settings):
+    """
+    Everything is counted the first time, then only models that have been saved/deleted since
+    """
+    BookFactory.create_batch(2)
+
+    assert precompute_dashboard_stats(stats_settings) == ["books.book", "books.author", "activity"]
+    assert get_dashboard_stats()["counts"] == {"books.book": 2, "books.author": 2}
+
+    assert precompute_dashboard_stats(stats_settings) == []
+
+    AuthorFactory()
+    assert precompute_dashboard_stats(stats_settings) == ["books.author"]
+    assert get_dashboard_stats()["counts"] == {"books.book": 2, "books.author": 3}
+
+    assert precompute_dashboard_stats(stats_settings, full=True) == ["books.book", "books.author", "activity"]
+
+
+@pytest.mark.django_db
+def test_only_stats_models_are_tracked(custom_jazzmin_settings, stats_settings):
+    """
+    Only the models we count (and log entries) are marked as changed, and only while dashboard_stats is on
+    """
+    assert TRACKED_MODELS == {"books.book", "books.author", "admin.logentry"}
+
+    GenreFactory()
+    AuthorFactory()
+    assert cache.get(CHANGED_KEY.format("books.genre")) is None
+    assert cache.get(CHANGED_KEY.format("books.author")) is not None
+
+    custom_jazzmin_settings["dashboard_stats"] = False
+    assert TRACKED_MODELS == set()
+
+
+@pytest.mark.django_db
+def test_precompute_activity(admin_user, stats_settings):
+    """
+    Admin log entries are counted per day, and recounted when new ones are logged
+    """
+    precompute_dashboard_stats(stats_settings)
+    assert get_dashboard_stats()["activity"]["values"][-1] == 0
+
+    LogEntry.objects.create(user=admin_user, action_flag=ADDITION, object_repr="Book")
+    assert precompute_dashboard_stats(stats_settings) == ["activity"]
+
+    activity = get_dashboard_stats()["activity"]
+    assert len(activity["labels"]) == 14
+    assert activity["values"][-1] == 1
+
+
+@pytest.mark.django_db
+def test_dashboard_reads_snapshots(admin_client, stats_settings):
+    """
+    The dashboard shows the counts and activity from the last precompute
+    """
+    BookFactory.create_batch(3)
+    call_command("jazzmin_stats", stdout=StringIO())
+    BookFactory()
+
+    response = admin_client.get(reverse("admin:index"))
+    soup = BeautifulSoup(response.content, "html.parser")
+    book_link = soup.find("main").find("a", href=reverse("admin:books_book_changelist"))
+
+    assert book_link.find_next_sibling("small").text == "(3)"
+    assert soup.find(id="jazzmin-activity")
@@ -1,9 +1,13 @@
 import json
+import os
 from unittest.mock import MagicMock, NonCallableMock
 
 import pytest
+from bs4 import BeautifulSoup
 from django.contrib.admin.models import CHANGE, LogEntry
+from django.urls import reverse
 
+from jazzmin.bundles import BUNDLES, STATIC_DIR, get_manifest
 from jazzmin.templatetags import jazzmin
 
 
@@ -93,3 +97,34 @@ def test_get_user_avatar(case, test_input, field, expected, log, custom_jazzmin_
         assert log in caplog.text
     else:
         assert not caplog.text
+
+
+def test_jazzmin_bundle(settings):
+    """
+    Bundles are loaded deferred, or their source files when DEBUG is on
+    """
+    settings.DEBUG = False
+    bundle = get_manifest()["related_modal"]
+
+    assert jazzmin.jazzmin_bundle("related_modal") == '<script src="/static/{}" defer></script>'.format(bundle)
+    assert os.path.isfile(os.path.join(STATIC_DIR, bundle))
+
+    settings.DEBUG = True
+
+    assert jazzmin.get_jazzmin_bundle("related_modal") == ["/static/" + x for x in BUNDLES["related_modal"]]
+
+
+@pytest.mark.django_db
+def test_bundles_loaded(admin_client):
+    """
+    Every page loads (and preloads) the main bundle, and page specific bundles are loaded on their pages
+    """
+    main = "/static/" + get_manifest()["main"]
+    change_form = "/static/" + get_manifest()["change_form"]
+
+    response = admin_client.get(reverse("admin:books_book_add"))
+    soup = BeautifulSoup(response.content, "html.parser")
+
+    assert soup.find("link", rel="preload", href=main)
+    assert soup.find("script", src=main).has_attr("defer")
+    assert soup.find("script", src=change_form).has_attr("defer")